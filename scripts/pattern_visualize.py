@@ -14,14 +14,18 @@ from typing import Iterable, List, Sequence
 REPO_ROOT = Path(__file__).resolve().parent.parent
 
 
-def _load_pattern_cli() -> tuple[type, type]:
+def _load_pattern_cli() -> tuple[type, type, type]:
     if str(REPO_ROOT) not in sys.path:
         sys.path.insert(0, str(REPO_ROOT))
     module = importlib.import_module("wove.pattern_cli")
-    return module.PatternTranslator, module.PlannerEvent
+    return (
+        module.PatternTranslator,
+        module.PlannerEvent,
+        module.PlannerEventStore,
+    )
 
 
-PatternTranslator, PlannerEvent = _load_pattern_cli()
+PatternTranslator, PlannerEvent, PlannerEventStore = _load_pattern_cli()
 DEFAULT_PATTERN_DIR = REPO_ROOT / "tests" / "fixtures" / "patterns"
 DEFAULT_OUTPUT_DIR = REPO_ROOT / "docs" / "_static" / "pattern_previews"
 
@@ -55,7 +59,8 @@ def _xy_chart(events: Sequence[PlannerEvent], name: str) -> str:
     width = 420
     height = 420
     margin = 32
-    points = [(event.x_mm, event.y_mm) for event in events]
+    store = PlannerEventStore.from_events(events)
+    points = list(zip(store.x_mm, store.y_mm))
     if not points:
         points = [(0.0, 0.0)]
     min_x, max_x = _ensure_range(point[0] for point in points)
@@ -116,9 +121,10 @@ def _timeline_chart(events: Sequence[PlannerEvent], name: str) -> str:
     margin_right = 20
     margin_top = 36
     margin_bottom = 48
-    indices = list(range(len(events))) or [0]
-    z_series = [event.z_mm for event in events] or [0.0]
-    extrusion_series = [event.extrusion_mm for event in events] or [0.0]
+    store = PlannerEventStore.from_events(events)
+    indices = list(range(len(store))) or [0]
+    z_series = list(store.z_mm) or [0.0]
+    extrusion_series = list(store.extrusion_mm) or [0.0]
     z_min, z_max = _ensure_range(z_series)
     e_min, e_max = _ensure_range(extrusion_series)
     plot_width = width - margin_left - margin_right
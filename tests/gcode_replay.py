@@ -0,0 +1,57 @@
+"""Shared helpers for checking translated G-code by the motion it produces."""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+from wove.pattern_cli import main
+
+
+def gcode_lines(capsys, *argv: str, pattern: str) -> List[str]:
+    """Translate ``pattern`` without comments and return the G-code lines."""
+
+    assert main(["--text", pattern, "--no-comments", *argv]) == 0
+    return capsys.readouterr().out.splitlines()
+
+
+def replay_motion(commands: List[str]) -> List[object]:
+    """Replay ``commands`` the way firmware tracks modal state.
+
+    Returns the position after each move, and any other command as-is.
+    ``STITCH`` calls are expanded as the generated Klipper macro does.
+    """
+
+    position: Dict[str, float] = {}
+    relative = False
+    states: List[object] = []
+
+    def move(words, code="G1"):
+        for word in words:
+            letter, value = word[0], float(word[1:])
+            if letter == "E" and relative and code != "G92":
+                value += position["E"]
+            position[letter] = round(value, 2)
+        if code != "G92":
+            states.append(dict(position))
+
+    for command in commands:
+        code, *words = command.split()
+        if code == "M83":
+            relative = True
+        elif code == "STITCH":
+            params = dict(word.split("=") for word in words)
+            spacing, depth, feed = (
+                float(params[name]) for name in ("SPACING", "DEPTH", "FEED")
+            )
+            start_x, start_e = position["X"], position["E"]
+            for stitch in range(1, int(params["COUNT"]) + 1):
+                move([f"Z{-depth}", "F600"])
+                extrusion = feed if relative else start_e + stitch * feed
+                move([f"E{extrusion}", "F300"])
+                move(["Z4.0", "F600"])
+                move([f"X{start_x + stitch * spacing}", "F1200"])
+        elif code in {"G0", "G1", "G92"}:
+            move(words, code)
+        else:
+            states.append(command)
+    return states
@@ -0,0 +1,122 @@
+"""Tests for the batch translation subcommand."""
+
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from wove.pattern_cli import batch, main
+from wove.pattern_cli.batch import iter_pattern_files
+
+FIXTURES_DIR = Path(__file__).resolve().parents[1] / "fixtures" / "patterns"
+NAMES = ("base_chain_row", "handwritten", "slip_join_double")
+
+
+@pytest.fixture
+def library(tmp_path):
+    root = tmp_path / "library"
+    (root / "lace").mkdir(parents=True)
+    for name in NAMES:
+        shutil.copy(FIXTURES_DIR / f"{name}.txt", root / f"{name}.txt")
+    shutil.copy(FIXTURES_DIR / "handwritten.txt", root / "lace" / "handwritten.txt")
+    (root / "lace" / "broken.txt").write_text("CHAIN 2\nKNIT 1\n", encoding="utf-8")
+    (root / "notes.md").write_text("not a pattern\n", encoding="utf-8")
+    return root
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_batch_writes_every_format_and_a_summary(library, tmp_path, capsys, jobs):
+    out_dir = tmp_path / "out"
+    argv = ["batch", str(library), "--out-dir", str(out_dir), "-j", jobs]
+
+    assert main([*argv, "--format", "gcode,json,planner-bin"]) == 1
+    assert (
+        "lace/broken.txt: Unknown command 'KNIT' on line 2" in capsys.readouterr().err
+    )
+
+    for name in NAMES:
+        for suffix in ("gcode", "json"):
+            expected = (FIXTURES_DIR / f"{name}.{suffix}").read_text(encoding="utf-8")
+            actual = (out_dir / f"{name}.{suffix}").read_text(encoding="utf-8")
+            assert actual.strip() == expected.strip()
+        assert (out_dir / f"{name}.planner.bin").read_bytes().startswith(b"WOVEPB1")
+    assert (out_dir / "lace" / "handwritten.gcode").exists()
+    assert not (out_dir / "lace" / "broken.gcode").exists()
+
+    summary = json.loads((out_dir / "summary.json").read_text(encoding="utf-8"))
+    assert summary["formats"] == ["gcode", "json", "planner-bin"]
+    entries = {Path(entry["input"]).name: entry for entry in summary["files"]}
+    assert [Path(entry["input"]).stem for entry in summary["files"]] == [
+        *NAMES[:2],
+        "broken",
+        "handwritten",
+        NAMES[2],
+    ]
+    assert entries["broken.txt"]["status"] == "error"
+    assert "KNIT" in entries["broken.txt"]["error"]
+    handwritten = entries["handwritten.txt"]
+    gcode = (FIXTURES_DIR / "handwritten.gcode").read_text(encoding="utf-8")
+    assert handwritten["status"] == "ok"
+    assert handwritten["commands"] == len(gcode.strip().splitlines())
+    assert handwritten["duration_s"] > 0
+    assert summary["totals"]["files"] == 5
+    assert (summary["totals"]["ok"], summary["totals"]["failed"]) == (4, 1)
+
+
+def test_batch_loads_the_machine_profile_once(library, tmp_path, monkeypatch):
+    profile = tmp_path / "profile.json"
+    axis = {"microstepping": 16, "steps_per_mm": 80.0}
+    axes = {
+        name: {**axis, "travel_min_mm": -10.0, "travel_max_mm": 300.0} for name in "XYZ"
+    }
+    profile.write_text(json.dumps({"axes": axes}), encoding="utf-8")
+    loads = []
+    real_load = batch.load_machine_profile
+    monkeypatch.setattr(
+        batch,
+        "load_machine_profile",
+        lambda path: loads.append(path) or real_load(path),
+    )
+    files = [str(library / f"{name}.txt") for name in NAMES]
+    argv = ["batch", *files, "--out-dir", str(tmp_path / "out"), "-j", "1"]
+
+    assert main([*argv, "--format", "planner", "--machine-profile", str(profile)]) == 0
+    assert loads == [profile]
+    planner = json.loads(
+        (tmp_path / "out" / "handwritten.planner.json").read_text(encoding="utf-8")
+    )
+    assert planner["machine_profile"]["axes"]["X"]["travel_max_mm"] == 300.0
+
+
+def test_batch_rejects_colliding_outputs_and_bad_formats(library, tmp_path, capsys):
+    out_dir = str(tmp_path / "out")
+    twice = [
+        str(library / "handwritten.txt"),
+        str(library / "lace" / "handwritten.txt"),
+    ]
+
+    assert main(["batch", *twice, "--out-dir", out_dir]) == 1
+    assert "would both write to handwritten" in capsys.readouterr().err
+    summary = library / "summary.txt"
+    summary.write_text("CHAIN 1\n", encoding="utf-8")
+    assert main(["batch", str(summary), "--out-dir", out_dir, "--format", "json"]) == 1
+    assert "summary.json and" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        main(["batch", str(library), "--out-dir", out_dir, "--format", "gcode,yaml"])
+    assert not Path(out_dir).exists()
+
+
+def test_iter_pattern_files_mirrors_directory_layout(library):
+    files = list(iter_pattern_files([library / "notes.md", library], "*.txt"))
+
+    assert files[0] == (library / "notes.md", Path("notes"))
+    assert [stem for _, stem in files[1:]] == [
+        Path("base_chain_row"),
+        Path("handwritten"),
+        Path("lace/broken"),
+        Path("lace/handwritten"),
+        Path("slip_join_double"),
+    ]
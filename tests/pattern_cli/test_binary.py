@@ -0,0 +1,96 @@
+"""Tests for the memory-mappable planner-bin export."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from wove.pattern_cli import PatternTranslator, _planner_payload, _write_output, main
+from wove.pattern_cli.binary import MAGIC, PlannerBinary
+
+PATTERN = "CHAIN 3\nPAUSE 0.4\nMOVE 18 5\nTURN 7\nSINGLE 2\nSLIP 1"
+
+
+@pytest.fixture()
+def exported(tmp_path):
+    translator = PatternTranslator()
+    lines = translator.translate(PATTERN)
+    events = translator.planner_events
+    path = tmp_path / "job.planner.bin"
+    _write_output(lines, path, "planner-bin", planner_events=events)
+    return path, events
+
+
+def test_header_matches_planner_json(exported):
+    path, events = exported
+    payload = _planner_payload(events)
+
+    with PlannerBinary(path) as binary:
+        header = binary.header
+        assert len(binary) == len(events)
+
+    for key in ("version", "units", "metadata", "defaults", "bounds"):
+        assert header[key] == payload[key]
+    assert header["count"] == payload["commands"]["count"]
+
+
+def test_columns_are_aligned_views_over_the_file(exported):
+    path, events = exported
+
+    with PlannerBinary(path) as binary:
+        offsets = [entry["offset"] for entry in binary.header["columns"]]
+        x_mm = binary.column("x_mm")
+        assert x_mm.format == "d"
+        assert x_mm.tolist() == list(events.x_mm)
+        readings = binary.column("tension_sensor_reading").tolist()
+        x_mm.release()
+
+    assert all(offset % 8 == 0 for offset in offsets)
+    expected = [
+        entry["state"]["tension_sensor_reading"]
+        for entry in _planner_payload(events, version=1)["commands"]
+    ]
+    assert readings == pytest.approx(expected)
+
+
+def test_to_store_round_trips_events(exported):
+    path, events = exported
+
+    with PlannerBinary(path) as binary:
+        store = binary.to_store()
+
+    assert list(store) == list(events)
+    for name in (
+        "line_numbers",
+        "row_numbers",
+        "stitch_ordinals",
+        "durations_s",
+        "kinds",
+    ):
+        assert getattr(store, name) == getattr(events, name), name
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "planner.json"
+    path.write_text(json.dumps({"version": 1}) + " " * 16, encoding="utf-8")
+
+    with pytest.raises(ValueError, match="not a planner-bin export"):
+        PlannerBinary(path)
+
+
+def test_main_writes_planner_bin(tmp_path):
+    path = tmp_path / "job.planner.bin"
+
+    assert main(["--text", PATTERN, "--format", "planner-bin", "-o", str(path)]) == 0
+
+    assert path.read_bytes().startswith(MAGIC)
+    with PlannerBinary(path) as binary:
+        assert binary.strings[:1] == ["G21"]
+
+
+def test_main_rejects_streaming_planner_bin(capsys):
+    exit_code = main(["--text", "CHAIN 1", "--format", "planner-bin", "--stream"])
+
+    assert exit_code == 1
+    assert "planner-bin" in capsys.readouterr().err
@@ -0,0 +1,128 @@
+"""Tests for the on-disk output cache."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+
+import pytest
+
+from wove.pattern_cli import PatternTranslator, main
+from wove.pattern_cli.cache import OutputCache
+
+PATTERN = "CHAIN 3\nTURN\nSINGLE 2"
+
+
+def _entries(directory):
+    return sorted(path.name for path in directory.iterdir())
+
+
+def _refuse_translation(monkeypatch):
+    def translate(self, source):
+        raise AssertionError("cache hit should skip translation")
+
+    monkeypatch.setattr(PatternTranslator, "translate", translate)
+
+
+def test_hit_reuses_output_without_translating(tmp_path, capsys, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    argv = ["--text", PATTERN, "--format", "planner", "--cache-dir", str(cache_dir)]
+    assert main(argv) == 0
+    expected = capsys.readouterr().out
+    assert main(["--text", PATTERN, "--format", "planner"]) == 0
+    assert capsys.readouterr().out == expected
+    assert len(_entries(cache_dir)) == 1
+
+    _refuse_translation(monkeypatch)
+    assert main(argv) == 0
+    assert capsys.readouterr().out == expected
+    output = tmp_path / "job.json"
+    assert main([*argv, "-o", str(output)]) == 0
+    assert output.read_text(encoding="utf-8") == expected
+
+
+def test_key_covers_pattern_options_and_profile(tmp_path, capsys):
+    cache_dir = tmp_path / "cache"
+    profile = tmp_path / "profile.json"
+    axis = {"microstepping": 16, "steps_per_mm": 80.0}
+    axes = {
+        name: {**axis, "travel_min_mm": -10.0, "travel_max_mm": 200.0} for name in "XYZ"
+    }
+    profile.write_text(json.dumps({"axes": axes}), encoding="utf-8")
+    base = ["--cache-dir", str(cache_dir), "--text", PATTERN]
+    runs = [
+        [],
+        ["--format", "json"],
+        ["--format", "json", "--compact"],
+        ["--format", "planner", "--planner-version", "1"],
+        ["--format", "planner", "--machine-profile", str(profile)],
+        ["--format", "planner", "--home-state", "homed"],
+    ]
+    for extra in runs:
+        assert main([*base, *extra]) == 0
+    assert main(["--cache-dir", str(cache_dir), "--text", "CHAIN 4"]) == 0
+    # Changing the profile file itself gives a new entry too.
+    axes["X"]["travel_max_mm"] = 150.0
+    profile.write_text(json.dumps({"axes": axes}), encoding="utf-8")
+    assert main([*base, "--format", "planner", "--machine-profile", str(profile)]) == 0
+    # Output options that do not change the bytes share an entry.
+    assert main([*base, "--buffer-size", "7", "--jobs", "2"]) == 0
+    capsys.readouterr()
+
+    assert len(_entries(cache_dir)) == len(runs) + 2
+
+
+def test_environment_and_no_cache(tmp_path, capsys, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("WOVE_CACHE_DIR", str(cache_dir))
+
+    assert main(["--text", PATTERN, "--no-cache"]) == 0
+    assert not cache_dir.exists()
+    expected = capsys.readouterr().out
+    assert main(["--text", PATTERN]) == 0
+    assert capsys.readouterr().out == expected
+    assert len(_entries(cache_dir)) == 1
+
+    _refuse_translation(monkeypatch)
+    assert main(["--text", PATTERN]) == 0
+    assert capsys.readouterr().out == expected
+
+
+def test_compressed_outputs_and_failures_are_cached_correctly(tmp_path, capsys):
+    cache_dir = tmp_path / "cache"
+    output = tmp_path / "job.gcode.gz"
+    argv = ["--text", PATTERN, "--cache-dir", str(cache_dir)]
+
+    assert main([*argv, "-o", str(output)]) == 0
+    assert main(argv) == 0
+    plain = capsys.readouterr().out
+    assert gzip.decompress(output.read_bytes()).decode("utf-8") == plain
+    assert [name.endswith(".gz") for name in _entries(cache_dir)].count(True) == 1
+
+    assert main(["--text", "KNIT 1", "--cache-dir", str(cache_dir)]) == 1
+    assert len(_entries(cache_dir)) == 2
+
+
+def test_store_is_atomic_and_eviction_keeps_recent_entries(tmp_path):
+    cache = OutputCache(tmp_path, max_bytes=250)
+
+    def failing(path):
+        path.write_bytes(b"partial")
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        cache.store("broken", "", failing)
+    assert _entries(tmp_path) == []
+
+    for number, key in enumerate("abc"):
+        path = cache.store(key, "", lambda path: path.write_bytes(b"x" * 100))
+        os.utime(path, ns=(number * 10**9, number * 10**9))
+    assert cache.lookup("a") is not None  # now the most recently used
+    newest = cache.store("d", "", lambda path: path.write_bytes(b"x" * 100))
+    cache.evict(keep=newest)
+
+    assert _entries(tmp_path) == ["a", "d"]
+    assert cache.lookup("b") is None
+    with pytest.raises(ValueError):
+        OutputCache(tmp_path, max_bytes=0)
@@ -0,0 +1,139 @@
+"""Tests for chunked planner exports."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import jsonschema
+import pytest
+from referencing import Registry, Resource
+
+from wove.pattern_cli import PatternTranslator, _planner_payload, main
+from wove.pattern_cli.chunks import chunk_path
+
+SCHEMA_DIR = Path(__file__).resolve().parents[2] / "docs" / "schema"
+PATTERN = "CHAIN 3\nPAUSE 0.4\nMOVE 18 5\nTURN 7\nSINGLE 2\nSLIP 1"
+
+
+def _validators():
+    planner = json.loads((SCHEMA_DIR / "pattern-cli.schema.json").read_text())
+    manifest = json.loads((SCHEMA_DIR / "pattern-cli-manifest.schema.json").read_text())
+    registry = Registry().with_resource(planner["$id"], Resource.from_contents(planner))
+    return (
+        jsonschema.Draft202012Validator(planner),
+        jsonschema.Draft202012Validator(manifest, registry=registry),
+    )
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("job.planner.json", "job.planner.chunk-00003.json"),
+        ("job.planner.json.gz", "job.planner.chunk-00003.json.gz"),
+        ("job", "job.chunk-00003"),
+    ],
+)
+def test_chunk_path_keeps_extension_and_compression(tmp_path, name, expected):
+    assert chunk_path(tmp_path / name, 3) == tmp_path / expected
+
+
+@pytest.mark.parametrize("version", ["1", "2"])
+def test_main_chunk_commands_writes_manifest_and_chunks(tmp_path, version):
+    manifest_path = tmp_path / "job.planner.json"
+    flags = ["--format", "planner", "--planner-version", version]
+
+    exit_code = main(
+        ["--text", PATTERN, *flags, "--chunk-commands", "7", "-o", str(manifest_path)]
+    )
+
+    assert exit_code == 0
+    planner_validator, manifest_validator = _validators()
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest_validator.validate(manifest)
+    translator = PatternTranslator()
+    translator.translate(PATTERN)
+    full = _planner_payload(translator.planner_events, version=1)
+    assert manifest["version"] == int(version)
+    assert manifest["count"] == len(full["commands"])
+    assert manifest["bounds"] == full["bounds"]
+    assert [chunk["start"] for chunk in manifest["chunks"]] == list(
+        range(0, manifest["count"], 7)
+    )
+
+    commands = []
+    for chunk in manifest["chunks"]:
+        payload = json.loads((tmp_path / chunk["path"]).read_text(encoding="utf-8"))
+        planner_validator.validate(payload)
+        assert payload["bounds"] == chunk["bounds"]
+        if version == "1":
+            commands.extend(payload["commands"])
+            continue
+        strings = payload["strings"]
+        columns = payload["commands"]
+        assert columns["count"] == chunk["count"]
+        assert set(strings) <= {entry["command"] for entry in full["commands"]} | {
+            entry.get("comment") for entry in full["commands"]
+        }
+        for index in range(columns["count"]):
+            comment_id = columns["comment_ids"][index]
+            commands.append(
+                {
+                    "command": strings[columns["command_ids"][index]],
+                    "comment": strings[comment_id] if comment_id >= 0 else None,
+                    "x_mm": columns["x_mm"][index],
+                }
+            )
+    if version == "1":
+        assert commands == full["commands"]
+    else:
+        assert commands == [
+            {
+                "command": entry["command"],
+                "comment": entry.get("comment"),
+                "x_mm": entry["state"]["x_mm"],
+            }
+            for entry in full["commands"]
+        ]
+
+
+@pytest.mark.parametrize("version", ["1", "2"])
+def test_chunk_feed_indices_point_at_feed_commands(tmp_path, version):
+    manifest_path = tmp_path / "job.planner.json"
+    flags = ["--format", "planner", "--planner-version", version]
+    argv = ["--text", PATTERN, *flags, "--chunk-commands", "7"]
+    assert main([*argv, "-o", str(manifest_path)]) == 0
+
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    kinds = []
+    for chunk in manifest["chunks"][1:]:
+        payload = json.loads((tmp_path / chunk["path"]).read_text(encoding="utf-8"))
+        if version == "1":
+            by_index = {entry["index"]: entry for entry in payload["commands"]}
+            kinds += [by_index[index]["kind"] for index in payload["feed_indices"]]
+        else:
+            names, column = payload["kind_names"], payload["commands"]["kinds"]
+            kinds += [names[column[index]] for index in payload["feed_indices"]]
+    assert len(kinds) > 1
+    assert set(kinds) == {"feed"}
+
+
+def test_main_chunk_commands_requires_planner_output(capsys):
+    exit_code = main(
+        ["--text", "CHAIN 1", "--format", "planner", "--chunk-commands", "5"]
+    )
+    assert exit_code == 1
+    assert "--chunk-commands requires --format planner" in capsys.readouterr().err
+
+
+def test_section_keeps_only_used_strings():
+    translator = PatternTranslator()
+    translator.translate(PATTERN)
+    events = translator.planner_events
+
+    section = events.section(3, 9)
+
+    assert list(section) == events[3:9]
+    assert list(section.line_numbers) == list(events.line_numbers[3:9])
+    used = set(section.commands()) | set(section.comments()) - {None}
+    assert set(section.strings) == used
@@ -0,0 +1,102 @@
+"""Tests for lazily rendered comments and comment-free G-code output."""
+
+from __future__ import annotations
+
+import io
+from dataclasses import fields, replace
+
+from wove.pattern_cli import PatternTranslator, _planner_payload, main
+from wove.pattern_cli.binary import PlannerBinary, write_planner_binary
+from wove.pattern_cli.encoder import store_bounds
+
+PATTERN = "CHAIN 3\nTURN\nSINGLE 2"
+
+
+def test_stitch_comments_are_stored_as_templates():
+    translator = PatternTranslator()
+    lines = translator.translate("CHAIN 500")
+    events = translator.planner_events
+
+    assert lines[-1].comment == "chain stitch 500 of 500: advance"
+    assert events.comment_at(len(events) - 4) == "chain stitch 500 of 500: plunge"
+    assert len(events.comment_templates) == 4
+    assert not any("stitch" in text for text in events.strings)
+    assert [line.comment for line in lines] == list(events.comments())
+
+    events.render_comments()
+    assert "chain stitch 1 of 500: feed yarn" in events.strings
+    assert min(events.comment_ids) >= 0
+    assert [line.comment for line in lines] == list(events.comments())
+
+
+def test_templated_lines_are_ordinary_dataclasses():
+    lines = PatternTranslator().translate("SINGLE 1")
+    raise_line = lines[-2]
+
+    assert [field.name for field in fields(raise_line)] == [
+        "command",
+        "comment_template",
+        "comment_argument",
+        "stitch_run",
+    ]
+    assert raise_line.comment == "single stitch 1 of 1: raise"
+    assert raise_line.as_text() == "G1 Z4.00 F600 ; single stitch 1 of 1: raise"
+    assert raise_line.stitch_run is not None
+    # The stitch run is bookkeeping for macro output, not part of the line.
+    copy = replace(raise_line, stitch_run=None)
+    assert copy == raise_line
+    assert hash(copy) == hash(raise_line)
+    assert replace(raise_line, comment_argument=2).comment == (
+        "single stitch 2 of 1: raise"
+    )
+
+
+def test_exports_render_templated_comments(tmp_path):
+    translator = PatternTranslator()
+    translator.translate(PATTERN)
+    events = translator.planner_events
+    expected = list(events.comments())
+
+    payload = _planner_payload(events, version=2)
+    strings = payload["strings"]
+    assert [
+        strings[comment_id] if comment_id >= 0 else None
+        for comment_id in payload["commands"]["comment_ids"]
+    ] == expected
+
+    handle = io.BytesIO()
+    write_planner_binary(handle, {}, events, store_bounds(events), {}, reading=float)
+    path = tmp_path / "job.planner.bin"
+    path.write_bytes(handle.getvalue())
+    with PlannerBinary(path) as binary:
+        assert list(binary.to_store().comments()) == expected
+
+
+def test_merging_stores_keeps_templated_comments():
+    first = PatternTranslator()
+    first.translate("CHAIN 2")
+    second = PatternTranslator()
+    second.translate("DOUBLE 3\nPAUSE 1")
+    events = first.planner_events
+    expected = [*events.comments(), *second.planner_events.comments()]
+
+    events.extend_from(second.planner_events)
+
+    assert list(events.comments()) == expected
+    assert len(events.comment_templates) == 8
+
+
+def test_no_comments_writes_bare_gcode(capsys):
+    assert main(["--text", PATTERN]) == 0
+    commented = capsys.readouterr().out.splitlines()
+
+    assert main(["--text", PATTERN, "--no-comments"]) == 0
+    bare = capsys.readouterr().out.splitlines()
+    assert bare == [line.split(" ; ")[0] for line in commented]
+    assert ";" not in "".join(bare)
+
+    assert main(["--text", PATTERN, "--no-comments", "--stream"]) == 0
+    assert capsys.readouterr().out.splitlines() == bare
+
+    assert main(["--text", PATTERN, "--format", "json", "--no-comments"]) == 0
+    assert "chain stitch 1 of 3: plunge" in capsys.readouterr().out
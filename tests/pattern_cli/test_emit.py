@@ -0,0 +1,101 @@
+"""Tests for writing several formats from one translation with ``--emit``."""
+
+from __future__ import annotations
+
+import gzip
+
+import pytest
+
+from wove.pattern_cli import PatternTranslator, main
+
+PATTERN = "CHAIN 3\nTURN\nSINGLE 2"
+
+
+def _single(capsys, *argv):
+    assert main(["--text", PATTERN, *argv]) == 0
+    return capsys.readouterr().out
+
+
+@pytest.fixture
+def translations(monkeypatch):
+    calls = []
+    translate = PatternTranslator.translate
+
+    def counting(self, source):
+        calls.append(source)
+        return translate(self, source)
+
+    monkeypatch.setattr(PatternTranslator, "translate", counting)
+    return calls
+
+
+def test_emit_fans_one_translation_out_to_every_writer(tmp_path, capsys, translations):
+    expected = {
+        fmt: _single(capsys, "--format", fmt, "--compact")
+        for fmt in ("gcode", "json", "planner")
+    }
+    translations.clear()
+    argv = [
+        "--text",
+        PATTERN,
+        "--compact",
+        "--emit",
+        f"gcode={tmp_path / 'job.gcode.gz'}",
+        "--emit",
+        "json=-",
+        "--emit",
+        f"planner={tmp_path / 'job.planner.json'}",
+    ]
+
+    assert main(argv) == 0
+
+    assert len(translations) == 1
+    assert capsys.readouterr().out == expected["json"]
+    gcode = gzip.decompress((tmp_path / "job.gcode.gz").read_bytes())
+    assert gcode.decode("utf-8") == expected["gcode"]
+    planner = (tmp_path / "job.planner.json").read_text(encoding="utf-8")
+    assert planner == expected["planner"]
+
+
+def test_emit_uses_the_cache_per_target(tmp_path, capsys, translations):
+    cache = ["--cache-dir", str(tmp_path / "cache")]
+    gcode = tmp_path / "job.gcode"
+    argv = ["--text", PATTERN, *cache, "--emit", f"gcode={gcode}", "--emit", "json=-"]
+    assert main(argv) == 0
+    first = capsys.readouterr().out
+
+    gcode.unlink()
+    assert main(argv) == 0
+    assert capsys.readouterr().out == first
+    assert gcode.read_text(encoding="utf-8") == _single(capsys)
+    assert len(translations) == 2  # the first run and the plain gcode run
+
+    # A new target is a miss, so the whole job is translated again.
+    planner = f"planner={tmp_path / 'job.planner.json'}"
+    assert main([*argv, "--emit", planner]) == 0
+    assert capsys.readouterr().out == first
+    assert len(translations) == 3
+
+
+@pytest.mark.parametrize(
+    ("argv", "message"),
+    [
+        (["--emit", "json=-", "--output", "job.gcode"], "cannot be combined"),
+        (["--emit", "json=-", "--stream"], "cannot be combined"),
+        (["--emit", "json=-", "--emit", "planner=-"], "more than once"),
+        (["--emit", "json=a.json", "--emit", "gcode=./a.json"], "more than once"),
+    ],
+)
+def test_emit_rejects_conflicting_targets(tmp_path, capsys, monkeypatch, argv, message):
+    monkeypatch.chdir(tmp_path)
+
+    assert main(["--text", PATTERN, *argv]) == 1
+    assert message in capsys.readouterr().err
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("spec", ["yaml=job.yaml", "gcode", "gcode="])
+def test_emit_requires_format_and_path(spec, capsys):
+    with pytest.raises(SystemExit):
+        main(["--text", PATTERN, "--emit", spec])
+    assert "expected FORMAT=PATH" in capsys.readouterr().err
@@ -0,0 +1,227 @@
+"""Tests for the incremental json and planner encoders."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from wove.machine_profile import AxisProfile, MachineProfile
+from wove.pattern_cli import (
+    GCodeLine,
+    PatternTranslator,
+    _planner_payload,
+    _write_output,
+    main,
+)
+from wove.pattern_cli.encoder import (
+    DEFAULT_PLANNER_VERSION,
+    ENTRIES_PER_FRAGMENT,
+    iter_commands_json,
+    iter_planner_json,
+    store_bounds,
+)
+from wove.pattern_cli.events import PlannerEventStore
+from wove.pattern_cli.seek import KEYFRAME_INTERVAL
+
+PATTERN = "CHAIN 3\nPAUSE 0.4\nMOVE 18 5\nTURN 7\nSINGLE 2\nSLIP 1"
+PROFILE = MachineProfile(
+    axes={
+        "X": AxisProfile("X", 16, 80.0, 0.0, 250.0),
+        "Y": AxisProfile("Y", 16, 80.0, 0.0, 200.0),
+        "Z": AxisProfile("Z", 16, 400.0, -10.0, 15.0),
+    }
+)
+
+
+def _translate(source: str = PATTERN):
+    translator = PatternTranslator()
+    lines = translator.translate(source)
+    return lines, translator.planner_events
+
+
+@pytest.mark.parametrize("profile", [None, PROFILE])
+@pytest.mark.parametrize("compact", [False, True])
+def test_planner_output_matches_json_dumps(tmp_path, profile, compact):
+    lines, events = _translate()
+    events.append('G1 "quoted" \\ path', "naïve — comment", 1.0, 2.5, 3.0, 4.0)
+    path = tmp_path / "planner.json"
+
+    _write_output(
+        lines,
+        path,
+        "planner",
+        planner_events=events,
+        machine_profile=profile,
+        require_home=True,
+        home_state="homed",
+        compact=compact,
+        planner_version=1,
+    )
+
+    payload = _planner_payload(
+        events,
+        machine_profile=profile,
+        require_home=True,
+        home_state="homed",
+        version=1,
+    )
+    if compact:
+        expected = json.dumps(payload, separators=(",", ":"))
+    else:
+        expected = json.dumps(payload, indent=2)
+    assert path.read_text(encoding="utf-8") == expected
+
+
+@pytest.mark.parametrize("profile", [None, PROFILE])
+@pytest.mark.parametrize("compact", [False, True])
+def test_planner_v2_output_matches_payload(tmp_path, profile, compact):
+    lines, events = _translate()
+    events.append('G1 "quoted" \\ path', "naïve — comment", 1.0, 2.5, 3.0, 4.0)
+    path = tmp_path / "planner.json"
+
+    _write_output(
+        lines,
+        path,
+        "planner",
+        planner_events=events,
+        machine_profile=profile,
+        compact=compact,
+        planner_version=2,
+    )
+
+    text = path.read_text(encoding="utf-8")
+    payload = _planner_payload(events, machine_profile=profile, version=2)
+    assert json.loads(text) == payload
+    assert list(json.loads(text)) == list(payload)
+    assert ("\n" in text) is not compact
+
+
+def test_planner_v2_columns_expand_to_v1_commands():
+    _, events = _translate()
+    legacy = _planner_payload(events, version=1)
+    columnar = _planner_payload(events, version=2)
+
+    strings = columnar["strings"]
+    columns = columnar["commands"]
+    assert len(strings) == len(set(strings))
+    assert columns["count"] == len(legacy["commands"])
+    for index, entry in enumerate(legacy["commands"]):
+        assert strings[columns["command_ids"][index]] == entry["command"]
+        comment_id = columns["comment_ids"][index]
+        assert (strings[comment_id] if comment_id >= 0 else None) == entry.get(
+            "comment"
+        )
+        kind_name = columnar["kind_names"][columns["kinds"][index]]
+        assert kind_name == entry["kind"]
+        for name, value in entry["state"].items():
+            assert columns[name][index] == value
+    assert columnar["feed_indices"] == legacy["feed_indices"]
+
+
+def test_main_planner_v2_is_smaller_than_v1(capsys):
+    source = "\n".join([PATTERN] * 20)
+    assert main(["--text", source, "--format", "planner", "--compact"]) == 0
+    columnar = capsys.readouterr().out
+    flags = ["--planner-version", "1", "--compact"]
+    assert main(["--text", source, "--format", "planner", *flags]) == 0
+    legacy = capsys.readouterr().out
+
+    assert json.loads(columnar)["version"] == 2
+    assert len(columnar) < len(legacy) * 0.5
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_json_output_matches_json_dumps(tmp_path, compact):
+    lines, _ = _translate()
+    lines.append(GCodeLine("M117 é", ""))
+    path = tmp_path / "commands.json"
+
+    _write_output(lines, path, "json", compact=compact)
+
+    payload = [line.as_dict() for line in lines]
+    if compact:
+        expected = json.dumps(payload, separators=(",", ":"))
+    else:
+        expected = json.dumps(payload, indent=2)
+    assert path.read_text(encoding="utf-8") == expected
+
+
+def test_planner_json_splits_large_stores_into_bounded_fragments():
+    _, events = _translate("CHAIN 200")
+    fragments = list(
+        iter_planner_json(
+            {"version": 1},
+            [events],
+            {},
+            reading=lambda kind: 0.0,
+            bounds=store_bounds(events),
+        )
+    )
+
+    entries = [fragment.count('"index"') for fragment in fragments]
+    assert sum(entries) == len(events) > 3 * ENTRIES_PER_FRAGMENT
+    assert max(entries) == ENTRIES_PER_FRAGMENT
+    payload = json.loads("".join(fragments))
+    assert [entry["index"] for entry in payload["commands"]] == list(range(len(events)))
+
+
+def test_iter_commands_json_handles_empty_input():
+    assert "".join(iter_commands_json([])) == "[]"
+    assert "".join(iter_commands_json([], compact=True)) == "[]"
+
+
+def test_iter_planner_events_batches_match_full_translation():
+    translator = PatternTranslator()
+    batches = list(translator.iter_planner_events(PATTERN.splitlines()))
+
+    merged = PlannerEventStore()
+    for batch in batches:
+        merged.extend_from(batch)
+    _, events = _translate()
+    assert len(batches) > 2
+    assert list(merged) == list(events)
+    assert merged.line_numbers == events.line_numbers
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_main_stream_planner_matches_buffered_payload(tmp_path, compact):
+    pattern_path = tmp_path / "pattern.txt"
+    pattern_path.write_text(PATTERN, encoding="utf-8")
+    buffered = tmp_path / "buffered.json"
+    streamed = tmp_path / "streamed.json"
+    flags = ["--format", "planner", "--planner-version", "1"]
+    flags += ["--compact"] if compact else []
+
+    assert main([str(pattern_path), *flags, "--output", str(buffered)]) == 0
+    assert main([str(pattern_path), *flags, "--stream", "-o", str(streamed)]) == 0
+
+    buffered_text = buffered.read_text(encoding="utf-8")
+    streamed_text = streamed.read_text(encoding="utf-8")
+    assert json.loads(streamed_text) == json.loads(buffered_text)
+    assert ("\n" in streamed_text) is not compact
+
+
+def test_main_compact_shrinks_planner_output(capsys):
+    flags = ["--format", "planner", "--planner-version", "1"]
+    assert main(["--text", PATTERN, *flags]) == 0
+    indented = capsys.readouterr().out
+    assert main(["--text", PATTERN, *flags, "--compact"]) == 0
+    compact = capsys.readouterr().out
+
+    assert json.loads(compact) == json.loads(indented)
+    assert len(compact) < len(indented) * 0.7
+
+
+def test_planner_entry_points_share_the_default_version(tmp_path, capsys):
+    lines, events = _translate()
+    path = tmp_path / "planner.json"
+    _write_output(lines, path, "planner", planner_events=events)
+    assert main(["--text", PATTERN, "--format", "planner"]) == 0
+
+    written = json.loads(path.read_text(encoding="utf-8"))
+    printed = json.loads(capsys.readouterr().out)
+    payload = _planner_payload(events, seek_interval=KEYFRAME_INTERVAL)
+    assert payload["version"] == DEFAULT_PLANNER_VERSION == 2
+    assert printed == payload
+    assert written == _planner_payload(events)
@@ -0,0 +1,120 @@
+"""Tests for the columnar planner event store."""
+
+import pytest
+
+from wove.pattern_cli import PatternTranslator, _planner_payload
+from wove.pattern_cli.events import EventKind, PlannerEvent, PlannerEventStore
+
+
+def test_store_interns_repeated_strings():
+    store = PlannerEventStore()
+    first, _ = store.append("G1 Z4.00 F600", "raise", 0.0, 0.0, 4.0, 0.0)
+    second, comment = store.append("G1 Z4.00 F600", None, 5.0, 0.0, 4.0, 0.5)
+
+    assert first is second
+    assert comment is None
+    assert store.strings == ["G1 Z4.00 F600", "raise"]
+    assert list(store.command_ids) == [0, 0]
+    assert list(store.comment_ids) == [1, -1]
+
+
+def test_store_rows_match_planner_events():
+    store = PlannerEventStore()
+    store.append("G21", "use millimeters", 0.0, 0.0, 4.0, 0.0)
+    store.append("G0 X5.00 Y0.00 F1200", None, 5.0, 0.0, 4.0, 0.5)
+
+    assert len(store) == 2
+    assert store[0] == PlannerEvent("G21", "use millimeters", 0.0, 0.0, 4.0, 0.0)
+    assert store[-1].x_mm == pytest.approx(5.0)
+    assert store[-1].comment is None
+    assert [event.command for event in store[0:2]] == [
+        "G21",
+        "G0 X5.00 Y0.00 F1200",
+    ]
+    assert list(store) == store[:]
+
+
+def test_from_events_round_trips_rows():
+    translator = PatternTranslator()
+    translator.translate("CHAIN 2\nTURN")
+    original = translator.planner_events
+
+    rebuilt = PlannerEventStore.from_events(list(original))
+
+    assert PlannerEventStore.from_events(original) is original
+    assert list(rebuilt) == list(original)
+    assert list(rebuilt.x_mm) == list(original.x_mm)
+
+
+def test_translator_shares_interned_strings_with_lines():
+    translator = PatternTranslator()
+    lines = translator.translate("CHAIN 3")
+    raises = [line.command for line in lines if line.command == "G1 Z4.00 F600"]
+
+    assert len(raises) == 3
+    assert all(command is raises[0] for command in raises)
+    assert translator.planner_events.command_at(-1) == lines[-1].command
+
+
+def test_extend_keeps_string_table_in_sync():
+    store = PlannerEventStore()
+    store.append("G21", None, 0.0, 0.0, 4.0, 0.0)
+
+    store.extend(
+        ["G1 Z4.00 F600", "G21", "G1 Z4.00 F600", "G4 P10"],
+        ["raise", None, "raise", "pause"],
+        [0.0] * 4,
+        [0.0] * 4,
+        [4.0] * 4,
+        [0.0] * 4,
+    )
+
+    assert store.strings == ["G21", "G1 Z4.00 F600", "G4 P10", "raise", "pause"]
+    assert list(store.commands()) == [
+        "G21",
+        "G1 Z4.00 F600",
+        "G21",
+        "G1 Z4.00 F600",
+        "G4 P10",
+    ]
+    assert list(store.comments()) == [None, "raise", None, "raise", "pause"]
+    assert store.intern("pause") == 4
+
+
+def test_translator_tags_event_kinds():
+    translator = PatternTranslator()
+    translator.translate(
+        "DEFINE dot\n  SLIP 1\nEND\n"
+        "CHAIN 1\nPAUSE 0.2\nTURN\nMOVE 10 10\nPLACE dot 20 20"
+    )
+    events = translator.planner_events
+    stitch = [EventKind.PLUNGE, EventKind.FEED, EventKind.RAISE, EventKind.ADVANCE]
+
+    assert [events.kind_at(index) for index in range(len(events))] == [
+        *[EventKind.SETUP] * 3,
+        *stitch,
+        EventKind.PAUSE,
+        EventKind.TURN,
+        EventKind.REPOSITION,
+        EventKind.REPOSITION,
+        *stitch,
+    ]
+    assert [event.kind for event in events] == list(map(EventKind, events.kinds))
+    assert events[4].kind is EventKind.FEED
+
+
+def test_feed_indices_follow_kinds_not_comments():
+    translator = PatternTranslator()
+    translator.translate("CHAIN 2\nTURN\nDOUBLE 1")
+    events = translator.planner_events
+    payload = _planner_payload(events, version=1)
+
+    feeds = events.indices_of(EventKind.FEED)
+    assert payload["feed_indices"] == feeds == [4, 8, 13]
+    assert [payload["commands"][index]["kind"] for index in feeds] == ["feed"] * 3
+
+    renamed = PlannerEventStore.from_events(
+        PlannerEvent("G1 E1.00 F300", "pull", 0.0, 0.0, 0.0, 1.0, EventKind.FEED)
+        for _ in range(2)
+    )
+    assert _planner_payload(renamed)["feed_indices"] == [0, 1]
@@ -0,0 +1,65 @@
+"""Tests for the fixed-point coordinate helpers."""
+
+from __future__ import annotations
+
+import pytest
+
+from wove.pattern_cli import PatternTranslator
+from wove.pattern_cli.fixed import format_mm, format_mm_run, to_mm, to_um
+
+
+@pytest.mark.parametrize(
+    ("um", "text"),
+    [
+        (0, "0.00"),
+        (4000, "4.00"),
+        (-1500, "-1.50"),
+        (125, "0.12"),
+        (-125, "-0.12"),
+        (135, "0.14"),
+        (124, "0.12"),
+        (182135, "182.13"),
+        (71515, "71.52"),
+        (123456789, "123456.79"),
+    ],
+)
+def test_format_mm_rounds_like_float_formatting(um, text):
+    assert format_mm(um) == text
+    assert format_mm_run([um]) == [text]
+    assert format_mm_run([um], recurring=False) == [text]
+
+
+def test_parsed_coordinates_format_as_written_floats():
+    translator = PatternTranslator()
+    lines = translator.translate("MOVE 116.42 182.135\nMOVE 71.515 0.125")
+
+    moves = [line.command for line in lines if line.command.startswith("G0")]
+    assert moves == ["G0 X116.42 Y182.13 F1200", "G0 X71.52 Y0.12 F1200"]
+    for value in ("116.42", "182.135", "71.515", "0.125", "2.675"):
+        assert format_mm(to_um(float(value))) == f"{float(value):.2f}"
+
+
+def test_conversions_round_trip():
+    for mm in (0.3, 0.6, 2.5, -1.5, 12.3456, 219.99):
+        assert to_mm(to_um(mm)) == round(mm, 3)
+    assert to_um(0.0004) == 0
+
+
+def test_long_runs_accumulate_without_drift():
+    translator = PatternTranslator()
+    lines = translator.translate("SLIP 100000\nMOVE 0.1 0.2\nSINGLE 3")
+    events = translator.planner_events
+
+    feed = next(
+        line for line in reversed(lines[:-12]) if line.command.startswith("G1 E")
+    )
+    assert feed.command == "G1 E30000.00 F300"
+    assert max(events.extrusion_mm) == 30000.0 + 3 * 0.6
+    assert events.x_mm[-1] == 0.1 + 3 * 4.5
+    # Splitting a run across lines gives exactly the same totals.
+    split = PatternTranslator()
+    split.translate("\n".join(["SLIP 1"] * 1000))
+    whole = PatternTranslator()
+    whole.translate("SLIP 1000")
+    assert split.planner_events.extrusion_mm[-1] == 300.0
+    assert whole.planner_events.extrusion_mm[-1] == 300.0
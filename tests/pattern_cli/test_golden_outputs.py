@@ -39,6 +39,7 @@ def _generate_outputs(pattern_text: str):
     planner_payload = _planner_payload(
         translator.planner_events,
         machine_profile=profile,
+        version=1,
     )
     return gcode, json_payload, planner_payload
 
@@ -0,0 +1,147 @@
+"""Tests for checkpointed incremental pattern translation."""
+
+from __future__ import annotations
+
+import hypothesis.strategies as st
+import pytest
+from hypothesis import given, settings
+
+from wove.pattern_cli import PatternTranslator
+from wove.pattern_cli.incremental import IncrementalTranslator
+
+BASE_PATTERN = [
+    "CHAIN 4",
+    "TURN",
+    "SINGLE 3",
+    "PAUSE 0.5",
+    "MOVE 20 30",
+    "REPEAT 2",
+    "  DOUBLE 1",
+    "  TURN 5",
+    "END",
+    "SLIP 2",
+]
+LINE_CHOICES = [
+    "CHAIN 2",
+    "SINGLE 1",
+    "TURN",
+    "TURN 4",
+    "MOVE 15 12",
+    "PAUSE 0.25",
+    "# note",
+    "",
+]
+
+
+def _apply(previous, diff):
+    start = diff.start
+    end = start + diff.removed
+    return previous[:start] + diff.inserted + previous[end:]
+
+
+def _assert_same_columns(incremental: IncrementalTranslator, source: str) -> None:
+    full = PatternTranslator()
+    full.translate(source)
+    for name in (
+        "line_numbers",
+        "row_numbers",
+        "stitch_ordinals",
+        "durations_s",
+        "kinds",
+    ):
+        actual = getattr(incremental.planner_events, name)
+        assert actual == getattr(full.planner_events, name), name
+
+
+def _full(source: str):
+    translator = PatternTranslator()
+    lines = translator.translate(source)
+    return lines, list(translator.planner_events)
+
+
+def test_first_update_translates_everything():
+    incremental = IncrementalTranslator()
+    source = "\n".join(BASE_PATTERN)
+
+    diff = incremental.update(source)
+
+    expected, events = _full(source)
+    assert diff.start == 0
+    assert diff.removed == 0
+    assert diff.inserted == expected
+    assert list(incremental.planner_events) == events
+
+
+def test_unchanged_source_reports_no_diff():
+    incremental = IncrementalTranslator()
+    incremental.update("CHAIN 2")
+    assert incremental.update("CHAIN 2").unchanged
+
+
+def test_edit_after_absolute_move_converges_early():
+    incremental = IncrementalTranslator()
+    incremental.update("\n".join(BASE_PATTERN))
+    before = incremental.lines
+
+    translated: list[int] = []
+    run_line = incremental._translator._run_line
+
+    def counting(raw_line, line_number):
+        translated.append(line_number)
+        run_line(raw_line, line_number)
+
+    incremental._translator._run_line = counting
+    edited = list(BASE_PATTERN)
+    edited[3] = "PAUSE 1.5"
+    diff = incremental.update("\n".join(edited))
+
+    assert translated == [4]
+    assert diff.removed == 1
+    assert [line.command for line in diff.inserted] == ["G4 P1500"]
+    assert _apply(before, diff) == incremental.lines
+    assert incremental.lines == _full("\n".join(edited))[0]
+
+
+def test_failed_update_forces_full_retranslation():
+    incremental = IncrementalTranslator()
+    incremental.update("CHAIN 1")
+    with pytest.raises(ValueError):
+        incremental.update("CHAIN 1\nCHAIN 0")
+
+    diff = incremental.update("CHAIN 2")
+
+    assert diff.start == 0
+    assert incremental.lines == _full("CHAIN 2")[0]
+
+
+@settings(max_examples=60, deadline=None)
+@given(
+    start=st.integers(min_value=0, max_value=len(BASE_PATTERN)),
+    removed=st.integers(min_value=0, max_value=3),
+    inserted=st.lists(st.sampled_from(LINE_CHOICES), max_size=3),
+)
+def test_incremental_matches_full_translation(start, removed, inserted):
+    incremental = IncrementalTranslator()
+    incremental.update("\n".join(BASE_PATTERN))
+    before = incremental.lines
+
+    end = start + removed
+    edited = BASE_PATTERN[:start] + inserted + BASE_PATTERN[end:]
+    try:
+        expected, events = _full("\n".join(edited))
+    except ValueError:
+        with pytest.raises(ValueError):
+            incremental.update("\n".join(edited))
+        return
+    diff = incremental.update("\n".join(edited))
+
+    assert incremental.lines == expected
+    assert list(incremental.planner_events) == events
+    assert _apply(before, diff) == expected
+    _assert_same_columns(incremental, "\n".join(edited))
+
+    # A second edit reuses the spliced checkpoints.
+    diff = incremental.update("\n".join(BASE_PATTERN))
+    assert incremental.lines == _full("\n".join(BASE_PATTERN))[0]
+    assert _apply(expected, diff) == incremental.lines
+    _assert_same_columns(incremental, "\n".join(BASE_PATTERN))
@@ -0,0 +1,126 @@
+"""Tests for compiled travel-limit checks and the validation sweep."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from wove.machine_profile import AxisProfile, MachineProfile
+from wove.pattern_cli import PatternTranslator, main
+from wove.pattern_cli.limits import find_limit_violations
+
+
+def _profile(x_max: float = 120.0, x_min: float = 0.0) -> MachineProfile:
+    return MachineProfile(
+        axes={
+            "X": AxisProfile("X", 16, 80.0, x_min, x_max),
+            "Y": AxisProfile("Y", 16, 80.0, 0.0, 120.0),
+            "Z": AxisProfile("Z", 16, 400.0, -10.0, 15.0),
+        }
+    )
+
+
+def _events(source: str):
+    translator = PatternTranslator()
+    translator.translate(source)
+    return translator.planner_events
+
+
+def test_in_range_translation_skips_profile_lookups(monkeypatch):
+    calls: list[str] = []
+    original = MachineProfile.ensure_within
+
+    def counting(self, axis, position_mm, *, line_number=None):
+        calls.append(axis)
+        original(self, axis, position_mm, line_number=line_number)
+
+    monkeypatch.setattr(MachineProfile, "ensure_within", counting)
+    translator = PatternTranslator(machine_profile=_profile())
+
+    translator.translate("CHAIN 20\nTURN\nMOVE 10 20\nDOUBLE 5")
+
+    assert calls == []
+
+
+def test_events_record_source_lines():
+    events = _events("CHAIN 1\n\nTURN")
+
+    assert list(events.line_numbers) == [0, 0, 0, 1, 1, 1, 1, 3]
+
+
+def test_find_limit_violations_reports_every_line():
+    source = "CHAIN 3\nTURN\nSINGLE 3\nMOVE 50 10\nDOUBLE 1"
+    profile = _profile(x_max=10.0)
+
+    violations = find_limit_violations(_events(source), profile)
+
+    assert [(v.line_number, v.axis) for v in violations] == [
+        (1, "X"),
+        (3, "X"),
+        (4, "X"),
+        (5, "X"),
+    ]
+    with pytest.raises(ValueError) as excinfo:
+        PatternTranslator(machine_profile=profile).translate(source)
+    assert violations[0].message == str(excinfo.value)
+    assert violations[1].position_mm == pytest.approx(13.5)
+
+
+def test_find_limit_violations_ignores_generated_preamble():
+    events = _events("MOVE 5 5\nCHAIN 1")
+
+    assert find_limit_violations(events, _profile(x_min=1.0)) == []
+
+
+def test_find_limit_violations_requires_checked_axes():
+    profile = MachineProfile(axes={"X": AxisProfile("X", 16, 80.0, 0.0, 100.0)})
+
+    with pytest.raises(ValueError, match="missing axis 'Y'"):
+        find_limit_violations(_events("CHAIN 1"), profile)
+
+
+def _write_profile(tmp_path, x_max: float) -> str:
+    axes = {
+        "X": {"microstepping": 16, "steps_per_mm": 80, "min": 0, "max": x_max},
+        "Y": {"microstepping": 16, "steps_per_mm": 80, "min": 0, "max": 200},
+        "Z": {"microstepping": 16, "steps_per_mm": 400, "min": -10, "max": 15},
+    }
+    path = tmp_path / "profile.json"
+    path.write_text(json.dumps({"axes": axes}), encoding="utf-8")
+    return str(path)
+
+
+def test_main_validate_only_lists_all_violations(tmp_path, capsys):
+    profile = _write_profile(tmp_path, x_max=5.0)
+
+    exit_code = main(
+        ["--text", "CHAIN 2\nTURN\nSLIP 4", "--machine-profile", profile]
+        + ["--validate-only"]
+    )
+
+    assert exit_code == 1
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    errors = captured.err.splitlines()
+    assert len(errors) == 2
+    assert errors[0].endswith("(line 1)")
+    assert errors[1].endswith("(line 3)")
+
+
+def test_main_validate_only_reports_success(tmp_path, capsys):
+    profile = _write_profile(tmp_path, x_max=100.0)
+
+    exit_code = main(
+        ["--text", "CHAIN 2", "--machine-profile", profile, "--validate-only"]
+    )
+
+    assert exit_code == 0
+    assert capsys.readouterr().out == "11 commands within machine travel limits\n"
+
+
+def test_main_validate_only_requires_profile(capsys):
+    exit_code = main(["--text", "CHAIN 2", "--validate-only"])
+
+    assert exit_code == 1
+    assert "--validate-only requires --machine-profile" in capsys.readouterr().err
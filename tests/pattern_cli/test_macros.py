@@ -0,0 +1,68 @@
+"""Tests for stitch macro output and the generated Klipper macro."""
+
+from __future__ import annotations
+
+import configparser
+import json
+from functools import partial
+
+from tests.gcode_replay import gcode_lines, replay_motion
+from wove.pattern_cli import STITCH_PROFILES, main
+from wove.pattern_cli.macros import klipper_config
+
+PATTERN = "CHAIN 3\nTURN\nSINGLE 2\nDEFINE m\nSLIP 1\nEND\nPLACE m 20 10\nDOUBLE 4"
+_gcode = partial(gcode_lines, pattern=PATTERN)
+
+
+def test_stitch_macros_replace_each_run(capsys, tmp_path):
+    full = _gcode(capsys)
+    planner = tmp_path / "job.planner.json"
+    argv = ["--stitch-macros", "--emit", "gcode=-", "--emit", f"planner={planner}"]
+    macros = _gcode(capsys, *argv)
+
+    assert [line for line in macros if line.startswith("STITCH")] == [
+        "STITCH TYPE=CHAIN COUNT=3 SPACING=5.00 DEPTH=1.50 FEED=0.50",
+        "STITCH TYPE=SINGLE COUNT=2 SPACING=4.50 DEPTH=2.00 FEED=0.60",
+        "STITCH TYPE=DOUBLE COUNT=4 SPACING=5.50 DEPTH=2.50 FEED=0.70",
+    ]
+    # The placed motif keeps its expanded commands.
+    assert "G1 Z-1.00 F600" in macros
+    assert len(macros) == len(full) - 4 * (3 + 2 + 4) + 3
+    assert replay_motion(macros) == replay_motion(full)
+    payload = json.loads(planner.read_text(encoding="utf-8"))
+    assert payload["commands"]["count"] == len(full)
+
+
+def test_stitch_macros_compose_with_compaction(capsys):
+    full = _gcode(capsys)
+    argv = ["--stitch-macros", "--compact-gcode", "--relative-extrusion"]
+    compact = _gcode(capsys, *argv)
+
+    assert replay_motion(compact) == replay_motion(full)
+    # The motif's feed after two macro runs is still a single stitch's yarn.
+    assert "G1 E0.30 F300" in compact
+
+
+def test_parallel_translation_keeps_stitch_runs(capsys):
+    pattern = "\n".join(["CHAIN 5", "TURN", "SINGLE 4", "TURN"] * 12)
+    serial = _gcode(capsys, "--stitch-macros", pattern=pattern)
+
+    assert _gcode(capsys, "--stitch-macros", "--jobs", "2", pattern=pattern) == serial
+    assert sum(line.startswith("STITCH") for line in serial) == 24
+
+
+def test_klipper_config_matches_stitch_profiles(tmp_path):
+    path = tmp_path / "stitch.cfg"
+
+    assert main(["klipper-macros", "--output", str(path)]) == 0
+    assert path.read_text(encoding="utf-8") == klipper_config()
+    config = configparser.RawConfigParser()
+    config.read_string(klipper_config())
+    macro = config["gcode_macro STITCH"]
+    profiles = json.loads(macro["variable_profiles"])
+    assert profiles == {
+        name: [profile.spacing_mm, profile.plunge_depth_mm, profile.yarn_feed_mm]
+        for name, profile in STITCH_PROFILES.items()
+    }
+    assert float(macro["variable_safe_z"]) == 4.0
+    assert "printer.gcode_move.absolute_extrude" in macro["gcode"]
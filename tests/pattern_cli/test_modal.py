@@ -0,0 +1,65 @@
+"""Tests for modal G-code compaction and relative extrusion."""
+
+from __future__ import annotations
+
+from functools import partial
+
+import pytest
+
+from tests.gcode_replay import gcode_lines, replay_motion
+from wove.pattern_cli.modal import ModalCompactor
+
+PATTERN = "CHAIN 3\nTURN\nSINGLE 2\nPAUSE 0.4\nMOVE 18 5\nDOUBLE 2"
+_gcode = partial(gcode_lines, pattern=PATTERN)
+
+
+def test_compact_gcode_drops_repeated_words(capsys):
+    full = _gcode(capsys)
+    compact = _gcode(capsys, "--compact-gcode")
+
+    assert replay_motion(compact) == replay_motion(full)
+    assert sum(map(len, compact)) < sum(map(len, full))
+    assert "G0 X5.00 Y0.00 F1200" in full
+    assert "G0 X5.00 F1200" in compact
+    assert "G0 X0.00 Y6.00" in compact
+
+
+def test_relative_extrusion_writes_per_move_distances(capsys):
+    full = _gcode(capsys)
+    relative = _gcode(capsys, "--compact-gcode", "--relative-extrusion")
+
+    assert relative[relative.index("G90") + 1] == "M83"
+    assert replay_motion(relative) == replay_motion(full)
+    feeds = [line for line in relative if line.startswith("G1 E")]
+    assert feeds[0] == "G1 E0.50 F300"
+    assert all(len(line) <= len("G1 E0.90 F300") for line in feeds)
+
+    # On its own, relative extrusion rewrites E and leaves every other word.
+    alone = _gcode(capsys, "--relative-extrusion")
+    alone.remove("M83")
+    assert replay_motion(["M83", *alone]) == replay_motion(full)
+    assert [line for line in alone if " E" not in line] == [
+        line for line in full if " E" not in line
+    ]
+
+
+def test_compactor_drops_moves_that_do_nothing():
+    compactor = ModalCompactor()
+    assert compactor.compact("G92 X0.00 Y0.00 Z4.00 E0") == "G92 X0.00 Y0.00 Z4.00 E0"
+
+    assert compactor.compact("G1 Z4.00 F600") is None
+    # The dropped move never sent its feed rate, so the next one still does.
+    assert compactor.compact("G1 Z-1.50 F600") == "G1 Z-1.50 F600"
+    assert compactor.compact("G1 Z4.00 F600") == "G1 Z4.00"
+    assert compactor.compact("G4 P400") == "G4 P400"
+    assert compactor.compact("G0 X5.00 Y0.00 F600") == "G0 X5.00"
+
+
+@pytest.mark.parametrize("command", ["M400", "G28", "STITCH_CHAIN"])
+def test_unknown_commands_reset_modal_state(command):
+    compactor = ModalCompactor()
+    compactor.compact("G92 X0.00 Y0.00 Z4.00 E0")
+    compactor.compact("G0 X5.00 Y0.00 F1200")
+
+    assert compactor.compact(command) == command
+    assert compactor.compact("G0 X5.00 Y0.00 F1200") == "G0 X5.00 Y0.00 F1200"
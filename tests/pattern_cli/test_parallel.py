@@ -0,0 +1,147 @@
+"""Tests for segmented translation across worker processes."""
+
+from __future__ import annotations
+
+import pytest
+
+from wove.machine_profile import AxisProfile, MachineProfile
+from wove.pattern_cli import PatternTranslator, main
+from wove.pattern_cli.parallel import _plan_segments, translate_parallel
+
+LONG_PATTERN = "\n".join(
+    [
+        "DEFINE petal",
+        "  CHAIN 2",
+        "  TURN 1.5",
+        "  SINGLE 1",
+        "END",
+    ]
+    + [
+        line
+        for row in range(12)
+        for line in (
+            f"MOVE {5 + row} {3 + row * 0.7:.1f}",
+            "CHAIN 3",
+            "REPEAT 2",
+            "  DOUBLE 1",
+            "  PAUSE 0.1",
+            "END",
+            "TURN 0.3",
+            "SLIP 2",
+            f"PLACE petal {20 + row} {40 + row}",
+            "single 1",
+        )
+    ]
+)
+
+
+def _serial(source, machine_profile=None):
+    translator = PatternTranslator(machine_profile=machine_profile)
+    return translator.translate(source), list(translator.planner_events)
+
+
+def test_plan_segments_splits_before_top_level_moves_and_turns():
+    segments = _plan_segments(LONG_PATTERN.splitlines(), 8)
+
+    assert len(segments) > 2
+    assert segments[0].state is None
+    assert sum(len(segment.lines) for segment in segments) == len(
+        LONG_PATTERN.splitlines()
+    )
+    for segment in segments[1:]:
+        assert segment.lines[0].split()[0] in {"MOVE", "TURN"}
+
+
+def test_translate_parallel_matches_serial():
+    lines, events = translate_parallel(LONG_PATTERN, workers=2)
+
+    expected_lines, expected_events = _serial(LONG_PATTERN)
+    assert lines == expected_lines
+    assert list(events) == expected_events
+    serial = PatternTranslator()
+    serial.translate(LONG_PATTERN)
+    for name in (
+        "line_numbers",
+        "row_numbers",
+        "stitch_ordinals",
+        "durations_s",
+        "kinds",
+    ):
+        assert getattr(events, name) == getattr(serial.planner_events, name), name
+
+
+def test_translator_translate_parallel_updates_planner_events():
+    translator = PatternTranslator()
+
+    lines = translator.translate_parallel(LONG_PATTERN, workers=2)
+
+    expected_lines, expected_events = _serial(LONG_PATTERN)
+    assert lines == expected_lines
+    assert list(translator.planner_events) == expected_events
+
+
+def test_translate_parallel_falls_back_for_short_patterns():
+    lines, events = translate_parallel("CHAIN 2", workers=4)
+
+    assert (lines, list(events)) == _serial("CHAIN 2")
+
+
+def test_translate_parallel_reports_first_limit_error():
+    profile = MachineProfile(
+        axes={
+            "X": AxisProfile("X", 16, 80.0, 0.0, 120.0),
+            "Y": AxisProfile("Y", 16, 80.0, 0.0, 120.0),
+            "Z": AxisProfile("Z", 16, 400.0, -10.0, 15.0),
+        }
+    )
+    source = LONG_PATTERN.replace("PLACE petal 28 48", "PLACE petal 280 48")
+
+    with pytest.raises(ValueError) as serial_error:
+        _serial(source, profile)
+    with pytest.raises(ValueError) as parallel_error:
+        translate_parallel(source, profile, workers=2)
+
+    assert str(parallel_error.value) == str(serial_error.value)
+
+
+def test_translate_parallel_reports_parse_errors_like_serial():
+    source = LONG_PATTERN + "\nREPEAT 2\nCHAIN 1"
+
+    with pytest.raises(ValueError, match="REPEAT on line .* missing"):
+        translate_parallel(source, workers=2)
+
+
+def test_main_jobs_matches_serial_output(tmp_path):
+    pattern_path = tmp_path / "long.txt"
+    pattern_path.write_text(LONG_PATTERN, encoding="utf-8")
+    serial = tmp_path / "serial.gcode"
+    parallel = tmp_path / "parallel.gcode"
+
+    assert main([str(pattern_path), "--output", str(serial)]) == 0
+    assert main([str(pattern_path), "--jobs", "2", "--output", str(parallel)]) == 0
+
+    assert parallel.read_text() == serial.read_text()
+
+
+def test_main_rejects_jobs_with_stream(capsys):
+    exit_code = main(["--text", "CHAIN 1", "--stream", "--jobs", "2"])
+
+    assert exit_code == 1
+    assert "--jobs cannot be combined with --stream" in capsys.readouterr().err
+
+
+def test_translate_parallel_times_motifs_against_profile_limits():
+    axes = {
+        name: AxisProfile(name, 16, 80.0, -10.0, 220.0, None, 20.0) for name in "XYZE"
+    }
+    profile = MachineProfile(axes=axes)
+    source = "\n".join(
+        ["DEFINE m", "  CHAIN 1", "END"] + ["CHAIN 1", "TURN"] * 8 + ["PLACE m 10 10"]
+    )
+
+    lines, events = translate_parallel(source, profile, workers=2)
+
+    serial = PatternTranslator(machine_profile=profile)
+    assert lines == serial.translate(source)
+    assert events.durations_s == serial.planner_events.durations_s
+    assert list(events) == list(serial.planner_events)
@@ -0,0 +1,148 @@
+"""Tests for the planner seek index."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import jsonschema
+import pytest
+
+from wove.pattern_cli import (
+    PLUNGE_FEED_RATE,
+    SAFE_Z_MM,
+    STITCH_PROFILES,
+    TRAVEL_FEED_RATE,
+    YARN_FEED_RATE,
+    PatternTranslator,
+    PlannerIndex,
+    _planner_payload,
+    main,
+)
+from wove.pattern_cli.events import PlannerEventStore
+from wove.pattern_cli.seek import KeyframeBuilder
+
+SCHEMA_PATH = (
+    Path(__file__).resolve().parents[2] / "docs" / "schema" / "pattern-cli.schema.json"
+)
+PATTERN = "\n".join(
+    [
+        "DEFINE petal",
+        "  CHAIN 2",
+        "  TURN 1.5",
+        "  SINGLE 1",
+        "END",
+        "CHAIN 3",
+        "PAUSE 0.4",
+        "TURN",
+        "SINGLE 2",
+        "PLACE petal 30 40",
+        "MOVE 18 5",
+        "REPEAT 3",
+        "  DOUBLE 1",
+        "  TURN 4",
+        "END",
+        "SLIP 1",
+    ]
+)
+
+
+def _events(source: str = PATTERN) -> PlannerEventStore:
+    translator = PatternTranslator()
+    translator.translate(source)
+    return translator.planner_events
+
+
+def test_stitch_durations_follow_feed_rates():
+    events = _events("CHAIN 1\nPAUSE 0.25")
+    durations = list(events.durations_s)
+    chain = STITCH_PROFILES["CHAIN"]
+
+    assert durations[:3] == [0.0, 0.0, 0.0]
+    plunge, feed, lift, advance, pause = durations[3:]
+    depth = SAFE_Z_MM + chain.plunge_depth_mm
+    assert plunge == pytest.approx(depth * 60 / PLUNGE_FEED_RATE)
+    assert feed == pytest.approx(chain.yarn_feed_mm * 60 / YARN_FEED_RATE)
+    assert lift == plunge
+    assert advance == pytest.approx(chain.spacing_mm * 60 / TRAVEL_FEED_RATE)
+    assert pause == 0.25
+    assert PlannerIndex(events).total_seconds == pytest.approx(sum(durations))
+
+
+def test_rows_and_stitches_follow_turns_placements_and_repeats():
+    events = _events()
+    index = PlannerIndex(events)
+
+    assert max(events.row_numbers) == 5
+    assert max(events.stitch_ordinals) == 3 + 2 + 3 + 3 + 1
+    for row in range(1, 6):
+        first = index.row_range(row)[0]
+        assert events.comment_at(first - 1) != "turn to next row"
+        assert events.comment_at(first) == "turn to next row" or (
+            events.comment_at(first).startswith("chain stitch")
+        )
+    for ordinal in range(1, 13):
+        commands = index.stitch_range(ordinal)
+        assert len(commands) >= 4
+        assert "stitch" in (events.comment_at(commands[0]) or "")
+    assert index.row_range(99) == range(len(events), len(events))
+
+
+def test_time_queries_match_linear_scan():
+    events = _events()
+    index = PlannerIndex(events)
+    finish = []
+    total = 0.0
+    for duration in events.durations_s:
+        total += duration
+        finish.append(total)
+
+    probes = [-1.0, 0.0, 0.2, 1.0, total / 3, total / 2, total - 0.01, total, 1e9]
+    for seconds in probes:
+        expected = next(
+            (i for i, end in enumerate(finish) if end > seconds), len(finish) - 1
+        )
+        assert index.command_at(seconds) == expected
+    for start, end in [(0.0, 1.0), (total / 4, total / 2), (2.0, 2.0)]:
+        expected = [
+            i
+            for i, end_s in enumerate(finish)
+            if end_s > start and (i == 0 or finish[i - 1] < end)
+        ]
+        assert list(index.time_range(start, end)) == (expected if end > start else [])
+
+
+def test_keyframes_from_batches_match_full_index():
+    events = _events()
+    translator = PatternTranslator()
+    builder = KeyframeBuilder(7)
+    for batch in translator.iter_planner_events(PATTERN.splitlines()):
+        builder.add(batch)
+
+    keyframes = PlannerIndex(events).keyframes(7)
+
+    assert builder.keyframes() == keyframes
+    assert keyframes["index"] == list(range(0, len(events), 7))
+    assert keyframes["row"] == list(events.row_numbers[::7])
+    assert keyframes["elapsed_s"][1] == pytest.approx(sum(events.durations_s[:8]))
+
+
+def test_planner_seek_index_validates_and_is_on_by_default(capsys):
+    schema = json.loads(SCHEMA_PATH.read_text(encoding="utf-8"))
+    validator = jsonschema.Draft202012Validator(schema)
+    for version in (1, 2):
+        validator.validate(
+            _planner_payload(_events(), version=version, seek_interval=5)
+        )
+
+    assert main(["--text", PATTERN, "--format", "planner", "--seek-interval", "9"]) == 0
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["seek_index"] == PlannerIndex(_events()).keyframes(9)
+    assert "seek_index" not in _planner_payload(_events())
+
+
+def test_empty_index_rejects_time_queries():
+    with pytest.raises(ValueError):
+        PlannerIndex(PlannerEventStore()).command_at(1.0)
+    with pytest.raises(ValueError):
+        KeyframeBuilder(0)
@@ -0,0 +1,144 @@
+"""Tests for the pattern translation daemon and its client."""
+
+from __future__ import annotations
+
+import io
+import json
+import threading
+
+import pytest
+
+from wove.pattern_cli import main
+from wove.pattern_cli.server import (
+    TranslationCache,
+    TranslationServer,
+    call,
+)
+
+PATTERN = "CHAIN 3\nTURN\nSINGLE 2"
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    server = TranslationServer(tmp_path / "wove.sock", cache_entries=4)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _write_profile(path, *, travel_max_mm):
+    axis = {"microstepping": 16, "steps_per_mm": 80.0}
+    axes = {
+        "X": {**axis, "travel_min_mm": 0.0, "travel_max_mm": travel_max_mm},
+        "Y": {**axis, "travel_min_mm": 0.0, "travel_max_mm": travel_max_mm},
+        "Z": {**axis, "travel_min_mm": -10.0, "travel_max_mm": 20.0},
+    }
+    path.write_text(json.dumps({"axes": axes}), encoding="utf-8")
+
+
+def _local(capsys, argv):
+    exit_code = main(argv)
+    captured = capsys.readouterr()
+    return exit_code, captured.out, captured.err
+
+
+def test_daemon_output_matches_in_process_and_caches(daemon, capsys):
+    socket_flag = ["--daemon", str(daemon.socket_path)]
+    for argv in (
+        ["--text", PATTERN],
+        ["--text", PATTERN, "--format", "planner"],
+        ["--text", PATTERN, "--format", "json", "--compact"],
+    ):
+        expected = _local(capsys, argv)
+        assert _local(capsys, [*argv, *socket_flag]) == expected
+
+    stats = call(daemon.socket_path, "stats")["result"]
+    assert stats == {"entries": 1, "max_entries": 4, "hits": 2, "misses": 1}
+
+
+def test_daemon_resolves_paths_and_reports_errors(
+    daemon, tmp_path, capsys, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "job.txt").write_text(PATTERN, encoding="utf-8")
+    profile = tmp_path / "profile.json"
+    _write_profile(profile, travel_max_mm=8.0)
+    socket_flag = ["--daemon", str(daemon.socket_path)]
+
+    argv = ["job.txt", "-o", "job.gcode", "--machine-profile", "profile.json"]
+    exit_code, _, err = _local(capsys, [*argv, *socket_flag])
+    assert exit_code == 1
+    assert "Axis X position 10.00 mm exceeds travel range" in err
+
+    # A rewritten profile is reparsed rather than served from the cache.
+    _write_profile(profile, travel_max_mm=80.0)
+    assert _local(capsys, [*argv, *socket_flag]) == (0, "", "")
+    written = (tmp_path / "job.gcode").read_text(encoding="utf-8")
+    assert main(["job.txt"]) == 0
+    assert capsys.readouterr().out == written
+
+    exit_code, _, err = _local(capsys, ["--text", "KNIT 1", *socket_flag])
+    assert exit_code == 1
+    assert "Unknown command 'KNIT' on line 1" in err
+    params = {"argv": ["--format", "yaml"], "cwd": str(tmp_path)}
+    result = call(daemon.socket_path, "translate", params)["result"]
+    assert result["exit_code"] == 2
+    assert "invalid choice" in result["stderr"]
+
+
+def test_daemon_reads_client_stdin(daemon, capsys, monkeypatch):
+    expected = _local(capsys, ["--text", PATTERN])
+    monkeypatch.setattr("sys.stdin", io.StringIO(PATTERN))
+
+    assert _local(capsys, ["--daemon", str(daemon.socket_path)]) == expected
+
+
+def test_client_falls_back_without_daemon(tmp_path, capsys, monkeypatch):
+    expected = _local(capsys, ["--text", PATTERN])
+    monkeypatch.setenv("WOVE_PATTERN_SOCKET", str(tmp_path / "missing.sock"))
+
+    assert _local(capsys, ["--text", PATTERN]) == expected
+
+
+def test_daemon_rejects_malformed_requests(daemon):
+    assert call(daemon.socket_path, "knit")["error"]["code"] == -32601
+    response = call(daemon.socket_path, "translate", {"argv": "CHAIN 1", "cwd": "/"})
+    assert response["error"]["code"] == -32602
+    assert call(daemon.socket_path, "stats")["result"]["entries"] == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TranslationCache(max_entries=2)
+    first = cache.translate("CHAIN 1", None, 1)
+    cache.translate("CHAIN 2", None, 1)
+    assert cache.translate("CHAIN 1", None, 1)[0] is first[0]
+    cache.translate("CHAIN 3", None, 1)
+
+    assert cache.key("CHAIN 2", None) not in cache._entries
+    assert cache.translate("CHAIN 1", None, 1)[0] is first[0]
+    assert (cache.hits, cache.misses, len(cache)) == (2, 3, 2)
+    with pytest.raises(ValueError):
+        TranslationCache(max_entries=0)
+
+
+def test_second_server_refuses_a_live_socket(daemon):
+    with pytest.raises(ValueError, match="already listening"):
+        TranslationServer(daemon.socket_path)
+
+
+def test_cache_hits_get_their_own_planner_store():
+    cache = TranslationCache()
+    _, first = cache.translate(PATTERN, None, 1)
+    comment_ids = list(first.comment_ids)
+    first.render_comments()
+
+    _, second = cache.translate(PATTERN, None, 1)
+
+    assert second is not first
+    assert list(second.comment_ids) == comment_ids
+    assert min(second.comment_ids) < -1
+    assert list(second) == list(first)
+    assert list(second.comments()) == list(first.comments())
@@ -0,0 +1,115 @@
+"""Tests for acceleration-aware command durations."""
+
+from __future__ import annotations
+
+import json
+import math
+
+import pytest
+
+from wove.machine_profile import AxisProfile, MachineProfile
+from wove.pattern_cli import PatternTranslator, _planner_payload, main
+from wove.pattern_cli.timing import MotionTimer, trapezoid_seconds
+
+PATTERN = "CHAIN 3\nPAUSE 0.4\nTURN\nSINGLE 2\nMOVE 18 5"
+
+
+def _profile(**limits: tuple[float, float]) -> MachineProfile:
+    axes = {name: AxisProfile(name, 16, 80.0, -10.0, 220.0) for name in "XYZE"}
+    for name, (velocity, acceleration) in limits.items():
+        axes[name] = AxisProfile(name, 16, 80.0, -10.0, 220.0, velocity, acceleration)
+    return MachineProfile(axes=axes)
+
+
+def test_trapezoid_seconds_cruises_or_peaks_early():
+    # 10 mm at 5 mm/s with 10 mm/s^2: 0.5 s each to accelerate and brake.
+    assert trapezoid_seconds(10.0, 5.0, 10.0) == pytest.approx(2.0 + 0.5)
+    # 1 mm never reaches 5 mm/s, so it peaks halfway.
+    assert trapezoid_seconds(1.0, 5.0, 10.0) == pytest.approx(2 * math.sqrt(0.1))
+    assert trapezoid_seconds(10.0, 5.0, math.inf) == 2.0
+    assert trapezoid_seconds(0.0, 5.0, 10.0) == 0.0
+
+
+def test_timer_applies_the_tightest_axis_limit():
+    timer = MotionTimer(_profile(X=(10.0, math.inf), Y=(math.inf, 100.0)))
+
+    assert MotionTimer().move_seconds(1200, x_mm=30.0, y_mm=40.0) == 2.5
+    # X covers 3/5 of the path, so its 10 mm/s caps the path at 50/3 mm/s, and
+    # Y's share of the path lets it accelerate at 125 mm/s^2.
+    velocity = 50.0 / 3.0
+    assert timer.move_seconds(1200, x_mm=30.0, y_mm=40.0) == pytest.approx(
+        50.0 / velocity + velocity / 125.0
+    )
+    # A pure yarn feed is timed along E, which has no limits here.
+    assert timer.move_seconds(300, e_mm=0.5) == pytest.approx(0.1)
+
+
+def test_profile_limits_lengthen_stitch_durations():
+    plain = PatternTranslator(_profile())
+    plain.translate("CHAIN 1")
+    limited = PatternTranslator(_profile(Z=(8.0, 100.0), E=(5.0, 20.0)))
+    limited.translate("CHAIN 1")
+
+    # Plunge and raise travel 5.5 mm along Z, the feed 0.5 mm along E.
+    assert list(plain.planner_events.durations_s)[3:] == pytest.approx(
+        [0.55, 0.1, 0.55, 0.25]
+    )
+    assert list(limited.planner_events.durations_s)[3:] == pytest.approx(
+        [5.5 / 8 + 8 / 100, 2 * math.sqrt(0.5 / 20), 5.5 / 8 + 8 / 100, 0.25]
+    )
+
+
+def test_planner_metadata_reports_the_estimated_duration():
+    translator = PatternTranslator(_profile(X=(100.0, 500.0), Z=(8.0, 100.0)))
+    translator.translate(PATTERN)
+    events = translator.planner_events
+
+    payload = _planner_payload(events, version=1, seek_interval=4)
+    duration = payload["metadata"]["duration_seconds"]
+    assert duration == payload["seek_index"]["total_elapsed_s"]
+    assert duration == pytest.approx(
+        sum(entry["state"]["duration_s"] for entry in payload["commands"])
+    )
+    columns = _planner_payload(events, version=2)
+    assert columns["commands"]["duration_s"] == list(events.durations_s)
+    assert columns["metadata"]["duration_seconds"] == duration
+
+
+def test_streamed_planner_writes_metadata_after_commands(tmp_path, capsys):
+    profile_path = tmp_path / "machine.json"
+    axes = {
+        name: {
+            "microstepping": 16,
+            "steps_per_mm": 80,
+            "travel_min_mm": -10,
+            "travel_max_mm": 220,
+            "max_velocity_mm_s": 50,
+            "max_acceleration_mm_s2": 200,
+        }
+        for name in "XYZE"
+    }
+    profile_path.write_text(json.dumps({"axes": axes}), encoding="utf-8")
+    flags = ["--text", PATTERN, "--format", "planner", "--planner-version", "1"]
+    flags += ["--machine-profile", str(profile_path)]
+
+    assert main(flags) == 0
+    buffered = json.loads(capsys.readouterr().out)
+    assert main([*flags, "--stream"]) == 0
+    streamed = json.loads(capsys.readouterr().out)
+
+    assert streamed == buffered
+    assert list(streamed).index("metadata") > list(streamed).index("commands")
+    assert buffered["machine_profile"]["axes"]["Z"]["max_velocity_mm_s"] == 50.0
+
+
+def test_placed_motifs_are_timed_like_inline_stitches():
+    profile = _profile(**{name: (5.0, 10.0) for name in "XYZE"})
+    inline = PatternTranslator(profile)
+    inline.translate("MOVE 30 40\nCHAIN 2\nSINGLE 1")
+    placed = PatternTranslator(profile)
+    placed.translate("DEFINE petal\n  CHAIN 2\n  SINGLE 1\nEND\nPLACE petal 30 40")
+
+    assert list(placed.planner_events.durations_s) == pytest.approx(
+        list(inline.planner_events.durations_s)
+    )
+    assert placed.planner_events.durations_s[3] > 0.55
@@ -0,0 +1,107 @@
+"""Tests for buffered and compressed CLI output."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import lzma
+
+import pytest
+
+from wove.pattern_cli import main
+from wove.pattern_cli.writers import BufferedTextWriter, open_output
+
+PATTERN = "CHAIN 30\nTURN\nSINGLE 30\nTURN\nDOUBLE 30"
+
+
+class _RecordingHandle(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes: list[str] = []
+        self.flushes = 0
+
+    def write(self, text: str) -> int:
+        self.writes.append(text)
+        return super().write(text)
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+
+def test_buffered_writer_writes_in_chunks():
+    handle = _RecordingHandle()
+    writer = BufferedTextWriter(handle, buffer_size=10)
+
+    writer.writelines(["abcd", "efgh", "ijkl", "mn"])
+    assert handle.writes == ["abcdefghijkl"]
+
+    writer.flush()
+    assert handle.writes == ["abcdefghijkl", "mn"]
+    assert handle.getvalue() == "abcdefghijklmn"
+    assert handle.flushes == 1
+
+
+def test_buffered_writer_without_sync_leaves_handle_unflushed():
+    handle = _RecordingHandle()
+    writer = BufferedTextWriter(handle, buffer_size=100, sync=False)
+
+    writer.write("G21\n")
+    writer.flush()
+
+    assert handle.getvalue() == "G21\n"
+    assert handle.flushes == 0
+
+
+def test_buffered_writer_rejects_empty_buffer():
+    with pytest.raises(ValueError, match="positive"):
+        BufferedTextWriter(io.StringIO(), buffer_size=0)
+
+
+def test_open_output_keeps_pending_text_on_error(tmp_path):
+    path = tmp_path / "partial.gcode"
+    with pytest.raises(RuntimeError):
+        with open_output(path) as handle:
+            handle.write("G21\n")
+            raise RuntimeError("boom")
+
+    assert path.read_text(encoding="utf-8") == "G21\n"
+
+
+@pytest.mark.parametrize(
+    ("suffix", "opener"),
+    [(".gcode.gz", gzip.open), (".gcode.xz", lzma.open)],
+)
+@pytest.mark.parametrize("stream", [False, True])
+def test_main_compresses_by_suffix(tmp_path, suffix, opener, stream):
+    plain = tmp_path / "job.gcode"
+    compressed = tmp_path / f"job{suffix}"
+    pattern_path = tmp_path / "pattern.txt"
+    pattern_path.write_text(PATTERN, encoding="utf-8")
+    extra = ["--stream"] if stream else []
+
+    assert main([str(pattern_path), "--output", str(plain)]) == 0
+    assert main([str(pattern_path), "--output", str(compressed), *extra]) == 0
+
+    with opener(compressed, "rt", encoding="utf-8") as handle:
+        assert handle.read() == plain.read_text(encoding="utf-8")
+    assert compressed.stat().st_size < plain.stat().st_size
+
+
+def test_gzip_output_is_reproducible(tmp_path):
+    first = tmp_path / "first" / "job.gcode.gz"
+    second = tmp_path / "second" / "job.gcode.gz"
+    first.parent.mkdir()
+    second.parent.mkdir()
+
+    assert main(["--text", PATTERN, "--output", str(first)]) == 0
+    assert main(["--text", PATTERN, "--output", str(second)]) == 0
+
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_main_buffer_size_does_not_change_output(tmp_path, capsys):
+    assert main(["--text", PATTERN, "--format", "json"]) == 0
+    expected = capsys.readouterr().out
+
+    assert main(["--text", PATTERN, "--format", "json", "--buffer-size", "7"]) == 0
+    assert capsys.readouterr().out == expected
@@ -0,0 +1,101 @@
+"""Guard the pattern CLI's startup against eager imports."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import wove
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+# Modules a plain ``--text`` translation must not import. (``lzma`` is left
+# out because argparse pulls it in through ``shutil``.)
+DEFERRED_MODULES = (
+    "yaml",
+    "xml.etree.ElementTree",
+    "gzip",
+    "hashlib",
+    "wove.gauge",
+    "wove.tension",
+    "wove.units",
+    "wove.pattern_cli.cache",
+    "wove.pattern_cli.macros",
+    "wove.pattern_cli.modal",
+    "wove.pattern_cli.parallel",
+    "wove.pattern_cli.server",
+)
+
+
+def _imported_modules(*arguments: str) -> set[str]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *arguments],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            modules.add(line.rsplit("|", 1)[1].strip())
+    return modules
+
+
+def test_translating_inline_text_skips_optional_modules():
+    modules = _imported_modules("-m", "wove.pattern_cli", "--text", "CHAIN 1")
+
+    assert "wove.pattern_cli" in modules
+    assert modules.isdisjoint(DEFERRED_MODULES), modules & set(DEFERRED_MODULES)
+
+
+def test_optional_modules_load_when_used(tmp_path):
+    profile = tmp_path / "profile.yaml"
+    axis = (
+        "{steps_per_mm: 80, microstepping: 16, travel_min_mm: -10, travel_max_mm: 50}"
+    )
+    profile.write_text(
+        "axes:\n" + "".join(f"  {name}: {axis}\n" for name in "XYZ"),
+        encoding="utf-8",
+    )
+    svg = tmp_path / "path.svg"
+    svg.write_text('<svg><polyline points="0,0 5,5"/></svg>', encoding="utf-8")
+    arguments = ["--svg", str(svg), "--machine-profile", str(profile)]
+
+    modules = _imported_modules("-m", "wove.pattern_cli", *arguments)
+
+    assert {"yaml", "xml.etree.ElementTree"} <= modules
+
+
+def test_package_exports_resolve_lazily():
+    modules = _imported_modules("-c", "import wove")
+    assert modules.isdisjoint({"wove.gauge", "wove.tension", "wove.units", "yaml"})
+
+    for name in wove.__all__:
+        assert getattr(wove, name) is not None
+    assert set(wove.__all__) <= set(dir(wove))
+    assert sorted(wove.__all__) == sorted(set(wove.__all__))
+    assert wove.cm_to_inches(2.54) == 1.0
+
+
+def test_submodules_resolve_after_plain_import():
+    script = (
+        "import wove; "
+        "print(wove.gauge.__name__, wove.tension.__name__, "
+        "wove.units.__name__, wove.machine_profile.__name__)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.split() == [
+        "wove.gauge",
+        "wove.tension",
+        "wove.units",
+        "wove.machine_profile",
+    ]
+    assert {"gauge", "machine_profile", "tension", "units"} <= set(dir(wove))
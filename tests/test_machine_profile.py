@@ -107,6 +107,32 @@ def test_load_machine_profile_rejects_invalid_range(tmp_path):
         load_machine_profile(profile_path)
 
 
+def test_load_machine_profile_reads_motion_limits(tmp_path):
+    payload = _profile_payload()
+    payload["axes"]["X"].update(max_velocity_mm_s=150, max_acceleration_mm_s2=3000)
+    payload["axes"]["Z"].update(max_velocity=8, max_accel=100)
+    profile_path = tmp_path / "machine.json"
+    profile_path.write_text(json.dumps(payload), encoding="utf-8")
+
+    profile = load_machine_profile(profile_path)
+
+    assert profile.axes["X"].max_velocity_mm_s == 150.0
+    assert profile.axes["X"].max_acceleration_mm_s2 == 3000.0
+    assert profile.axes["Z"].max_velocity_mm_s == 8.0
+    assert profile.axes["Z"].max_acceleration_mm_s2 == 100.0
+    assert profile.axes["Y"].max_velocity_mm_s is None
+
+
+def test_load_machine_profile_rejects_non_positive_limits(tmp_path):
+    payload = _profile_payload()
+    payload["axes"]["Z"]["max_acceleration_mm_s2"] = 0
+    profile_path = tmp_path / "machine.json"
+    profile_path.write_text(json.dumps(payload), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Axis Z max_acceleration_mm_s2"):
+        load_machine_profile(profile_path)
+
+
 def test_load_machine_profile_requires_axes_mapping(tmp_path):
     payload = {"axes": None}
     profile_path = tmp_path / "machine.json"
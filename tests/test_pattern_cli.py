@@ -17,6 +17,7 @@ from wove.pattern_cli import (
     SAFE_Z_MM,
     YARN_FEED_RATE,
     build_parser,
+    EventKind,
     GCodeLine,
     PatternTranslator,
     _load_pattern,
@@ -24,6 +25,7 @@ from wove.pattern_cli import (
     _pattern_from_svg,
     _planner_payload,
     _points_from_svg,
+    _stream_output,
     _strip_namespace,
     _tension_sensor_reading,
     _write_output,
@@ -49,10 +51,10 @@ def planner_validator() -> jsonschema.Draft202012Validator:
     return jsonschema.Draft202012Validator(schema)
 
 
-def _planner_payload_for_pattern(pattern: str) -> dict[str, object]:
+def _planner_payload_for_pattern(pattern: str, version: int = 1) -> dict[str, object]:
     translator = PatternTranslator()
     translator.translate(pattern)
-    return _planner_payload(translator.planner_events)
+    return _planner_payload(translator.planner_events, version=version)
 
 
 def _sample_machine_profile(
@@ -123,7 +125,7 @@ def test_planner_payload_includes_metadata():
     translator = PatternTranslator()
     translator.translate("CHAIN 1")
 
-    payload = _planner_payload(translator.planner_events)
+    payload = _planner_payload(translator.planner_events, version=1)
 
     assert payload["version"] == 1
     assert payload["defaults"]["safe_z_mm"] == pytest.approx(SAFE_Z_MM)
@@ -174,6 +176,18 @@ def test_planner_schema_validates_svg_fixture(
     planner_validator.validate(payload)
 
 
+def test_planner_schema_validates_columnar_payload(
+    planner_validator: jsonschema.Draft202012Validator,
+) -> None:
+    pattern_text = (FIXTURES_DIR / "handwritten.txt").read_text(encoding="utf-8")
+    payload = _planner_payload_for_pattern(pattern_text, version=2)
+
+    planner_validator.validate(payload)
+    payload["commands"]["index"] = [0]
+    with pytest.raises(jsonschema.ValidationError):
+        planner_validator.validate(payload)
+
+
 def test_planner_schema_accepts_machine_profile_block(
     planner_validator: jsonschema.Draft202012Validator,
 ) -> None:
@@ -189,9 +203,205 @@ def test_planner_schema_accepts_machine_profile_block(
     planner_validator.validate(payload)
 
 
-def test_tension_sensor_reading_defaults_to_baseline_for_missing_comment() -> None:
-    assert _tension_sensor_reading(None) == pytest.approx(140.0)
-    assert _tension_sensor_reading("unexpected step") == pytest.approx(140.0)
+def test_tension_sensor_reading_follows_event_kind() -> None:
+    assert _tension_sensor_reading(EventKind.SETUP) == pytest.approx(140.0)
+    assert _tension_sensor_reading(EventKind.FEED) == pytest.approx(188.0)
+    assert _tension_sensor_reading(EventKind.PAUSE) == pytest.approx(142.0)
+    assert {_tension_sensor_reading(kind) for kind in EventKind} <= {
+        140.0,
+        142.0,
+        150.0,
+        155.0,
+        162.0,
+        188.0,
+    }
+
+
+def test_iter_translate_matches_translate():
+    pattern = (FIXTURES_DIR / "handwritten.txt").read_text(encoding="utf-8")
+    expected = PatternTranslator().translate(pattern)
+
+    streamed = list(PatternTranslator().iter_translate(pattern.splitlines()))
+
+    assert streamed == expected
+
+
+def test_iter_translate_yields_before_consuming_all_lines():
+    consumed: list[str] = []
+
+    def source():
+        for line in ("CHAIN 1", "CHAIN 1"):
+            consumed.append(line)
+            yield line
+
+    translator = PatternTranslator()
+    stream = translator.iter_translate(source())
+    header = [next(stream) for _ in range(3)]
+    assert header[0].command == "G21"
+    assert consumed == []
+    assert next(stream).comment == "chain stitch 1 of 1: plunge"
+    assert consumed == ["CHAIN 1"]
+    assert len(translator.planner_events) == 0
+
+
+def test_stream_output_json_matches_buffered(tmp_path):
+    lines = translate_pattern("CHAIN 1\nPAUSE 0.5")
+    buffered = tmp_path / "buffered.json"
+    streamed = tmp_path / "streamed.json"
+
+    _write_output(lines, buffered, "json")
+    _stream_output(iter(lines), streamed, "json")
+
+    assert streamed.read_text(encoding="utf-8") == buffered.read_text(encoding="utf-8")
+
+
+def test_stream_output_rejects_planner(tmp_path):
+    with pytest.raises(ValueError):
+        _stream_output([], tmp_path / "out.json", "planner")
+
+
+def test_repeat_block_matches_flattened_pattern():
+    looped = "\n".join(
+        [
+            "REPEAT 2",
+            "  CHAIN 2",
+            "  REPEAT 3",
+            "    SINGLE 1",
+            "  END",
+            "  TURN",
+            "END",
+            "SLIP 1",
+        ]
+    )
+    row = ["CHAIN 2", "SINGLE 1", "SINGLE 1", "SINGLE 1", "TURN"]
+    flattened = "\n".join(row * 2 + ["SLIP 1"])
+
+    translator = PatternTranslator()
+    assert translator.translate(looped) == translate_pattern(flattened)
+    streamed = list(PatternTranslator().iter_translate(looped.splitlines()))
+    assert streamed == translate_pattern(flattened)
+
+
+def test_repeat_block_reports_original_line_numbers():
+    translator = PatternTranslator()
+    with pytest.raises(ValueError, match="line 3"):
+        translator.translate("REPEAT 2\n  CHAIN 1\n  MOVE 1\nEND")
+
+    profile = _sample_machine_profile(y_max=20.0)
+    limited = PatternTranslator(machine_profile=profile)
+    with pytest.raises(ValueError) as excinfo:
+        limited.translate("REPEAT 10\n  CHAIN 1\n  TURN 6\nEND")
+    assert "Axis Y position 24.00 mm" in str(excinfo.value)
+    assert "(line 3)" in str(excinfo.value)
+
+
+@pytest.mark.parametrize(
+    ("pattern", "message"),
+    [
+        ("REPEAT 2\nCHAIN 1", "REPEAT on line 1 is missing a matching END"),
+        ("CHAIN 1\nEND", "END on line 2 has no matching block"),
+        ("REPEAT 2\nCHAIN 1\nEND 3", "END on line 3 does not accept values"),
+        ("REPEAT 0\nCHAIN 1\nEND", "REPEAT on line 1 requires a positive count"),
+    ],
+)
+def test_repeat_block_errors(pattern, message):
+    translator = PatternTranslator()
+    with pytest.raises(ValueError, match=message):
+        translator.translate(pattern)
+
+
+MOTIF_PATTERN = "\n".join(
+    [
+        "DEFINE square",
+        "  CHAIN 2",
+        "  TURN 4",
+        "  SINGLE 1",
+        "END",
+        "PLACE square 10 20",
+        "PLACE square 40 20",
+    ]
+)
+
+
+def test_place_reuses_motif_with_offsets():
+    lines = translate_pattern(MOTIF_PATTERN)
+    text = _as_text(lines)
+
+    assert "G0 X10.00 Y20.00 F1200 ; place motif square" in text
+    assert "G0 X40.00 Y20.00 F1200 ; place motif square" in text
+    assert "G0 X20.00 Y20.00 F1200 ; chain stitch 2 of 2: advance" in text
+    assert "G0 X40.00 Y24.00 F1200 ; turn to next row" in text
+    assert "G1 E1.60 F300 ; single stitch 1 of 1: feed yarn" in text
+    assert "G1 E3.20 F300 ; single stitch 1 of 1: feed yarn" in text
+    assert text[-1] == "G0 X44.50 Y24.00 F1200 ; single stitch 1 of 1: advance"
+
+
+def test_place_matches_inline_translation():
+    inline = "\n".join(["MOVE 10 20", "CHAIN 2", "MOVE 10 24", "SINGLE 1"])
+    placed = "\n".join(
+        [
+            "DEFINE shape",
+            "CHAIN 2",
+            "TURN 4",
+            "SINGLE 1",
+            "END",
+            "PLACE shape 10 20",
+        ]
+    )
+    inline_text = _as_text(translate_pattern(inline))
+    placed_text = _as_text(translate_pattern(placed))
+
+    assert len(placed_text) == len(inline_text)
+    assert [line.split(" ;")[0] for line in placed_text] == [
+        line.split(" ;")[0] for line in inline_text
+    ]
+
+
+def test_motif_is_translated_once(monkeypatch):
+    calls: list[str] = []
+    original = PatternTranslator._record_motif
+
+    def recording(self, name, body, line_number):
+        calls.append(name)
+        return original(self, name, body, line_number)
+
+    monkeypatch.setattr(PatternTranslator, "_record_motif", recording)
+    pattern = "\n".join(
+        ["DEFINE dot", "SLIP 1", "END"] + [f"PLACE dot {x} 5" for x in range(1, 30)]
+    )
+    translate_pattern(pattern)
+
+    assert calls == ["dot"]
+
+
+def test_place_checks_limits_against_motif_bounds():
+    profile = _sample_machine_profile(x_max=50.0)
+    translator = PatternTranslator(machine_profile=profile)
+    translator.translate(MOTIF_PATTERN.replace("40 20", "35 20"))
+
+    with pytest.raises(ValueError) as excinfo:
+        translator.translate(MOTIF_PATTERN.replace("40 20", "45 20"))
+    assert "Axis X position 55.00 mm" in str(excinfo.value)
+    assert "(line 7)" in str(excinfo.value)
+
+
+@pytest.mark.parametrize(
+    ("pattern", "message"),
+    [
+        ("PLACE missing 1 1", "Unknown motif 'missing' on line 1"),
+        ("DEFINE a\nEND", "DEFINE on line 1 requires at least one command"),
+        ("DEFINE a\nCHAIN 1", "DEFINE on line 1 is missing a matching END"),
+        ("DEFINE\nEND", "DEFINE on line 1 requires a motif name"),
+        ("REPEAT 2\nDEFINE a\nEND\nEND", "must appear outside other blocks"),
+        ("DEFINE a\nSLIP 1\nEND\nDEFINE a", "Motif 'a' on line 4 is already"),
+        ("DEFINE a\nSLIP 1\nEND\nPLACE a 1", "requires a motif name, X and Y"),
+        ("DEFINE a\nSLIP 1\nEND\nPLACE a 0 1", "requires positive coordinates"),
+    ],
+)
+def test_motif_errors(pattern, message):
+    translator = PatternTranslator()
+    with pytest.raises(ValueError, match=message):
+        translator.translate(pattern)
 
 
 def test_translate_pattern_slip_stitches():
@@ -219,6 +429,28 @@ def test_translate_pattern_respects_axis_limits():
     assert "Axis X position" in str(excinfo.value)
 
 
+def test_stitch_run_limit_error_names_first_offending_move():
+    profile = _sample_machine_profile(x_max=12.0)
+    translator = PatternTranslator(machine_profile=profile)
+    with pytest.raises(ValueError) as excinfo:
+        translator.translate("SLIP 1\nCHAIN 400")
+    message = str(excinfo.value)
+    assert "Axis X position 13.50 mm" in message
+    assert "(line 2)" in message
+
+
+def test_long_stitch_run_matches_per_stitch_accumulation():
+    lines = translate_pattern("SINGLE 250")
+    x_mm = 0.0
+    extrusion_mm = 0.0
+    for _ in range(250):
+        x_mm += 4.5
+        extrusion_mm += 0.6
+    assert lines[-3].command == f"G1 E{extrusion_mm:.2f} F{YARN_FEED_RATE}"
+    assert lines[-1].command == f"G0 X{x_mm:.2f} Y0.00 F1200"
+    assert lines[-1].comment == "single stitch 250 of 250: advance"
+
+
 def test_translate_pattern_respects_z_limits():
     profile = _sample_machine_profile(z_min=-1.0)
     translator = PatternTranslator(machine_profile=profile)
@@ -297,7 +529,7 @@ def test_turn_without_argument_uses_default_height():
 def test_ensure_safe_height_emits_command():
     translator = PatternTranslator()
     translator._reset_state()
-    translator._z_mm = -1.0
+    translator._z_um = -1000
     translator._ensure_safe_height()
     assert translator._lines[-1].command.startswith("G1 Z4.00 F600")
 
@@ -326,6 +558,7 @@ def test_write_output_planner(tmp_path):
         planner_path,
         "planner",
         planner_events=translator.planner_events,
+        planner_version=1,
     )
 
     payload = json.loads(planner_path.read_text(encoding="utf-8"))
@@ -482,7 +715,8 @@ def test_main_stdout_planner(capsys):
     exit_code = main(["--text", "CHAIN 1", "--format", "planner"])
     assert exit_code == 0
     payload = json.loads(capsys.readouterr().out)
-    assert payload["commands"][0]["command"] == "G21"
+    assert payload["version"] == 2
+    assert payload["strings"][payload["commands"]["command_ids"][0]] == "G21"
     assert payload["defaults"]["safe_z_mm"] == pytest.approx(SAFE_Z_MM)
     assert payload["defaults"]["require_home"] is False
     assert payload["defaults"]["home_state"] == "unknown"
@@ -521,6 +755,48 @@ def test_main_writes_output_file(tmp_path):
     assert output_path.read_text(encoding="utf-8").startswith("G21")
 
 
+def test_main_stream_matches_buffered_output(tmp_path):
+    pattern_path = FIXTURES_DIR / "handwritten.txt"
+    streamed = tmp_path / "streamed.gcode"
+
+    exit_code = main([str(pattern_path), "--stream", "--output", str(streamed)])
+
+    assert exit_code == 0
+    expected = (FIXTURES_DIR / "handwritten.gcode").read_text(encoding="utf-8")
+    assert streamed.read_text(encoding="utf-8") == expected
+
+
+def test_main_stream_reports_errors(capsys):
+    exit_code = main(["--text", "CHAIN 1\nCHAIN 0", "--stream"])
+    assert exit_code == 1
+    captured = capsys.readouterr()
+    assert captured.out.startswith("G21 ; use millimeters")
+    assert "requires a positive count" in captured.err
+
+
+def test_main_stream_planner_moves_bounds_after_commands(capsys):
+    flags = ["--format", "planner", "--planner-version", "1"]
+    assert main(["--text", "CHAIN 2\nTURN", *flags]) == 0
+    buffered = json.loads(capsys.readouterr().out)
+
+    exit_code = main(["--text", "CHAIN 2\nTURN", "--stream", "--format", "planner"])
+
+    assert exit_code == 0
+    streamed = json.loads(capsys.readouterr().out)
+    assert streamed == buffered
+    keys = list(streamed)
+    assert keys.index("bounds") > keys.index("commands")
+
+
+def test_main_stream_rejects_planner_version_2(capsys):
+    exit_code = main(
+        ["--text", "CHAIN 1", "--stream", "--format", "planner"]
+        + ["--planner-version", "2"]
+    )
+    assert exit_code == 1
+    assert "does not support planner version 2" in capsys.readouterr().err
+
+
 def test_main_requires_homed_guard(capsys):
     exit_code = main(["--text", "CHAIN 1", "--require-home"])
     assert exit_code == 1
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import textwrap
+from pathlib import Path
+
+from wove.pattern_cli import PatternTranslator, _planner_payload, _write_output
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_node(script: str) -> dict:
+    result = subprocess.run(
+        ["node", "--input-type=module", "-e", script],
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_ROOT,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test_viewer_reads_planner_binary_columns(tmp_path) -> None:
+    translator = PatternTranslator()
+    lines = translator.translate("CHAIN 2\nTURN\nSINGLE 1")
+    events = translator.planner_events
+    path = tmp_path / "job.planner.bin"
+    _write_output(lines, path, "planner-bin", planner_events=events)
+    script = textwrap.dedent(f"""
+        import {{ readFileSync }} from 'node:fs';
+        import {{
+          eventsFromPlannerBinary,
+          isPlannerBinary,
+          parsePlannerBinary,
+        }} from './viewer/src/planner-binary.js';
+
+        const bytes = readFileSync({json.dumps(str(path))});
+        const buffer = bytes.buffer.slice(
+          bytes.byteOffset,
+          bytes.byteOffset + bytes.byteLength,
+        );
+        const parsed = parsePlannerBinary(buffer);
+        console.log(JSON.stringify({{
+          binary: isPlannerBinary(buffer),
+          json: isPlannerBinary(new TextEncoder().encode('{{}}').buffer),
+          bounds: parsed.header.bounds,
+          events: eventsFromPlannerBinary(parsed),
+        }}));
+        """)
+
+    result = run_node(script)
+
+    payload = _planner_payload(events, version=1)
+    assert result["binary"] is True
+    assert result["json"] is False
+    assert result["bounds"] == payload["bounds"]
+    assert _expected_events(payload) == result["events"]
+
+
+def test_viewer_reads_planner_v2_columns() -> None:
+    translator = PatternTranslator()
+    translator.translate("CHAIN 2\nTURN\nSINGLE 1")
+    events = translator.planner_events
+    columnar = _planner_payload(events, version=2)
+    script = textwrap.dedent(f"""
+        import {{ eventsFromPlannerColumns }} from './viewer/src/planner-binary.js';
+
+        const payload = {json.dumps(columnar)};
+        const events = eventsFromPlannerColumns(
+          payload.commands.count,
+          payload.commands,
+          payload.strings,
+          payload.kind_names,
+        );
+        console.log(JSON.stringify(events));
+        """)
+
+    result = run_node(script)
+
+    assert _expected_events(_planner_payload(events, version=1)) == result
+
+
+def _expected_events(payload: dict) -> list:
+    return [
+        {
+            "comment": entry.get("comment"),
+            "kind": entry["kind"],
+            "x": entry["state"]["x_mm"],
+            "y": entry["state"]["y_mm"],
+            "z": entry["state"]["z_mm"],
+            "extrusion": entry["state"]["extrusion_mm"],
+            "tensionGrams": None,
+            "tensionSensorReading": entry["state"]["tension_sensor_reading"],
+        }
+        for entry in payload["commands"]
+    ]
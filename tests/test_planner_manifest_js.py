@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import textwrap
+from pathlib import Path
+
+from wove.pattern_cli import main
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_node(script: str) -> dict:
+    result = subprocess.run(
+        ["node", "--input-type=module", "-e", script],
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_ROOT,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test_viewer_prefetches_next_manifest_chunk(tmp_path) -> None:
+    manifest_path = tmp_path / "job.planner.json"
+    flags = ["--format", "planner", "--chunk-commands", "10"]
+    assert (
+        main(["--text", "CHAIN 3\nTURN\nSINGLE 2", *flags, "-o", str(manifest_path)])
+        == 0
+    )
+    script = textwrap.dedent(f"""
+        import {{ readFileSync }} from 'node:fs';
+        import {{ fileURLToPath, pathToFileURL }} from 'node:url';
+        import {{
+          isPlannerManifest,
+          iterPlannerManifestChunks,
+        }} from './viewer/src/planner-manifest.js';
+
+        const manifestUrl = pathToFileURL({json.dumps(str(manifest_path))}).toString();
+        const log = [];
+        const fakeFetch = async (url) => {{
+          log.push(`fetch ${{url.split('/').pop()}}`);
+          return {{
+            ok: true,
+            json: async () => JSON.parse(readFileSync(fileURLToPath(url), 'utf8')),
+          }};
+        }};
+        const manifest = JSON.parse(readFileSync(fileURLToPath(manifestUrl), 'utf8'));
+        for await (const {{ chunk, payload }} of iterPlannerManifestChunks(
+          manifest,
+          manifestUrl,
+          fakeFetch,
+        )) {{
+          log.push(`yield ${{chunk.path}} ${{payload.commands.count}}`);
+        }}
+        console.log(JSON.stringify({{
+          manifest: isPlannerManifest(manifest),
+          planner: isPlannerManifest({{ commands: [] }}),
+          log,
+        }}));
+        """)
+
+    result = run_node(script)
+
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    paths = [chunk["path"] for chunk in manifest["chunks"]]
+    assert result["manifest"] is True
+    assert result["planner"] is False
+    assert len(paths) > 2
+    expected = [f"fetch {paths[0]}"]
+    for index, chunk in enumerate(manifest["chunks"]):
+        if index + 1 < len(paths):
+            expected.append(f"fetch {paths[index + 1]}")
+        expected.append(f"yield {chunk['path']} {chunk['count']}")
+    assert result["log"] == expected
@@ -5,6 +5,8 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+import pytest
+
 from .viewer_source import load_viewer_bundle
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -27,12 +29,14 @@ def test_viewer_planner_preview_matches_fixture() -> None:
 
 
 def test_viewer_planner_preview_includes_duration_metadata() -> None:
-    """The base chain row preview should publish loop duration metadata."""
+    """The base chain row preview should publish the estimated job duration."""
 
     payload = json.loads(VIEWER_PREVIEW.read_text(encoding="utf-8"))
 
     metadata = payload.get("metadata") or {}
-    assert metadata.get("duration_seconds") == 14.0
+    durations = [entry["state"]["duration_s"] for entry in payload["commands"]]
+    assert metadata.get("duration_seconds") == pytest.approx(sum(durations))
+    assert metadata["duration_seconds"] > 0
     assert metadata.get("source") == "pattern_cli preview"
 
 
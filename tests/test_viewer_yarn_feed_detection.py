@@ -106,6 +106,19 @@ def test_mixed_extrusion_and_comments() -> None:
     assert compute_yarn_feed_indices(events, baseline=0.0) == [1, 3]
 
 
+def test_event_kinds_replace_comment_matching() -> None:
+    """Typed events are classified by kind regardless of comment wording."""
+
+    events = [
+        {"kind": "setup", "comment": "feed rate setup"},
+        {"kind": "feed", "comment": "pull yarn"},
+        {"kind": "advance", "comment": None},
+        {"comment": "legacy feed yarn"},
+    ]
+
+    assert compute_yarn_feed_indices(events) == [1, 3]
+
+
 def test_empty_or_null_inputs_return_empty_indices() -> None:
     """Empty planner events or unparseable entries should not throw."""
 
@@ -14,9 +14,17 @@ export function computeYarnFeedIndices(events, baselineExtrusion = null) {
       return;
     }
 
-    const comment = typeof event.comment === 'string' ? event.comment : '';
-    if (comment && feedCommentPattern.test(comment)) {
-      feedIndices.add(index);
+    if (typeof event.kind === 'string') {
+      // Typed planner exports tag every command; only legacy files need the
+      // comment text.
+      if (event.kind === 'feed') {
+        feedIndices.add(index);
+      }
+    } else {
+      const comment = typeof event.comment === 'string' ? event.comment : '';
+      if (comment && feedCommentPattern.test(comment)) {
+        feedIndices.add(index);
+      }
     }
 
     const extrusionValue = Number(event.extrusion);
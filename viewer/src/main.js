@@ -42,6 +42,13 @@ import {
   yarnFlowUpcomingFallbackMessage,
 } from './constants.js';
 import { formatFileSize } from './format.js';
+import {
+  eventsFromPlannerBinary,
+  eventsFromPlannerColumns,
+  isPlannerBinary,
+  parsePlannerBinary,
+} from './planner-binary.js';
+import { isPlannerManifest, iterPlannerManifestChunks } from './planner-manifest.js';
 import { setTone } from './ui/tones.js';
 import { updateRoadmapPanel } from './ui/overlay.js';
 
@@ -2698,11 +2705,20 @@ function eventsFromPlannerPayload(payload) {
   if (!payload || typeof payload !== 'object') {
     return [];
   }
+  const columns = payload.commands;
+  if (columns && !Array.isArray(columns) && typeof columns === 'object') {
+    // Planner version 2: parallel columns indexing payload.strings.
+    const strings = Array.isArray(payload.strings) ? payload.strings : [];
+    const kindNames = Array.isArray(payload.kind_names) ? payload.kind_names : [];
+    const count = Number(columns.count) || 0;
+    return eventsFromPlannerColumns(count, columns, strings, kindNames);
+  }
   const commands = Array.isArray(payload.commands) ? payload.commands : [];
   return commands.map((entry) => {
     const state = entry && typeof entry === 'object' ? entry.state || {} : {};
     return {
       comment: typeof entry?.comment === 'string' ? entry.comment : null,
+      kind: typeof entry?.kind === 'string' ? entry.kind : null,
       x: normalizeNumber(state.x_mm),
       y: normalizeNumber(state.y_mm),
       z: normalizeNumber(state.z_mm),
@@ -2717,6 +2733,15 @@ function eventsFromPlannerPayload(payload) {
   });
 }
 
+function plannerFromUpload(buffer) {
+  if (isPlannerBinary(buffer)) {
+    const parsed = parsePlannerBinary(buffer);
+    return { payload: parsed.header, events: eventsFromPlannerBinary(parsed) };
+  }
+  const payload = JSON.parse(new TextDecoder('utf-8').decode(buffer));
+  return { payload, events: eventsFromPlannerPayload(payload) };
+}
+
 function applyPatternPlannerEvents(events, options = {}) {
   if (Object.prototype.hasOwnProperty.call(options, 'defaults')) {
     plannerDefaults =
@@ -2778,10 +2803,9 @@ function applyPatternPlannerEvents(events, options = {}) {
   patternExtrusionTarget = extrusionTarget;
   spoolProgressRatio = 0;
   spoolCycleProgressRatio = 0;
-  yarnFeedStepIndices = computeYarnFeedIndices(
-    patternPlannerEvents,
-    patternExtrusionBaseline,
-  );
+  yarnFeedStepIndices = Array.isArray(options.feedIndices)
+    ? options.feedIndices
+    : computeYarnFeedIndices(patternPlannerEvents, patternExtrusionBaseline);
   updatePatternBoundsOverlay(plannerBounds);
   updateBoundsComparisonPanel(plannerBounds, machineProfileBounds, boundsComparison);
   updateTravelEnvelope(plannerBounds, machineProfileBounds, boundsComparison);
@@ -2917,8 +2941,9 @@ async function loadPlannerPreviewFromSource() {
       throw new Error(`HTTP ${response.status}`);
     }
     const payload = await response.json();
-    const events = eventsFromPlannerPayload(payload);
-    if (!events.length) {
+    const chunked = isPlannerManifest(payload);
+    const events = chunked ? [] : eventsFromPlannerPayload(payload);
+    if (!chunked && !events.length) {
       throw new Error('Planner file contained no commands');
     }
     const defaults = payload?.defaults ?? null;
@@ -2938,14 +2963,30 @@ async function loadPlannerPreviewFromSource() {
     if (!metadata.source) {
       metadata.source = 'Base chain row asset';
     }
-    applyPatternPlannerEvents(events, {
+    const plannerOptions = {
       defaults,
       bounds,
       metadata,
       machineProfileBounds: machineProfile,
       machineProfileMissingAxes,
       machineProfile,
-    });
+      // Chunked previews grow as chunks arrive, so derive feeds from kinds.
+      feedIndices: chunked ? null : payload?.feed_indices,
+    };
+    if (chunked) {
+      // Start animating as soon as the first chunk arrives; later chunks
+      // extend the same preview while the next one downloads.
+      const chunks = iterPlannerManifestChunks(payload, patternPreviewSource);
+      for await (const { payload: chunkPayload } of chunks) {
+        eventsFromPlannerPayload(chunkPayload).forEach((event) => events.push(event));
+        applyPatternPlannerEvents(events, plannerOptions);
+      }
+      if (!events.length) {
+        throw new Error('Planner file contained no commands');
+      }
+    } else {
+      applyPatternPlannerEvents(events, plannerOptions);
+    }
     updateMachineProfilePanel(machineProfile);
     if (dom.statusElement) {
       updateStatus('Pattern Studio preview synced with base chain row.');
@@ -9048,8 +9089,7 @@ function loadPlannerFile(file) {
   const reader = new FileReader();
   reader.onload = () => {
     try {
-      const payload = JSON.parse(reader.result);
-      const events = eventsFromPlannerPayload(payload);
+      const { payload, events } = plannerFromUpload(reader.result);
       if (!events.length) {
         throw new Error('No planner commands found');
       }
@@ -9079,6 +9119,7 @@ function loadPlannerFile(file) {
         machineProfileBounds: machineProfile,
         machineProfileMissingAxes,
         machineProfile,
+        feedIndices: payload?.feed_indices,
       });
       updateMachineProfilePanel(machineProfile);
       updateStatus(`Planner upload loaded: ${file.name}`);
@@ -9099,7 +9140,7 @@ function loadPlannerFile(file) {
     plannerUploadResetTimer = window.setTimeout(resetPlannerUploadField, 750);
   };
 
-  reader.readAsText(file);
+  reader.readAsArrayBuffer(file);
 }
 
 function handlePlannerUpload(event) {
@@ -0,0 +1,85 @@
+const plannerBinaryMagic = 'WOVEPB1\0';
+const plannerBinaryPrefixBytes = 16;
+
+const typedArrayByDtype = {
+  float64: Float64Array,
+  float32: Float32Array,
+  uint32: Uint32Array,
+  int32: Int32Array,
+  uint8: Uint8Array,
+};
+
+export function isPlannerBinary(buffer) {
+  if (!(buffer instanceof ArrayBuffer) || buffer.byteLength < plannerBinaryPrefixBytes) {
+    return false;
+  }
+  const magic = new Uint8Array(buffer, 0, plannerBinaryMagic.length);
+  return Array.from(magic).every(
+    (byte, index) => byte === plannerBinaryMagic.charCodeAt(index),
+  );
+}
+
+export function parsePlannerBinary(buffer) {
+  if (!isPlannerBinary(buffer)) {
+    throw new Error('Not a planner-bin export');
+  }
+  const view = new DataView(buffer);
+  const headerLength = view.getUint32(8, true);
+  const decoder = new TextDecoder('utf-8');
+  const header = JSON.parse(
+    decoder.decode(new Uint8Array(buffer, plannerBinaryPrefixBytes, headerLength)),
+  );
+  const count = Number(header.count) || 0;
+  const layout = new Map(
+    (Array.isArray(header.columns) ? header.columns : []).map((entry) => [entry.name, entry]),
+  );
+
+  // Typed-array views read host byte order; every browser target is little-endian.
+  const columns = {};
+  layout.forEach((entry, name) => {
+    const TypedArray = typedArrayByDtype[entry.dtype];
+    if (TypedArray) {
+      columns[name] = new TypedArray(buffer, entry.offset, count);
+    }
+  });
+
+  const stringCount = Number(header.string_count) || 0;
+  const offsetsEntry = layout.get('string_offsets');
+  const dataEntry = layout.get('string_data');
+  const strings = [];
+  if (offsetsEntry && dataEntry) {
+    const offsets = new Uint32Array(buffer, offsetsEntry.offset, stringCount + 1);
+    const data = new Uint8Array(buffer, dataEntry.offset, offsets[stringCount]);
+    for (let index = 0; index < stringCount; index += 1) {
+      strings.push(decoder.decode(data.subarray(offsets[index], offsets[index + 1])));
+    }
+  }
+
+  return { header, count, columns, strings };
+}
+
+export function eventsFromPlannerColumns(count, columns, strings, kindNames = []) {
+  const events = new Array(count);
+  const commentIds = columns.comment_ids;
+  const kinds = columns.kinds;
+  const tension = columns.tension_sensor_reading;
+  for (let index = 0; index < count; index += 1) {
+    const commentId = commentIds ? commentIds[index] : -1;
+    events[index] = {
+      comment: commentId >= 0 ? strings[commentId] : null,
+      kind: kinds ? kindNames[kinds[index]] ?? null : null,
+      x: columns.x_mm[index],
+      y: columns.y_mm[index],
+      z: columns.z_mm[index],
+      extrusion: columns.extrusion_mm[index],
+      tensionGrams: null,
+      tensionSensorReading: tension ? tension[index] : null,
+    };
+  }
+  return events;
+}
+
+export function eventsFromPlannerBinary(parsed) {
+  const kindNames = Array.isArray(parsed.header.kind_names) ? parsed.header.kind_names : [];
+  return eventsFromPlannerColumns(parsed.count, parsed.columns, parsed.strings, kindNames);
+}
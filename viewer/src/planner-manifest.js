@@ -0,0 +1,35 @@
+export function isPlannerManifest(payload) {
+  return Boolean(
+    payload && typeof payload === 'object' && Array.isArray(payload.chunks),
+  );
+}
+
+export function resolveChunkUrl(manifestUrl, chunkPath) {
+  const base = typeof globalThis.location?.href === 'string'
+    ? new URL(manifestUrl, globalThis.location.href)
+    : new URL(manifestUrl);
+  return new URL(chunkPath, base).toString();
+}
+
+// Yields { chunk, payload } in playback order, fetching chunk k + 1 while the
+// caller is still working on chunk k.
+export async function* iterPlannerManifestChunks(
+  manifest,
+  manifestUrl,
+  fetchImpl = globalThis.fetch,
+) {
+  const chunks = isPlannerManifest(manifest) ? manifest.chunks : [];
+  const load = async (chunk) => {
+    const response = await fetchImpl(resolveChunkUrl(manifestUrl, chunk.path));
+    if (!response.ok) {
+      throw new Error(`HTTP ${response.status} for ${chunk.path}`);
+    }
+    return response.json();
+  };
+  let pending = chunks.length ? load(chunks[0]) : null;
+  for (let index = 0; index < chunks.length; index += 1) {
+    const payload = await pending;
+    pending = index + 1 < chunks.length ? load(chunks[index + 1]) : null;
+    yield { chunk: chunks[index], payload };
+  }
+}
@@ -1,161 +1,123 @@
-# isort: skip_file
-from .gauge import (
-    cm_for_stitches,
-    cm_to_inches,
-    cm_for_rows,
-    cm_to_meters,
-    meters_for_rows,
-    meters_for_stitches,
-    rows_per_yard,
-    stitches_per_yard,
-    rows_per_meter,
-    stitches_per_meter,
-    inches_for_stitches,
-    inches_for_rows,
-    inches_to_cm,
-    inches_to_meters,
-    inches_to_yards,
-    cm_to_yards,
-    yards_to_cm,
-    yards_for_rows,
-    yards_for_stitches,
-    height_difference_for_rows,
-    row_adjustment_for_height,
-    stitch_adjustment_for_width,
-    meters_to_yards,
-    meters_to_cm,
-    meters_to_inches,
-    per_cm_to_per_inch,
-    per_cm_to_per_meter,
-    per_cm_to_per_yard,
-    per_inch_to_per_cm,
-    per_inch_to_per_meter,
-    per_inch_to_per_yard,
-    per_meter_to_per_cm,
-    per_meter_to_per_inch,
-    per_meter_to_per_yard,
-    rows_for_cm,
-    rows_for_inches,
-    rows_for_meters,
-    rows_for_yards,
-    rows_per_cm,
-    rows_per_inch,
-    stitches_for_cm,
-    stitches_for_inches,
-    stitches_for_meters,
-    stitches_for_yards,
-    width_difference_for_stitches,
-    stitches_per_cm,
-    stitches_per_inch,
-    per_yard_to_per_cm,
-    per_yard_to_per_inch,
-    per_yard_to_per_meter,
-    yards_to_inches,
-    yards_to_meters,
-)
-from .machine_profile import AxisProfile, MachineProfile, load_machine_profile
-from .units import UNIT_REGISTRY, UnitRegistry
-from .tension import (
-    DEFAULT_TRIAL_DURATION_SECONDS,
-    TENSION_PROFILES,
-    TensionProfile,
-    ForceMatch,
-    WpiMatch,
-    CalibrationPoint,
-    HallSensorCalibration,
-    estimate_profile_for_force,
-    estimate_tension_for_force,
-    estimate_tension_for_wpi,
-    estimate_tension_for_sensor_reading,
-    estimate_profile_for_wpi,
-    estimate_profile_for_sensor_reading,
-    estimate_sensor_reading_for_tension,
-    find_tension_profile_for_wpi,
-    match_tension_profile_for_wpi,
-    find_tension_profile_for_force,
-    get_tension_profile,
-    list_tension_profiles,
-    match_tension_profile_for_sensor_reading,
-    EstimatedTension,
-)
+"""Gauge, unit, tension, and machine profile helpers for crochet planning.
 
-__all__ = [
-    "cm_for_stitches",
-    "cm_to_inches",
-    "cm_for_rows",
-    "cm_to_meters",
-    "meters_for_rows",
-    "meters_for_stitches",
-    "stitches_per_yard",
-    "rows_per_yard",
-    "stitches_per_meter",
-    "rows_per_meter",
-    "inches_for_stitches",
-    "inches_for_rows",
-    "inches_to_cm",
-    "inches_to_meters",
-    "inches_to_yards",
-    "cm_to_yards",
-    "yards_to_cm",
-    "yards_for_rows",
-    "yards_for_stitches",
-    "height_difference_for_rows",
-    "row_adjustment_for_height",
-    "stitch_adjustment_for_width",
-    "meters_to_yards",
-    "meters_to_cm",
-    "meters_to_inches",
-    "stitches_per_inch",
-    "rows_per_inch",
-    "stitches_per_cm",
-    "rows_per_cm",
-    "per_inch_to_per_cm",
-    "per_inch_to_per_meter",
-    "per_inch_to_per_yard",
-    "per_cm_to_per_inch",
-    "per_cm_to_per_meter",
-    "per_cm_to_per_yard",
-    "per_meter_to_per_cm",
-    "per_meter_to_per_inch",
-    "per_meter_to_per_yard",
-    "per_yard_to_per_cm",
-    "per_yard_to_per_inch",
-    "per_yard_to_per_meter",
-    "stitches_for_inches",
-    "stitches_for_cm",
-    "stitches_for_yards",
-    "stitches_for_meters",
-    "width_difference_for_stitches",
-    "rows_for_inches",
-    "rows_for_cm",
-    "rows_for_yards",
-    "rows_for_meters",
-    "yards_to_inches",
-    "yards_to_meters",
-    "UnitRegistry",
-    "UNIT_REGISTRY",
-    "AxisProfile",
-    "MachineProfile",
-    "load_machine_profile",
-    "DEFAULT_TRIAL_DURATION_SECONDS",
-    "TensionProfile",
-    "ForceMatch",
-    "WpiMatch",
-    "CalibrationPoint",
-    "HallSensorCalibration",
-    "estimate_tension_for_sensor_reading",
-    "EstimatedTension",
-    "TENSION_PROFILES",
-    "estimate_tension_for_force",
-    "estimate_profile_for_force",
-    "estimate_profile_for_sensor_reading",
-    "find_tension_profile_for_force",
-    "estimate_tension_for_wpi",
-    "estimate_profile_for_wpi",
-    "find_tension_profile_for_wpi",
-    "match_tension_profile_for_wpi",
-    "get_tension_profile",
-    "list_tension_profiles",
-    "match_tension_profile_for_sensor_reading",
-    "estimate_sensor_reading_for_tension",
-]
+Names are imported from their submodules on first access (PEP 562), so
+``import wove`` stays cheap for tools such as the pattern CLI that only
+need one submodule.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Dict, List
+
+_SUBMODULE_EXPORTS = {
+    "gauge": (
+        "cm_for_stitches",
+        "cm_to_inches",
+        "cm_for_rows",
+        "cm_to_meters",
+        "meters_for_rows",
+        "meters_for_stitches",
+        "rows_per_yard",
+        "stitches_per_yard",
+        "rows_per_meter",
+        "stitches_per_meter",
+        "inches_for_stitches",
+        "inches_for_rows",
+        "inches_to_cm",
+        "inches_to_meters",
+        "inches_to_yards",
+        "cm_to_yards",
+        "yards_to_cm",
+        "yards_for_rows",
+        "yards_for_stitches",
+        "height_difference_for_rows",
+        "row_adjustment_for_height",
+        "stitch_adjustment_for_width",
+        "meters_to_yards",
+        "meters_to_cm",
+        "meters_to_inches",
+        "per_cm_to_per_inch",
+        "per_cm_to_per_meter",
+        "per_cm_to_per_yard",
+        "per_inch_to_per_cm",
+        "per_inch_to_per_meter",
+        "per_inch_to_per_yard",
+        "per_meter_to_per_cm",
+        "per_meter_to_per_inch",
+        "per_meter_to_per_yard",
+        "rows_for_cm",
+        "rows_for_inches",
+        "rows_for_meters",
+        "rows_for_yards",
+        "rows_per_cm",
+        "rows_per_inch",
+        "stitches_for_cm",
+        "stitches_for_inches",
+        "stitches_for_meters",
+        "stitches_for_yards",
+        "width_difference_for_stitches",
+        "stitches_per_cm",
+        "stitches_per_inch",
+        "per_yard_to_per_cm",
+        "per_yard_to_per_inch",
+        "per_yard_to_per_meter",
+        "yards_to_inches",
+        "yards_to_meters",
+    ),
+    "machine_profile": (
+        "AxisProfile",
+        "MachineProfile",
+        "load_machine_profile",
+    ),
+    "units": (
+        "UNIT_REGISTRY",
+        "UnitRegistry",
+    ),
+    "tension": (
+        "DEFAULT_TRIAL_DURATION_SECONDS",
+        "TENSION_PROFILES",
+        "TensionProfile",
+        "ForceMatch",
+        "WpiMatch",
+        "CalibrationPoint",
+        "HallSensorCalibration",
+        "estimate_profile_for_force",
+        "estimate_tension_for_force",
+        "estimate_tension_for_wpi",
+        "estimate_tension_for_sensor_reading",
+        "estimate_profile_for_wpi",
+        "estimate_profile_for_sensor_reading",
+        "estimate_sensor_reading_for_tension",
+        "find_tension_profile_for_wpi",
+        "match_tension_profile_for_wpi",
+        "find_tension_profile_for_force",
+        "get_tension_profile",
+        "list_tension_profiles",
+        "match_tension_profile_for_sensor_reading",
+        "EstimatedTension",
+    ),
+}
+_EXPORT_MODULES: Dict[str, str] = {
+    name: module for module, names in _SUBMODULE_EXPORTS.items() for name in names
+}
+
+
+def __getattr__(name: str) -> object:
+    if name in _SUBMODULE_EXPORTS:
+        # Importing a submodule also binds it on the package.
+        return import_module(f".{name}", __name__)
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__, *_SUBMODULE_EXPORTS})
+
+
+# Every public name is lazily exported, so the mapping is the export list.
+__all__ = list(_EXPORT_MODULES)
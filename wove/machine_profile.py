@@ -5,20 +5,24 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Mapping
-
-import yaml
+from typing import Any, Dict, Mapping, Tuple
 
 
 @dataclass(frozen=True)
 class AxisProfile:
-    """Describe controller parameters for a single axis."""
+    """Describe controller parameters for a single axis.
+
+    The optional velocity and acceleration limits feed job duration
+    estimates; an axis without them is timed at the commanded feed rate.
+    """
 
     name: str
     microstepping: int
     steps_per_mm: float
     travel_min_mm: float
     travel_max_mm: float
+    max_velocity_mm_s: float | None = None
+    max_acceleration_mm_s2: float | None = None
 
     def ensure_within(
         self, position_mm: float, *, line_number: int | None = None
@@ -27,6 +31,13 @@ class AxisProfile:
 
         if self.travel_min_mm <= position_mm <= self.travel_max_mm:
             return
+        raise ValueError(self.violation_message(position_mm, line_number=line_number))
+
+    def violation_message(
+        self, position_mm: float, *, line_number: int | None = None
+    ) -> str:
+        """Describe ``position_mm`` falling outside the travel range."""
+
         if line_number is None:
             location = "generated command"
         else:
@@ -41,8 +52,7 @@ class AxisProfile:
             f"{self.travel_min_mm:.2f}\u2013{self.travel_max_mm:.2f} mm",
             f"({location})",
         ]
-        message = " ".join(message_parts)
-        raise ValueError(message)
+        return " ".join(message_parts)
 
 
 @dataclass(frozen=True)
@@ -64,6 +74,18 @@ class MachineProfile:
             raise ValueError(message) from error
         profile.ensure_within(position_mm, line_number=line_number)
 
+    def travel_limits(self) -> Dict[str, Tuple[float, float]]:
+        """Return ``(min, max)`` travel in millimetres keyed by axis name.
+
+        Hot loops compare against these plain floats and only fall back to
+        :meth:`ensure_within` to build the error message for a violation.
+        """
+
+        return {
+            name: (axis.travel_min_mm, axis.travel_max_mm)
+            for name, axis in self.axes.items()
+        }
+
 
 def _coerce_float(data: Mapping[str, Any], *keys: str) -> float:
     for key in keys:
@@ -89,6 +111,16 @@ def _coerce_int(data: Mapping[str, Any], key: str) -> int:
         raise ValueError(message) from error
 
 
+def _coerce_limit(name: str, data: Mapping[str, Any], *keys: str) -> float | None:
+    if not any(key in data for key in keys):
+        return None
+    value = _coerce_float(data, *keys)
+    if not value > 0:
+        message = f"Axis {name} {keys[0]} must be positive, got {value}"
+        raise ValueError(message)
+    return value
+
+
 def _axis_from_mapping(name: str, payload: Mapping[str, Any]) -> AxisProfile:
     microstepping = _coerce_int(payload, "microstepping")
     steps_per_mm = _coerce_float(payload, "steps_per_mm")
@@ -107,6 +139,12 @@ def _axis_from_mapping(name: str, payload: Mapping[str, Any]) -> AxisProfile:
         steps_per_mm=steps_per_mm,
         travel_min_mm=travel_min_mm,
         travel_max_mm=travel_max_mm,
+        max_velocity_mm_s=_coerce_limit(
+            name, payload, "max_velocity_mm_s", "max_velocity"
+        ),
+        max_acceleration_mm_s2=_coerce_limit(
+            name, payload, "max_acceleration_mm_s2", "max_accel"
+        ),
     )
 
 
@@ -140,6 +178,8 @@ def load_machine_profile(path: str | Path) -> MachineProfile:
 
     suffix = profile_path.suffix.lower()
     if suffix in {".yaml", ".yml"}:
+        import yaml
+
         payload = yaml.safe_load(raw_text) or {}
     else:
         payload = json.loads(raw_text)
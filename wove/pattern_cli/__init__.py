@@ -2,16 +2,53 @@
 
 from __future__ import annotations
 
+import argparse
 import json
 import math
+import os
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from itertools import accumulate, repeat
 from pathlib import Path
-from typing import Iterable, List, Sequence, Tuple
-from xml.etree import ElementTree as ET
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    TextIO,
+    Tuple,
+)
 
 from ..machine_profile import MachineProfile, load_machine_profile
-from .options import build_parser, parse_args
+from .binary import write_planner_binary
+from .chunks import write_planner_chunks
+from .encoder import (
+    DEFAULT_PLANNER_VERSION,
+    iter_commands_json,
+    iter_planner_columns_json,
+    iter_planner_json,
+    store_bounds,
+    tension_readings,
+)
+from .events import EventKind, PlannerEvent, PlannerEventStore
+from .fixed import UM_PER_MM, format_mm, format_mm_run, to_mm, to_um
+from .options import CACHE_DIR_ENV, DAEMON_SOCKET_ENV, build_parser, parse_args
+from .seek import KeyframeBuilder, PlannerIndex
+from .timing import MotionTimer, total_seconds
+from .writers import (
+    COMPRESSED_SUFFIXES,
+    DEFAULT_BUFFER_SIZE,
+    BufferedTextWriter,
+    open_binary_output,
+    open_output,
+)
+
+if TYPE_CHECKING:
+    from .cache import OutputCache
 
 SAFE_Z_MM = 4.0
 FABRIC_PLANE_Z_MM = 0.0
@@ -21,44 +58,104 @@ YARN_FEED_RATE = 300
 DEFAULT_ROW_HEIGHT = 6.0
 DEFAULT_ROW_SPACING = 6.0
 MIN_MOVE_COORD_MM = 1e-3
-PLANNER_LOOP_SECONDS = 14.0
 PLANNER_METADATA_SOURCE = "pattern_cli preview"
+STREAM_FLUSH_INTERVAL = 256
+STITCH_MACRO = "STITCH"
 TENSION_SENSOR_CALIBRATION = (
     (102.0, 20.0),
     (168.5, 55.0),
     (220.0, 85.0),
 )
+_SAFE_Z_UM = to_um(SAFE_Z_MM)
+_FABRIC_PLANE_Z_UM = to_um(FABRIC_PLANE_Z_MM)
+_TENSION_SENSOR_READINGS = {
+    EventKind.SETUP: 140.0,
+    EventKind.PLUNGE: 162.0,
+    EventKind.FEED: 188.0,
+    EventKind.RAISE: 150.0,
+    EventKind.ADVANCE: 155.0,
+    EventKind.REPOSITION: 155.0,
+    EventKind.TURN: 155.0,
+    EventKind.PAUSE: 142.0,
+}
 
 
 @dataclass(frozen=True)
 class GCodeLine:
-    """A single G-code-like instruction with an optional trailing comment."""
+    """A single G-code-like instruction with an optional trailing comment.
+
+    Stitch runs share four comment templates such as
+    ``"chain stitch %d of 40: plunge"`` and give each line only its stitch
+    number as ``comment_argument``, so output that never looks at comments
+    never formats them. Without an argument, ``comment_template`` is the
+    comment itself. Translated stitch lines also point at their
+    :class:`_StitchRun` so writers can replace the run with a macro call.
+    """
 
     command: str
-    comment: str | None = None
+    comment_template: str | None = None
+    comment_argument: int | None = None
+    stitch_run: _StitchRun | None = field(default=None, compare=False, repr=False)
+
+    @property
+    def comment(self) -> str | None:
+        if self.comment_argument is None:
+            return self.comment_template
+        return self.comment_template % self.comment_argument
 
     def as_text(self) -> str:
-        if self.comment:
-            return f"{self.command} ; {self.comment}"
+        comment = self.comment
+        if comment:
+            return f"{self.command} ; {comment}"
         return self.command
 
     def as_dict(self) -> dict[str, str]:
         data = {"command": self.command}
-        if self.comment:
-            data["comment"] = self.comment
+        comment = self.comment
+        if comment:
+            data["comment"] = comment
         return data
 
 
-@dataclass(frozen=True)
-class PlannerEvent:
-    """State snapshot for planner integrations after emitting a command."""
+def _lines_from_events(
+    events: PlannerEventStore,
+    stitch_runs: Sequence[Tuple[int, _StitchRun]] = (),
+) -> List[GCodeLine]:
+    """Return the lines for ``events``, leaving templated comments unrendered.
+
+    ``stitch_runs`` pairs the index of each run's first event with its run.
+    """
+
+    run_at = dict(stitch_runs)
+    run = None
+    run_end = 0
+    lines: List[GCodeLine] = []
+    rows = zip(events.commands(), events.comment_sources())
+    for index, (command, (comment, argument)) in enumerate(rows):
+        if index in run_at:
+            run = run_at[index]
+            run_end = index + len(_STITCH_KINDS) * run.count
+        elif index == run_end:
+            run = None
+        if argument is None:
+            lines.append(GCodeLine(command, comment))
+        else:
+            lines.append(GCodeLine(command, comment, argument, run))
+    return lines
 
-    command: str
-    comment: str | None
-    x_mm: float
-    y_mm: float
-    z_mm: float
-    extrusion_mm: float
+
+def _collapse_stitch_runs(lines: Iterable[GCodeLine]) -> Iterator[GCodeLine]:
+    """Yield ``lines`` with every stitch run replaced by one macro call."""
+
+    current = None
+    for line in lines:
+        run = line.stitch_run
+        if run is None:
+            current = None
+            yield line
+        elif run is not current:
+            current = run
+            yield run.macro_line()
 
 
 @dataclass(frozen=True)
@@ -71,6 +168,26 @@ class StitchProfile:
     yarn_feed_mm: float
 
 
+@dataclass(frozen=True, eq=False)
+class _StitchRun:
+    """A run of identical stitches emitted by one pattern command."""
+
+    profile: StitchProfile
+    count: int
+
+    def macro_line(self) -> GCodeLine:
+        """Return the :data:`STITCH_MACRO` call that performs the whole run."""
+
+        profile = self.profile
+        command = (
+            f"{STITCH_MACRO} TYPE={profile.name} COUNT={self.count}"
+            f" SPACING={format_mm(to_um(profile.spacing_mm))}"
+            f" DEPTH={format_mm(to_um(profile.plunge_depth_mm))}"
+            f" FEED={format_mm(to_um(profile.yarn_feed_mm))}"
+        )
+        return GCodeLine(command, f"{profile.name.lower()} stitch x{self.count}")
+
+
 STITCH_PROFILES = {
     "SLIP": StitchProfile(
         "SLIP",
@@ -99,88 +216,543 @@ STITCH_PROFILES = {
 }
 
 
+@dataclass(frozen=True)
+class _Instruction:
+    """A parsed DSL command with validated argument values."""
+
+    command: str
+    values: Tuple[Any, ...]
+    line_number: int
+
+
+@dataclass(frozen=True)
+class _RepeatBlock:
+    """A ``REPEAT n ... END`` loop, expanded lazily during emission."""
+
+    count: int
+    body: Tuple["_Instruction | _RepeatBlock", ...]
+    line_number: int
+
+
+_Node = _Instruction | _RepeatBlock
+
+
+_STATIC_SHAPE = 0
+_TRAVEL_SHAPE = 1
+_FEED_SHAPE = 2
+# Kinds of the plunge, feed, raise, and advance commands of every stitch.
+_STITCH_KINDS = (EventKind.PLUNGE, EventKind.FEED, EventKind.RAISE, EventKind.ADVANCE)
+
+
+@dataclass(frozen=True)
+class _Motif:
+    """A ``DEFINE``-d block translated once into motif-local motion.
+
+    Columns hold each command's state, in micrometres, relative to the
+    placement point and extrusion base. ``shapes`` marks which commands must
+    be re-rendered when placed (travel moves carry X/Y, feeds carry E);
+    everything else, including comments, is reused verbatim. ``bounds`` holds the local
+    ``(min_x, max_x, min_y, max_y, min_z, max_z)`` used to check placements.
+    Row numbers and stitch ordinals count from zero within the motif and are
+    offset by the running totals when it is placed.
+    """
+
+    name: str
+    shapes: Tuple[int, ...]
+    commands: Tuple[str, ...]
+    comments: Tuple[str | None, ...]
+    x_um: Tuple[int, ...]
+    y_um: Tuple[int, ...]
+    z_um: Tuple[int, ...]
+    extrusion_um: Tuple[int, ...]
+    row_numbers: Tuple[int, ...]
+    stitch_ordinals: Tuple[int, ...]
+    durations_s: Tuple[float, ...]
+    kinds: Tuple[int, ...]
+    bounds: Tuple[float, float, float, float, float, float]
+
+
+@dataclass(frozen=True)
+class _TranslatorState:
+    """Machine state carried between top-level pattern lines.
+
+    The row and stitch counters do not affect the commands that follow, so
+    they are left out of comparisons; an incremental update can rejoin a
+    previous run with different counts and shift the reused tail instead.
+    Positions and extrusion are whole micrometres.
+    """
+
+    x_um: int
+    y_um: int
+    z_um: int
+    extrusion_um: int
+    motifs: Dict[str, _Motif]
+    row_number: int = field(default=0, compare=False)
+    stitch_count: int = field(default=0, compare=False)
+
+
+def _expand(node: _Instruction | _RepeatBlock) -> Iterator[_Instruction]:
+    """Yield the instructions ``node`` runs, repeating loop bodies in place."""
+
+    if isinstance(node, _Instruction):
+        yield node
+        return
+    for _ in range(node.count):
+        for child in node.body:
+            yield from _expand(child)
+
+
 class PatternTranslator:
     """Translate pattern lines into a list of :class:`GCodeLine` objects."""
 
     def __init__(self, machine_profile: MachineProfile | None = None) -> None:
         self._lines: List[GCodeLine] = []
-        self._x_mm = 0.0
-        self._y_mm = 0.0
-        self._z_mm = SAFE_Z_MM
-        self._extrusion_mm = 0.0
+        self._x_um = 0
+        self._y_um = 0
+        self._z_um = _SAFE_Z_UM
+        self._extrusion_um = 0
         self._machine_profile = machine_profile
-        self._planner_events: List[PlannerEvent] = []
+        self._limits = (
+            None if machine_profile is None else machine_profile.travel_limits()
+        )
+        self._timer = MotionTimer(machine_profile)
+        self._line_number = 0
+        self._row_number = 0
+        self._stitch_count = 0
+        self._planner_events = PlannerEventStore()
+        self._record_events = True
+        self._open_blocks: List[Tuple[str, Any, int, List[_Node]]] = []
+        self._motifs: Dict[str, _Motif] = {}
 
     def translate(self, source: str) -> List[GCodeLine]:
         """Translate a stitch description into motion commands."""
 
         self._reset_state()
         for line_number, raw_line in enumerate(source.splitlines(), start=1):
-            stripped = raw_line.strip()
-            if not stripped or stripped.startswith("#"):
-                continue
-            tokens = stripped.split()
-            command = tokens[0].upper()
-            arguments = tokens[1:]
-            if command in STITCH_PROFILES:
-                count = self._parse_positive_int(
-                    arguments,
-                    line_number,
-                    command,
-                )
-                profile = STITCH_PROFILES[command]
-                self._emit_stitches(profile, count, line_number)
-            elif command == "MOVE":
-                self._handle_move(arguments, line_number)
-            elif command == "PAUSE":
-                self._handle_pause(arguments, line_number)
-            elif command == "TURN":
-                self._handle_turn(arguments, line_number)
-            else:
-                message = f"Unknown command '{command}' on line {line_number}"
-                raise ValueError(message)
+            self._run_line(raw_line, line_number)
+        self._finish_source()
         return list(self._lines)
 
+    def translate_parallel(
+        self, source: str, *, workers: int | None = None
+    ) -> List[GCodeLine]:
+        """Translate ``source`` in segments across ``workers`` processes.
+
+        The output and planner events are identical to :meth:`translate`;
+        see :mod:`wove.pattern_cli.parallel` for how segments are chosen.
+        """
+
+        from .parallel import translate_parallel
+
+        lines, events = translate_parallel(
+            source, self._machine_profile, workers=workers
+        )
+        self._lines = lines
+        self._planner_events = events
+        self._record_events = True
+        self._open_blocks = []
+        return list(lines)
+
+    def iter_translate(self, lines: Iterable[str]) -> Iterator[GCodeLine]:
+        """Yield motion commands as each pattern line is translated.
+
+        ``lines`` may be any iterable of source lines, such as an open file.
+        Commands are handed back after every source line instead of being
+        accumulated, and planner events are not recorded, so memory use stays
+        flat no matter how many commands the pattern expands to.
+        """
+
+        for _ in self._step(lines, record_events=False):
+            yield from self._drain_lines()
+
+    def iter_planner_events(self, lines: Iterable[str]) -> Iterator[PlannerEventStore]:
+        """Yield planner events in batches as each pattern line is translated.
+
+        Each batch is a new :class:`PlannerEventStore` holding only the events
+        produced since the previous one (batches may be empty), so planner
+        output can be streamed the same way :meth:`iter_translate` streams
+        commands.
+        """
+
+        for _ in self._step(lines, record_events=True):
+            self._lines = []
+            events = self._planner_events
+            self._planner_events = PlannerEventStore()
+            yield events
+
     @property
-    def planner_events(self) -> List[PlannerEvent]:
-        """Return planner-oriented command snapshots for the translation."""
+    def planner_events(self) -> PlannerEventStore:
+        """Return planner-oriented command snapshots for the translation.
 
-        return list(self._planner_events)
+        The columnar store is shared rather than copied; the next translation
+        starts a fresh store, so earlier results stay valid.
+        """
+
+        return self._planner_events
 
     # Internal helpers -------------------------------------------------
 
-    def _reset_state(self) -> None:
+    def _step(self, lines: Iterable[str], *, record_events: bool) -> Iterator[None]:
+        """Translate ``lines``, pausing after the preamble and each instruction."""
+
+        self._reset_state(record_events=record_events)
+        yield
+        for line_number, raw_line in enumerate(lines, start=1):
+            node = self._parse_line(raw_line, line_number)
+            if node is None:
+                continue
+            for instruction in _expand(node):
+                self._execute(instruction)
+                yield
+        self._finish_source()
+
+    def _run_line(self, raw_line: str, line_number: int) -> None:
+        node = self._parse_line(raw_line, line_number)
+        if node is None:
+            return
+        for instruction in _expand(node):
+            self._execute(instruction)
+
+    def _snapshot(self) -> _TranslatorState:
+        return _TranslatorState(
+            self._x_um,
+            self._y_um,
+            self._z_um,
+            self._extrusion_um,
+            self._motifs,
+            self._row_number,
+            self._stitch_count,
+        )
+
+    def _restore(self, state: _TranslatorState) -> None:
+        self._open_blocks = []
+        self._x_um = state.x_um
+        self._y_um = state.y_um
+        self._z_um = state.z_um
+        self._extrusion_um = state.extrusion_um
+        self._motifs = state.motifs
+        self._row_number = state.row_number
+        self._stitch_count = state.stitch_count
+
+    def _parse_line(
+        self, raw_line: str, line_number: int
+    ) -> _Instruction | _RepeatBlock | None:
+        """Parse one source line, returning a node once it is ready to run.
+
+        Lines inside an open ``REPEAT`` block are collected into that block
+        and ``None`` is returned until the outermost ``END`` closes it.
+        """
+
+        stripped = raw_line.strip()
+        if not stripped or stripped.startswith("#"):
+            return None
+        tokens = stripped.split()
+        command = tokens[0].upper()
+        arguments = tokens[1:]
+        node: _Instruction | _RepeatBlock
+        if command == "REPEAT":
+            count = self._parse_positive_int(arguments, line_number, command)
+            self._open_blocks.append((command, count, line_number, []))
+            return None
+        if command == "DEFINE":
+            name = self._parse_motif_name(arguments, line_number)
+            self._open_blocks.append((command, name, line_number, []))
+            return None
+        if command == "END":
+            closed = self._close_block(arguments, line_number)
+            if closed is None:
+                return None
+            node = closed
+        else:
+            node = self._parse_instruction(command, arguments, line_number)
+        if self._open_blocks:
+            self._open_blocks[-1][3].append(node)
+            return None
+        return node
+
+    def _parse_motif_name(self, arguments: Sequence[str], line_number: int) -> str:
+        if len(arguments) != 1:
+            message = f"DEFINE on line {line_number} requires a motif name"
+            raise ValueError(message)
+        if self._open_blocks:
+            message = "DEFINE on line {} must appear outside other blocks".format(
+                line_number
+            )
+            raise ValueError(message)
+        name = arguments[0]
+        if name in self._motifs:
+            message = "Motif '{}' on line {} is already defined".format(
+                name,
+                line_number,
+            )
+            raise ValueError(message)
+        return name
+
+    def _parse_instruction(
+        self, command: str, arguments: Sequence[str], line_number: int
+    ) -> _Instruction:
+        values: Tuple[float, ...]
+        if command in STITCH_PROFILES:
+            count = self._parse_positive_int(
+                arguments,
+                line_number,
+                command,
+            )
+            values = (count,)
+        elif command == "MOVE":
+            values = self._parse_move(arguments, line_number)
+        elif command == "PAUSE":
+            values = (self._parse_pause(arguments, line_number),)
+        elif command == "TURN":
+            values = (self._parse_turn(arguments, line_number),)
+        elif command == "PLACE":
+            values = self._parse_place(arguments, line_number)
+        else:
+            message = f"Unknown command '{command}' on line {line_number}"
+            raise ValueError(message)
+        return _Instruction(command, values, line_number)
+
+    def _close_block(
+        self, arguments: Sequence[str], line_number: int
+    ) -> _RepeatBlock | None:
+        if arguments:
+            message = f"END on line {line_number} does not accept values"
+            raise ValueError(message)
+        if not self._open_blocks:
+            message = f"END on line {line_number} has no matching block"
+            raise ValueError(message)
+        keyword, argument, start_line, body = self._open_blocks.pop()
+        if keyword == "DEFINE":
+            motif = self._record_motif(argument, body, start_line)
+            # Copy on write so snapshots can share the mapping safely.
+            self._motifs = {**self._motifs, argument: motif}
+            return None
+        return _RepeatBlock(argument, tuple(body), start_line)
+
+    def _finish_source(self) -> None:
+        if self._open_blocks:
+            keyword, _, start_line, _ = self._open_blocks[-1]
+            message = f"{keyword} on line {start_line} is missing a matching END"
+            raise ValueError(message)
+
+    def _execute(self, instruction: _Instruction) -> None:
+        command = instruction.command
+        values = instruction.values
+        line_number = instruction.line_number
+        self._line_number = line_number
+        if command in STITCH_PROFILES:
+            profile = STITCH_PROFILES[command]
+            self._emit_stitches(profile, int(values[0]), line_number)
+        elif command == "MOVE":
+            self._move(values[0], values[1], line_number)
+        elif command == "PAUSE":
+            self._pause(values[0])
+        elif command == "PLACE":
+            self._place(values[0], values[1], values[2], line_number)
+        else:
+            self._turn(values[0], line_number)
+
+    def _record_motif(
+        self, name: str, body: Sequence[_Node], line_number: int
+    ) -> _Motif:
+        """Translate a motif body once, relative to its placement point."""
+
+        if not body:
+            message = "DEFINE on line {} requires at least one command".format(
+                line_number
+            )
+            raise ValueError(message)
+        # Without a profile the recorder skips limit checks (each placement is
+        # checked where it lands) but still times moves against its limits.
+        recorder = PatternTranslator()
+        recorder._motifs = self._motifs
+        recorder._timer = self._timer
+        for node in body:
+            for instruction in _expand(node):
+                recorder._execute(instruction)
+        events = recorder._planner_events
+        commands = tuple(events.commands())
+        shapes = tuple(
+            (
+                _TRAVEL_SHAPE
+                if command.startswith("G0 ")
+                else _FEED_SHAPE if command.startswith("G1 E") else _STATIC_SHAPE
+            )
+            for command in commands
+        )
+        # The planner store holds millimetres converted from exact micrometres,
+        # so rounding recovers the recorder's values.
+        x_um = tuple(map(to_um, events.x_mm))
+        y_um = tuple(map(to_um, events.y_mm))
+        z_um = tuple(map(to_um, events.z_mm))
+        # The placement travel starts each copy at the local origin.
+        x_values = (0.0, *events.x_mm)
+        y_values = (0.0, *events.y_mm)
+        z_values = (SAFE_Z_MM, *events.z_mm)
+        return _Motif(
+            name=name,
+            shapes=shapes,
+            commands=commands,
+            comments=tuple(events.comments()),
+            x_um=x_um,
+            y_um=y_um,
+            z_um=z_um,
+            extrusion_um=tuple(map(to_um, events.extrusion_mm)),
+            row_numbers=tuple(events.row_numbers),
+            stitch_ordinals=tuple(events.stitch_ordinals),
+            durations_s=tuple(events.durations_s),
+            kinds=tuple(events.kinds),
+            bounds=(
+                min(x_values),
+                max(x_values),
+                min(y_values),
+                max(y_values),
+                min(z_values),
+                max(z_values),
+            ),
+        )
+
+    def _drain_lines(self) -> List[GCodeLine]:
+        pending = self._lines
+        self._lines = []
+        return pending
+
+    def _reset_state(self, *, record_events: bool = True) -> None:
         self._lines = []
-        self._planner_events = []
-        self._x_mm = 0.0
-        self._y_mm = 0.0
-        self._z_mm = SAFE_Z_MM
-        self._extrusion_mm = 0.0
-        self._emit("G21", "use millimeters")
-        self._emit("G90", "absolute positioning")
+        self._planner_events = PlannerEventStore()
+        self._record_events = record_events
+        self._open_blocks = []
+        self._motifs = {}
+        self._line_number = 0
+        self._row_number = 0
+        self._stitch_count = 0
+        self._x_um = 0
+        self._y_um = 0
+        self._z_um = _SAFE_Z_UM
+        self._extrusion_um = 0
+        self._emit(EventKind.SETUP, "G21", "use millimeters")
+        self._emit(EventKind.SETUP, "G90", "absolute positioning")
+        position = f"X{format_mm(self._x_um)} Y{format_mm(self._y_um)}"
         self._emit(
-            f"G92 X{self._x_mm:.2f} Y{self._y_mm:.2f} Z{SAFE_Z_MM:.2f} E0",
+            EventKind.SETUP,
+            f"G92 {position} Z{format_mm(_SAFE_Z_UM)} E0",
             "zero axes",
         )
 
-    def _emit(self, command: str, comment: str | None = None) -> None:
+    def _emit(
+        self,
+        kind: EventKind,
+        command: str,
+        comment: str | None = None,
+        duration_s: float = 0.0,
+    ) -> None:
+        if self._record_events:
+            command, comment = self._planner_events.append(
+                command,
+                comment,
+                self._x_um / UM_PER_MM,
+                self._y_um / UM_PER_MM,
+                self._z_um / UM_PER_MM,
+                self._extrusion_um / UM_PER_MM,
+                self._line_number,
+                self._row_number,
+                self._stitch_count,
+                duration_s,
+                kind,
+            )
         self._lines.append(GCodeLine(command, comment))
-        self._planner_events.append(
-            PlannerEvent(
-                command=command,
-                comment=comment,
-                x_mm=self._x_mm,
-                y_mm=self._y_mm,
-                z_mm=self._z_mm,
-                extrusion_mm=self._extrusion_mm,
+
+    def _emit_batch(
+        self,
+        commands: Sequence[str],
+        comments: Sequence[str | None],
+        x_values: Iterable[float],
+        y_values: Iterable[float],
+        z_values: Iterable[float],
+        extrusion_values: Iterable[float],
+        durations: Iterable[float],
+        stitch_ordinals: Iterable[int],
+        kinds: Iterable[int],
+        row_numbers: Iterable[int] | None = None,
+        comment_args: Sequence[int] | None = None,
+        stitch_run: _StitchRun | None = None,
+    ) -> None:
+        if self._record_events:
+            self._planner_events.extend(
+                commands,
+                comments,
+                x_values,
+                y_values,
+                z_values,
+                extrusion_values,
+                self._line_number,
+                self._row_number if row_numbers is None else row_numbers,
+                stitch_ordinals,
+                durations,
+                kinds,
+                comment_args,
             )
-        )
+        if comment_args is None:
+            self._lines.extend(map(GCodeLine, commands, comments))
+        else:
+            self._lines.extend(
+                map(
+                    GCodeLine,
+                    commands,
+                    comments,
+                    comment_args,
+                    repeat(stitch_run),
+                )
+            )
+
+    def _ensure_run_within_limits(
+        self,
+        axis: str,
+        positions: Sequence[float],
+        *,
+        line_number: int | None = None,
+    ) -> None:
+        """Check a monotonic run of positions against its endpoints."""
+
+        if self._limits is None or not positions:
+            return
+        first = positions[0]
+        last = positions[-1]
+        bounds = self._limits.get(axis)
+        if bounds is not None and bounds[0] <= min(first, last):
+            if max(first, last) <= bounds[1]:
+                return
+        # Re-check in order so the error names the first offending move.
+        for position in positions:
+            self._ensure_within_limits(axis, position, line_number=line_number)
+
+    def _ensure_interval_within_limits(
+        self,
+        axis: str,
+        low: float,
+        high: float,
+        *,
+        line_number: int | None = None,
+    ) -> None:
+        """Check that every position between ``low`` and ``high`` is reachable."""
+
+        if self._limits is None:
+            return
+        bounds = self._limits.get(axis)
+        if bounds is not None and bounds[0] <= low and high <= bounds[1]:
+            return
+        self._ensure_within_limits(axis, low, line_number=line_number)
+        self._ensure_within_limits(axis, high, line_number=line_number)
 
     def _ensure_within_limits(
         self, axis: str, position: float, *, line_number: int | None = None
     ) -> None:
-        if self._machine_profile is None:
+        if self._machine_profile is None or self._limits is None:
             return
+        bounds = self._limits.get(axis)
+        if bounds is not None and bounds[0] <= position <= bounds[1]:
+            return
+        # Let the profile build the error (including a missing axis).
         self._machine_profile.ensure_within(
             axis,
             position,
@@ -232,48 +804,132 @@ class PatternTranslator:
         return number
 
     def _ensure_safe_height(self) -> None:
-        if self._z_mm != SAFE_Z_MM:
+        if self._z_um != _SAFE_Z_UM:
             self._ensure_within_limits("Z", SAFE_Z_MM)
-            self._z_mm = SAFE_Z_MM
-            command = f"G1 Z{SAFE_Z_MM:.2f} F{PLUNGE_FEED_RATE}"
-            self._emit(command, "raise to safe height")
+            duration = self._timer.move_seconds(
+                PLUNGE_FEED_RATE, z_mm=to_mm(_SAFE_Z_UM - self._z_um)
+            )
+            self._z_um = _SAFE_Z_UM
+            command = f"G1 Z{format_mm(_SAFE_Z_UM)} F{PLUNGE_FEED_RATE}"
+            self._emit(EventKind.RAISE, command, "raise to safe height", duration)
 
     def _emit_stitches(
         self, profile: StitchProfile, count: int, line_number: int
     ) -> None:
-        for index in range(1, count + 1):
-            stitch_label = f"{profile.name.lower()} stitch {index} of {count}"
-            plunge_z = FABRIC_PLANE_Z_MM - profile.plunge_depth_mm
-            self._ensure_within_limits("Z", plunge_z, line_number=line_number)
-            self._z_mm = plunge_z
-            self._emit(
-                f"G1 Z{plunge_z:.2f} F{PLUNGE_FEED_RATE}",
-                f"{stitch_label}: plunge",
-            )
-            self._extrusion_mm += profile.yarn_feed_mm
-            self._emit(
-                f"G1 E{self._extrusion_mm:.2f} F{YARN_FEED_RATE}",
-                f"{stitch_label}: feed yarn",
-            )
-            self._z_mm = SAFE_Z_MM
-            self._emit(
-                f"G1 Z{SAFE_Z_MM:.2f} F{PLUNGE_FEED_RATE}",
-                f"{stitch_label}: raise",
-            )
-            self._ensure_within_limits("Z", SAFE_Z_MM, line_number=line_number)
-            new_x = self._x_mm + profile.spacing_mm
-            self._ensure_within_limits("X", new_x, line_number=line_number)
-            self._x_mm = new_x
-            self._emit(
-                f"G0 X{self._x_mm:.2f} Y{self._y_mm:.2f} F{TRAVEL_FEED_RATE}",
-                f"{stitch_label}: advance",
+        """Emit a run of ``count`` stitches in one batch.
+
+        Every stitch in a run shares its Z moves and feed rates; only X and E
+        differ. The X/E sequences are accumulated up front in micrometres,
+        limits are checked once against the run's extremes, and the commands
+        are appended in bulk.
+        """
+
+        plunge_z = _FABRIC_PLANE_Z_UM - to_um(profile.plunge_depth_mm)
+        spacing = to_um(profile.spacing_mm)
+        yarn_feed = to_um(profile.yarn_feed_mm)
+        x_values = list(accumulate(repeat(spacing, count), initial=self._x_um))
+        extrusion_values = list(
+            accumulate(repeat(yarn_feed, count), initial=self._extrusion_um)
+        )
+        x_mm = [x_um / UM_PER_MM for x_um in x_values]
+        extrusion_mm = [e_um / UM_PER_MM for e_um in extrusion_values]
+        plunge_mm = to_mm(plunge_z)
+        self._ensure_run_within_limits(
+            "Z",
+            (plunge_mm, SAFE_Z_MM),
+            line_number=line_number,
+        )
+        self._ensure_run_within_limits(
+            "X",
+            x_mm[1:],
+            line_number=line_number,
+        )
+
+        # Comments stay templates until read; only the stitch number varies.
+        name = profile.name.lower().replace("%", "%%")
+        label = f"{name} stitch %d of {count}: "
+        templates = (
+            f"{label}plunge",
+            f"{label}feed yarn",
+            f"{label}raise",
+            f"{label}advance",
+        )
+        plunge_command = f"G1 Z{format_mm(plunge_z)} F{PLUNGE_FEED_RATE}"
+        raise_command = f"G1 Z{format_mm(_SAFE_Z_UM)} F{PLUNGE_FEED_RATE}"
+        advance_suffix = f" Y{format_mm(self._y_um)} F{TRAVEL_FEED_RATE}"
+        feed_suffix = f" F{YARN_FEED_RATE}"
+        # Every stitch of the run makes the same four moves, so they are timed
+        # once and the durations repeated across the batch.
+        timer = self._timer
+        z_seconds = timer.move_seconds(
+            PLUNGE_FEED_RATE, z_mm=to_mm(_SAFE_Z_UM - plunge_z)
+        )
+        stitch_seconds = (
+            z_seconds,
+            timer.move_seconds(YARN_FEED_RATE, e_mm=to_mm(yarn_feed)),
+            z_seconds,
+            timer.move_seconds(TRAVEL_FEED_RATE, x_mm=to_mm(spacing)),
+        )
+        first_ordinal = self._stitch_count + 1
+        commands: List[str] = []
+        x_column: List[float] = []
+        z_column: List[float] = []
+        extrusion_column: List[float] = []
+        stitches = zip(
+            format_mm_run(x_values[1:]),
+            format_mm_run(extrusion_values[1:], recurring=False),
+            x_mm,
+            x_mm[1:],
+            extrusion_mm,
+            extrusion_mm[1:],
+        )
+        for x_text, e_text, x_before, x_after, e_before, e_after in stitches:
+            commands += (
+                plunge_command,
+                f"G1 E{e_text}{feed_suffix}",
+                raise_command,
+                f"G0 X{x_text}{advance_suffix}",
             )
+            x_column += (x_before, x_before, x_before, x_after)
+            z_column += (plunge_mm, plunge_mm, SAFE_Z_MM, SAFE_Z_MM)
+            extrusion_column += (e_before, e_after, e_after, e_after)
+        self._emit_batch(
+            commands,
+            templates * count,
+            x_column,
+            repeat(to_mm(self._y_um), len(commands)),
+            z_column,
+            extrusion_column,
+            stitch_seconds * count,
+            [
+                ordinal
+                for ordinal in range(first_ordinal, first_ordinal + count)
+                for _ in stitch_seconds
+            ],
+            _STITCH_KINDS * count,
+            comment_args=[
+                index for index in range(1, count + 1) for _ in _STITCH_KINDS
+            ],
+            stitch_run=_StitchRun(profile, count),
+        )
+        self._stitch_count += count
+        self._x_um = x_values[-1]
+        self._z_um = _SAFE_Z_UM
+        self._extrusion_um = extrusion_values[-1]
+
+    def _travel_seconds(self, x_um: int, y_um: int) -> float:
+        return self._timer.move_seconds(
+            TRAVEL_FEED_RATE,
+            x_mm=to_mm(x_um - self._x_um),
+            y_mm=to_mm(y_um - self._y_um),
+        )
 
-    def _handle_move(self, arguments: Sequence[str], line_number: int) -> None:
+    def _parse_move(
+        self, arguments: Sequence[str], line_number: int
+    ) -> Tuple[float, float]:
         if len(arguments) < 2:
             message = f"MOVE on line {line_number} requires X and Y values"
             raise ValueError(message)
-        self._ensure_safe_height()
         x_value = self._parse_float(arguments[0], line_number, "MOVE")
         y_value = self._parse_float(arguments[1], line_number, "MOVE")
         if x_value <= 0 or y_value <= 0:
@@ -281,20 +937,29 @@ class PatternTranslator:
                 line_number
             )
             raise ValueError(message)
-        self._ensure_within_limits("X", x_value, line_number=line_number)
-        self._ensure_within_limits("Y", y_value, line_number=line_number)
-        self._x_mm = x_value
-        self._y_mm = y_value
+        return x_value, y_value
+
+    def _move(self, x_value: float, y_value: float, line_number: int) -> None:
+        self._ensure_safe_height()
+        x_um = to_um(x_value)
+        y_um = to_um(y_value)
+        self._ensure_within_limits("X", to_mm(x_um), line_number=line_number)
+        self._ensure_within_limits("Y", to_mm(y_um), line_number=line_number)
+        duration = self._travel_seconds(x_um, y_um)
+        self._x_um = x_um
+        self._y_um = y_um
         self._emit(
-            f"G0 X{self._x_mm:.2f} Y{self._y_mm:.2f} F{TRAVEL_FEED_RATE}",
+            EventKind.REPOSITION,
+            f"G0 X{format_mm(x_um)} Y{format_mm(y_um)} F{TRAVEL_FEED_RATE}",
             "reposition",
+            duration,
         )
 
-    def _handle_pause(
+    def _parse_pause(
         self,
         arguments: Sequence[str],
         line_number: int,
-    ) -> None:
+    ) -> float:
         if len(arguments) != 1:
             message = "PAUSE on line {} requires exactly one value".format(
                 line_number,
@@ -306,17 +971,19 @@ class PatternTranslator:
                 line_number
             )
             raise ValueError(message)
+        return seconds
+
+    def _pause(self, seconds: float) -> None:
         milliseconds = int(round(seconds * 1000))
         comment = f"pause for {seconds:.3f} s"
-        self._emit(f"G4 P{milliseconds}", comment)
+        self._emit(EventKind.PAUSE, f"G4 P{milliseconds}", comment, milliseconds / 1000)
 
-    def _handle_turn(self, arguments: Sequence[str], line_number: int) -> None:
+    def _parse_turn(self, arguments: Sequence[str], line_number: int) -> float:
         if len(arguments) > 1:
             message = "TURN on line {} accepts at most one value".format(
                 line_number,
             )
             raise ValueError(message)
-        self._ensure_safe_height()
         if arguments:
             step = self._parse_float(arguments[0], line_number, "TURN")
         else:
@@ -326,15 +993,119 @@ class PatternTranslator:
                 line_number
             )
             raise ValueError(message)
+        return step
+
+    def _turn(self, step: float, line_number: int) -> None:
+        self._ensure_safe_height()
         self._ensure_within_limits("X", 0.0, line_number=line_number)
-        self._x_mm = 0.0
-        new_y = self._y_mm + step
-        self._ensure_within_limits("Y", new_y, line_number=line_number)
-        self._y_mm = new_y
+        new_y = self._y_um + to_um(step)
+        self._ensure_within_limits("Y", to_mm(new_y), line_number=line_number)
+        duration = self._travel_seconds(0, new_y)
+        self._x_um = 0
+        self._y_um = new_y
+        self._row_number += 1
         self._emit(
-            f"G0 X{self._x_mm:.2f} Y{self._y_mm:.2f} F{TRAVEL_FEED_RATE}",
+            EventKind.TURN,
+            f"G0 X{format_mm(self._x_um)} Y{format_mm(new_y)} F{TRAVEL_FEED_RATE}",
             "turn to next row",
+            duration,
+        )
+
+    def _parse_place(
+        self, arguments: Sequence[str], line_number: int
+    ) -> Tuple[_Motif, float, float]:
+        if len(arguments) != 3:
+            message = "PLACE on line {} requires a motif name, X and Y".format(
+                line_number
+            )
+            raise ValueError(message)
+        name = arguments[0]
+        motif = self._motifs.get(name)
+        if motif is None:
+            message = f"Unknown motif '{name}' on line {line_number}"
+            raise ValueError(message)
+        x_value = self._parse_float(arguments[1], line_number, "PLACE")
+        y_value = self._parse_float(arguments[2], line_number, "PLACE")
+        if x_value <= 0 or y_value <= 0:
+            message = "PLACE on line {} requires positive coordinates".format(
+                line_number
+            )
+            raise ValueError(message)
+        return motif, x_value, y_value
+
+    def _place(
+        self,
+        motif: _Motif,
+        x_offset: float,
+        y_offset: float,
+        line_number: int,
+    ) -> None:
+        """Re-emit a recorded motif shifted to ``(x_offset, y_offset)``."""
+
+        self._ensure_safe_height()
+        x_um = to_um(x_offset)
+        y_um = to_um(y_offset)
+        min_x, max_x, min_y, max_y, min_z, max_z = motif.bounds
+        for axis, low, high in (
+            ("X", to_mm(x_um) + min_x, to_mm(x_um) + max_x),
+            ("Y", to_mm(y_um) + min_y, to_mm(y_um) + max_y),
+            ("Z", min_z, max_z),
+        ):
+            self._ensure_interval_within_limits(
+                axis,
+                low,
+                high,
+                line_number=line_number,
+            )
+        duration = self._travel_seconds(x_um, y_um)
+        self._x_um = x_um
+        self._y_um = y_um
+        self._emit(
+            EventKind.REPOSITION,
+            f"G0 X{format_mm(x_um)} Y{format_mm(y_um)} F{TRAVEL_FEED_RATE}",
+            f"place motif {motif.name}",
+            duration,
+        )
+        base = self._extrusion_um
+        x_values = [local + x_um for local in motif.x_um]
+        y_values = [local + y_um for local in motif.y_um]
+        extrusion_values = [local + base for local in motif.extrusion_um]
+        commands = [
+            (
+                command
+                if shape == _STATIC_SHAPE
+                else (
+                    f"G0 X{format_mm(x)} Y{format_mm(y)} F{TRAVEL_FEED_RATE}"
+                    if shape == _TRAVEL_SHAPE
+                    else f"G1 E{format_mm(extrusion)} F{YARN_FEED_RATE}"
+                )
+            )
+            for shape, command, x, y, extrusion in zip(
+                motif.shapes,
+                motif.commands,
+                x_values,
+                y_values,
+                extrusion_values,
+            )
+        ]
+        self._emit_batch(
+            commands,
+            motif.comments,
+            [x / UM_PER_MM for x in x_values],
+            [y / UM_PER_MM for y in y_values],
+            [z / UM_PER_MM for z in motif.z_um],
+            [extrusion / UM_PER_MM for extrusion in extrusion_values],
+            motif.durations_s,
+            [ordinal + self._stitch_count for ordinal in motif.stitch_ordinals],
+            motif.kinds,
+            [row + self._row_number for row in motif.row_numbers],
         )
+        self._x_um = x_values[-1]
+        self._y_um = y_values[-1]
+        self._z_um = motif.z_um[-1]
+        self._extrusion_um = extrusion_values[-1]
+        self._row_number += motif.row_numbers[-1]
+        self._stitch_count += motif.stitch_ordinals[-1]
 
 
 def translate_pattern(
@@ -376,6 +1147,8 @@ def _parse_points_attribute(raw: str) -> List[Tuple[float, float]]:
 def _points_from_svg(svg_path: Path) -> List[Tuple[float, float]]:
     """Extract polyline or polygon coordinates from an SVG file."""
 
+    from xml.etree import ElementTree as ET
+
     document = ET.parse(svg_path)
     root = document.getroot()
     for element in root.iter():
@@ -448,26 +1221,121 @@ def _load_pattern(
     return sys.stdin.read()
 
 
-def _tension_sensor_reading(comment: str | None) -> float:
+def _iter_pattern_lines(
+    path: Path | None,
+    pattern: str | None,
+    svg: Path | None = None,
+    svg_scale: float = 1.0,
+    svg_offset_x: float = 0.0,
+    svg_offset_y: float = 0.0,
+) -> Iterator[str]:
+    """Yield pattern source lines without reading files into memory first."""
+
+    if pattern is None and svg is None:
+        if path is None:
+            yield from sys.stdin
+            return
+        with path.open(encoding="utf-8") as handle:
+            yield from handle
+        return
+    source = _load_pattern(
+        path,
+        pattern,
+        svg,
+        svg_scale,
+        svg_offset_x,
+        svg_offset_y,
+    )
+    yield from source.splitlines()
+
+
+def _tension_sensor_reading(kind: EventKind) -> float:
     """Return a representative hall-effect reading for the planner snapshot."""
 
-    if not comment:
-        return 140.0
+    return _TENSION_SENSOR_READINGS[kind]
+
 
-    normalized = comment.lower()
+def _planner_metadata(duration_seconds: float) -> dict[str, object]:
+    return {"duration_seconds": duration_seconds, "source": PLANNER_METADATA_SOURCE}
 
-    if "feed yarn" in normalized:
-        return 188.0
-    if "plunge" in normalized:
-        return 162.0
-    if "raise" in normalized:
-        return 150.0
-    if any(token in normalized for token in ("advance", "reposition", "turn")):
-        return 155.0
-    if "pause" in normalized:
-        return 142.0
 
-    return 140.0
+def _planner_head(
+    store: PlannerEventStore | None,
+    *,
+    require_home: bool = False,
+    home_state: str = "unknown",
+    version: int,
+) -> dict[str, object]:
+    """Return the planner members written before ``bounds`` and ``commands``.
+
+    ``metadata`` carries the estimated duration of the events in ``store``;
+    without a ``store`` (streamed output) it is left for the tail.
+    """
+
+    head: dict[str, object] = {"version": version, "units": "millimeters"}
+    if store is not None:
+        head["metadata"] = _planner_metadata(total_seconds(store.durations_s))
+    head["defaults"] = {
+        "safe_z_mm": SAFE_Z_MM,
+        "fabric_plane_z_mm": FABRIC_PLANE_Z_MM,
+        "travel_feed_rate_mm_min": TRAVEL_FEED_RATE,
+        "plunge_feed_rate_mm_min": PLUNGE_FEED_RATE,
+        "yarn_feed_rate_mm_min": YARN_FEED_RATE,
+        "default_row_height_mm": DEFAULT_ROW_HEIGHT,
+        "row_spacing_mm": DEFAULT_ROW_SPACING,
+        "require_home": bool(require_home),
+        "home_state": home_state,
+        "tension_sensor_calibration": {
+            "pairs": [list(pair) for pair in TENSION_SENSOR_CALIBRATION]
+        },
+        "heated_bed_conduit": {
+            "status": (
+                "Ready — thermistor conduit illuminated for the bay-to-bed "
+                "wiring run"
+            ),
+            "route": (
+                "Bay-to-bed thermistor channel glows when planner metadata is ready."
+            ),
+        },
+    }
+    return head
+
+
+def _planner_tail(
+    machine_profile: MachineProfile | None,
+    *,
+    seek_index: dict[str, object] | None = None,
+) -> dict[str, object]:
+    """Return the planner members written after ``commands``."""
+
+    tail: dict[str, object] = {}
+    if seek_index is not None:
+        tail["seek_index"] = seek_index
+    if machine_profile is None:
+        return tail
+    axes_payload: dict[str, dict[str, float]] = {}
+    for name in sorted(machine_profile.axes):
+        axis = machine_profile.axes[name]
+        axes_payload[name] = {
+            "microstepping": axis.microstepping,
+            "steps_per_mm": axis.steps_per_mm,
+            "travel_min_mm": axis.travel_min_mm,
+            "travel_max_mm": axis.travel_max_mm,
+        }
+        if axis.max_velocity_mm_s is not None:
+            axes_payload[name]["max_velocity_mm_s"] = axis.max_velocity_mm_s
+        if axis.max_acceleration_mm_s2 is not None:
+            axes_payload[name]["max_acceleration_mm_s2"] = axis.max_acceleration_mm_s2
+    tail["machine_profile"] = {"axes": axes_payload}
+    return tail
+
+
+def _seek_index(
+    store: PlannerEventStore, seek_interval: int | None
+) -> dict[str, object] | None:
+    if seek_interval is None:
+        return None
+    return PlannerIndex(store).keyframes(seek_interval)
 
 
 def _planner_payload(
@@ -476,82 +1344,63 @@ def _planner_payload(
     machine_profile: MachineProfile | None = None,
     require_home: bool = False,
     home_state: str = "unknown",
+    version: int = DEFAULT_PLANNER_VERSION,
+    seek_interval: int | None = None,
 ) -> dict[str, object]:
-    """Return a planner-friendly payload summarizing motion commands."""
+    """Return a planner-friendly payload summarizing motion commands.
+
+    Version 1 lists one object per command; version 2 stores the same data as
+    parallel columns indexing a shared ``strings`` table. With a
+    ``seek_interval`` the payload also carries a ``seek_index`` of keyframes.
+    """
 
-    def bounds(values: Iterable[float]) -> dict[str, float]:
-        series = list(values)
-        return {"min": min(series), "max": max(series)}
+    store = PlannerEventStore.from_events(events)
+    tail = _planner_tail(machine_profile, seek_index=_seek_index(store, seek_interval))
+    payload = _planner_head(
+        store, require_home=require_home, home_state=home_state, version=version
+    )
+    payload["bounds"] = store_bounds(store)
+    if version == 2:
+        payload["strings"] = list(store.render_comments().strings)
+        payload["kind_names"] = [kind.label for kind in EventKind]
+        payload["commands"] = {
+            "count": len(store),
+            "command_ids": list(store.command_ids),
+            "comment_ids": list(store.comment_ids),
+            "kinds": list(store.kinds),
+            "x_mm": list(store.x_mm),
+            "y_mm": list(store.y_mm),
+            "z_mm": list(store.z_mm),
+            "extrusion_mm": list(store.extrusion_mm),
+            "duration_s": list(store.durations_s),
+            "tension_sensor_reading": tension_readings(store, _tension_sensor_reading),
+        }
+        payload["feed_indices"] = store.indices_of(EventKind.FEED)
+        payload.update(tail)
+        return payload
 
     commands = []
-    for index, event in enumerate(events):
+    for index, event in enumerate(store):
         entry: dict[str, object] = {
             "index": index,
             "command": event.command,
+            "kind": event.kind.label,
             "state": {
                 "x_mm": event.x_mm,
                 "y_mm": event.y_mm,
                 "z_mm": event.z_mm,
                 "extrusion_mm": event.extrusion_mm,
-                "tension_sensor_reading": _tension_sensor_reading(event.comment),
+                "duration_s": store.durations_s[index],
+                "tension_sensor_reading": _tension_sensor_reading(event.kind),
             },
         }
         if event.comment is not None:
             entry["comment"] = event.comment
         commands.append(entry)
 
-    payload: dict[str, object] = {
-        "version": 1,
-        "units": "millimeters",
-        "metadata": {
-            "duration_seconds": PLANNER_LOOP_SECONDS,
-            "source": PLANNER_METADATA_SOURCE,
-        },
-        "defaults": {
-            "safe_z_mm": SAFE_Z_MM,
-            "fabric_plane_z_mm": FABRIC_PLANE_Z_MM,
-            "travel_feed_rate_mm_min": TRAVEL_FEED_RATE,
-            "plunge_feed_rate_mm_min": PLUNGE_FEED_RATE,
-            "yarn_feed_rate_mm_min": YARN_FEED_RATE,
-            "default_row_height_mm": DEFAULT_ROW_HEIGHT,
-            "row_spacing_mm": DEFAULT_ROW_SPACING,
-            "require_home": bool(require_home),
-            "home_state": home_state,
-            "tension_sensor_calibration": {
-                "pairs": [list(pair) for pair in TENSION_SENSOR_CALIBRATION]
-            },
-            "heated_bed_conduit": {
-                "status": (
-                    "Ready — thermistor conduit illuminated for the bay-to-bed "
-                    "wiring run"
-                ),
-                "route": (
-                    "Bay-to-bed thermistor channel glows when planner metadata "
-                    "is ready."
-                ),
-            },
-        },
-        "bounds": {
-            "x_mm": bounds(event.x_mm for event in events),
-            "y_mm": bounds(event.y_mm for event in events),
-            "z_mm": bounds(event.z_mm for event in events),
-            "extrusion_mm": bounds(event.extrusion_mm for event in events),
-        },
-        "commands": commands,
-    }
-
-    if machine_profile is not None:
-        axes_payload: dict[str, dict[str, float]] = {}
-        for name in sorted(machine_profile.axes):
-            axis = machine_profile.axes[name]
-            axes_payload[name] = {
-                "microstepping": axis.microstepping,
-                "steps_per_mm": axis.steps_per_mm,
-                "travel_min_mm": axis.travel_min_mm,
-                "travel_max_mm": axis.travel_max_mm,
-            }
-        payload["machine_profile"] = {"axes": axes_payload}
-
+    payload["commands"] = commands
+    payload["feed_indices"] = store.indices_of(EventKind.FEED)
+    payload.update(tail)
     return payload
 
 
@@ -564,43 +1413,415 @@ def _write_output(
     machine_profile: MachineProfile | None = None,
     require_home: bool = False,
     home_state: str = "unknown",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    compact: bool = False,
+    planner_version: int = DEFAULT_PLANNER_VERSION,
+    chunk_commands: int | None = None,
+    seek_interval: int | None = None,
+    comments: bool = True,
+    compact_gcode: bool = False,
+    relative_extrusion: bool = False,
+    stitch_macros: bool = False,
 ) -> None:
-    if fmt == "gcode":
-        text = "\n".join(line.as_text() for line in lines) + "\n"
-    elif fmt == "json":
-        payload = [line.as_dict() for line in lines]
-        text = json.dumps(payload, indent=2)
-    else:
+    if fmt in {"planner", "planner-bin"}:
         if planner_events is None:
             raise ValueError("Planner format requires planner events")
-        payload = _planner_payload(
-            planner_events,
-            machine_profile=machine_profile,
+        store = PlannerEventStore.from_events(planner_events)
+    if fmt == "planner-bin":
+        with open_binary_output(output_path) as binary:
+            write_planner_binary(
+                binary,
+                _planner_head(
+                    store,
+                    require_home=require_home,
+                    home_state=home_state,
+                    version=planner_version,
+                ),
+                store,
+                store_bounds(store),
+                _planner_tail(machine_profile),
+                reading=_tension_sensor_reading,
+            )
+        return
+    if fmt == "planner":
+        head = _planner_head(
+            store,
             require_home=require_home,
             home_state=home_state,
+            version=planner_version,
         )
-        text = json.dumps(payload, indent=2)
-    if output_path is None:
-        sys.stdout.write(text)
+        seek_index = _seek_index(store, seek_interval)
+        if chunk_commands is not None:
+            if output_path is None:
+                raise ValueError("Chunked planner output requires an output path")
+            write_planner_chunks(
+                output_path,
+                head,
+                store,
+                _planner_tail(machine_profile),
+                chunk_commands=chunk_commands,
+                reading=_tension_sensor_reading,
+                compact=compact,
+                buffer_size=buffer_size,
+                seek_index=seek_index,
+            )
+            return
+        tail = _planner_tail(machine_profile, seek_index=seek_index)
+        if planner_version == 2:
+            fragments = iter_planner_columns_json(
+                head,
+                store,
+                tail,
+                reading=_tension_sensor_reading,
+                bounds=store_bounds(store),
+                compact=compact,
+            )
+        else:
+            fragments = iter_planner_json(
+                head,
+                [store],
+                tail,
+                reading=_tension_sensor_reading,
+                bounds=store_bounds(store),
+                compact=compact,
+            )
+        with open_output(output_path, buffer_size=buffer_size) as handle:
+            handle.writelines(fragments)
+        return
+    with open_output(output_path, buffer_size=buffer_size) as handle:
+        _write_stream(
+            lines,
+            handle,
+            fmt,
+            flush_interval=None,
+            compact=compact,
+            comments=comments,
+            compact_gcode=compact_gcode,
+            relative_extrusion=relative_extrusion,
+            stitch_macros=stitch_macros,
+        )
+
+
+def _write_stream(
+    lines: Iterable[GCodeLine],
+    handle: BufferedTextWriter | TextIO,
+    fmt: str,
+    *,
+    flush_interval: int | None = STREAM_FLUSH_INTERVAL,
+    compact: bool = False,
+    comments: bool = True,
+    compact_gcode: bool = False,
+    relative_extrusion: bool = False,
+    stitch_macros: bool = False,
+) -> None:
+    """Write ``lines`` to ``handle`` one command at a time.
+
+    With a ``flush_interval`` the handle is flushed after the first command
+    and then every ``flush_interval`` commands so readers see output early.
+    ``comments=False`` writes bare G-code commands, never rendering comments.
+    ``compact_gcode`` and ``relative_extrusion`` rewrite G-code commands as
+    described in :mod:`wove.pattern_cli.modal`; ``stitch_macros`` writes each
+    stitch run as one :data:`STITCH_MACRO` call.
+    """
+
+    if fmt == "gcode" and stitch_macros:
+        lines = _collapse_stitch_runs(lines)
+    if fmt == "gcode" and (compact_gcode or relative_extrusion):
+        from .modal import iter_modal_gcode
+
+        fragments: Iterable[str] = iter_modal_gcode(
+            lines,
+            modal=compact_gcode,
+            relative_extrusion=relative_extrusion,
+            comments=comments,
+        )
+    elif fmt == "gcode" and not comments:
+        fragments = (f"{line.command}\n" for line in lines)
+    elif fmt == "gcode":
+        fragments = (f"{line.as_text()}\n" for line in lines)
     else:
-        output_path.write_text(text, encoding="utf-8")
+        fragments = iter_commands_json(lines, compact=compact)
+    if flush_interval is None:
+        handle.writelines(fragments)
+    else:
+        for written, fragment in enumerate(fragments, start=1):
+            handle.write(fragment)
+            if written == 1 or written % flush_interval == 0:
+                handle.flush()
+    handle.flush()
+
+
+def _stream_output(
+    lines: Iterable[GCodeLine],
+    output_path: Path | None,
+    fmt: str,
+    *,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    compact: bool = False,
+    comments: bool = True,
+    compact_gcode: bool = False,
+    relative_extrusion: bool = False,
+    stitch_macros: bool = False,
+) -> None:
+    """Write ``lines`` as they are produced, flushing periodically."""
+
+    if fmt not in {"gcode", "json"}:
+        raise ValueError("Streaming output supports the gcode and json formats")
+    with open_output(output_path, buffer_size=buffer_size) as handle:
+        _write_stream(
+            lines,
+            handle,
+            fmt,
+            compact=compact,
+            comments=comments,
+            compact_gcode=compact_gcode,
+            relative_extrusion=relative_extrusion,
+            stitch_macros=stitch_macros,
+        )
+
+
+def _stream_planner_output(
+    chunks: Iterable[PlannerEventStore],
+    output_path: Path | None,
+    *,
+    machine_profile: MachineProfile | None = None,
+    require_home: bool = False,
+    home_state: str = "unknown",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    compact: bool = False,
+    seek_interval: int | None = None,
+) -> None:
+    """Write planner output as event chunks arrive, with ``bounds`` last."""
+
+    builder = None if seek_interval is None else KeyframeBuilder(seek_interval)
+    elapsed_s = 0.0
+
+    def observed() -> Iterator[PlannerEventStore]:
+        nonlocal elapsed_s
+        for chunk in chunks:
+            if builder is not None:
+                builder.add(chunk)
+            elapsed_s = total_seconds(chunk.durations_s, elapsed_s)
+            yield chunk
+
+    def tail() -> dict[str, object]:
+        seek_index = None if builder is None else builder.keyframes()
+        # The job's duration is only known now, so ``metadata`` follows it.
+        tail = {"metadata": _planner_metadata(elapsed_s)}
+        tail.update(_planner_tail(machine_profile, seek_index=seek_index))
+        return tail
+
+    fragments = iter_planner_json(
+        _planner_head(
+            None, require_home=require_home, home_state=home_state, version=1
+        ),
+        observed(),
+        tail,
+        reading=_tension_sensor_reading,
+        compact=compact,
+    )
+    with open_output(output_path, buffer_size=buffer_size) as handle:
+        for fragment in fragments:
+            handle.write(fragment)
+            handle.flush()
+
+
+def _validate_only(
+    pattern_text: str, machine_profile: MachineProfile, jobs: int
+) -> int:
+    """Translate without limit checks, then report every limit violation."""
+
+    from .limits import find_limit_violations
+
+    translator = PatternTranslator()
+    try:
+        if jobs > 1:
+            lines = translator.translate_parallel(pattern_text, workers=jobs)
+        else:
+            lines = translator.translate(pattern_text)
+        violations = find_limit_violations(translator.planner_events, machine_profile)
+    except ValueError as error:
+        sys.stderr.write(f"{error}\n")
+        return 1
+    for violation in violations:
+        sys.stderr.write(f"{violation.message}\n")
+    if violations:
+        return 1
+    sys.stdout.write(f"{len(lines)} commands within machine travel limits\n")
+    return 0
+
+
+def _translate_job(
+    pattern_text: str, machine_profile: MachineProfile | None, jobs: int
+) -> Tuple[List[GCodeLine], PlannerEventStore]:
+    """Translate ``pattern_text`` and return its lines and planner events."""
+
+    translator = PatternTranslator(machine_profile=machine_profile)
+    if jobs > 1:
+        lines = translator.translate_parallel(pattern_text, workers=jobs)
+    else:
+        lines = translator.translate(pattern_text)
+    return lines, translator.planner_events
 
 
 def main(argv: Sequence[str] | None = None) -> int:
-    args = parse_args(argv)
-    pattern_path = Path(args.pattern) if args.pattern else None
-    pattern_text = _load_pattern(
-        pattern_path,
-        args.text,
-        args.svg,
-        args.svg_scale,
-        args.svg_offset_x,
-        args.svg_offset_y,
+    arguments = sys.argv[1:] if argv is None else list(argv)
+    if arguments[:1] == ["serve"]:
+        from .server import serve_main
+
+        return serve_main(arguments[1:])
+    if arguments[:1] == ["batch"]:
+        from .batch import batch_main
+
+        return batch_main(arguments[1:])
+    if arguments[:1] == ["klipper-macros"]:
+        from .macros import macros_main
+
+        return macros_main(arguments[1:])
+    args = parse_args(arguments)
+    socket_path = args.daemon
+    if socket_path is None:
+        socket_path = os.environ.get(DAEMON_SOCKET_ENV)
+    if socket_path is not None and not args.stream:
+        from .server import run_remote
+
+        stdin_text = None
+        if args.pattern is None and args.text is None and args.svg is None:
+            # Read stdin once so an in-process fallback sees the same text.
+            stdin_text = args.text = sys.stdin.read()
+        exit_code = run_remote(socket_path, arguments, stdin=stdin_text)
+        if exit_code is not None:
+            return exit_code
+    return _run(args)
+
+
+def _output_cache(args: argparse.Namespace) -> OutputCache | None:
+    """Return the ``--cache-dir`` cache for this run, if caching applies.
+
+    Chunked planner output spans several files and is never cached.
+    """
+
+    directory = args.cache_dir or os.environ.get(CACHE_DIR_ENV)
+    if args.no_cache or not directory or args.chunk_commands is not None:
+        return None
+    from .cache import OutputCache
+
+    return OutputCache(Path(directory), max_bytes=args.cache_max_mb * 1024 * 1024)
+
+
+def _output_cache_key(
+    args: argparse.Namespace, pattern_text: str, fmt: str, output_path: Path | None
+) -> str:
+    """Return the cache key for every input that shapes one output of this run."""
+
+    from .cache import cache_key, code_fingerprint
+
+    profile_bytes = b""
+    if args.machine_profile is not None:
+        profile_bytes = Path(args.machine_profile).read_bytes()
+    constants = (
+        STITCH_PROFILES,
+        SAFE_Z_MM,
+        FABRIC_PLANE_Z_MM,
+        TRAVEL_FEED_RATE,
+        PLUNGE_FEED_RATE,
+        YARN_FEED_RATE,
+        DEFAULT_ROW_HEIGHT,
+        DEFAULT_ROW_SPACING,
+        TENSION_SENSOR_CALIBRATION,
+    )
+    options = {
+        "format": fmt,
+        "compact": args.compact,
+        "comments": not args.no_comments,
+        "compact_gcode": args.compact_gcode,
+        "relative_extrusion": args.relative_extrusion,
+        "stitch_macros": args.stitch_macros,
+        "planner_version": args.planner_version or DEFAULT_PLANNER_VERSION,
+        "seek_interval": args.seek_interval,
+        "require_home": args.require_home,
+        "home_state": args.home_state,
+        "compression": _compression_suffix(output_path),
+    }
+    return cache_key(
+        (
+            code_fingerprint(),
+            repr(constants),
+            json.dumps(options, sort_keys=True),
+            profile_bytes,
+            pattern_text,
+        )
     )
+
+
+def _has_repeated_target(targets: Sequence[Tuple[str, Path | None]]) -> bool:
+    paths = [None if path is None else path.resolve() for _, path in targets]
+    return len(set(paths)) != len(paths)
+
+
+def _compression_suffix(output_path: Path | None) -> str:
+    if output_path is None:
+        return ""
+    suffix = output_path.suffix.lower()
+    return suffix if suffix in COMPRESSED_SUFFIXES else ""
+
+
+def _run(
+    args: argparse.Namespace,
+    *,
+    load_profile: Callable[[Path], MachineProfile] = load_machine_profile,
+    translate: Callable[
+        [str, MachineProfile | None, int],
+        Tuple[List[GCodeLine], PlannerEventStore],
+    ] = _translate_job,
+) -> int:
+    """Carry out a parsed CLI invocation and return its exit code.
+
+    The ``serve`` daemon passes caching ``load_profile`` and ``translate``
+    callables; the defaults load and translate afresh.
+    """
+
+    pattern_path = Path(args.pattern) if args.pattern else None
+    if args.stream and args.format == "planner-bin":
+        sys.stderr.write("--stream does not support the planner-bin format\n")
+        return 1
+    if args.stream and args.planner_version == 2:
+        sys.stderr.write("--stream does not support planner version 2\n")
+        return 1
+    if args.chunk_commands is not None and (
+        args.stream or args.format != "planner" or args.output is None
+    ):
+        message = (
+            "--chunk-commands requires --format planner, --output, and no --stream\n"
+        )
+        sys.stderr.write(message)
+        return 1
+    if args.emit and (args.stream or args.output is not None):
+        sys.stderr.write("--emit cannot be combined with --output or --stream\n")
+        return 1
+    if args.emit and _has_repeated_target(args.emit):
+        sys.stderr.write("--emit names the same output more than once\n")
+        return 1
+    if args.stream and args.jobs > 1:
+        sys.stderr.write("--jobs cannot be combined with --stream\n")
+        return 1
+    if args.validate_only and (args.stream or args.machine_profile is None):
+        message = "--validate-only requires --machine-profile and no --stream\n"
+        sys.stderr.write(message)
+        return 1
+    if not args.stream:
+        pattern_text = _load_pattern(
+            pattern_path,
+            args.text,
+            args.svg,
+            args.svg_scale,
+            args.svg_offset_x,
+            args.svg_offset_y,
+        )
     machine_profile: MachineProfile | None = None
     if args.machine_profile is not None:
         try:
-            machine_profile = load_machine_profile(args.machine_profile)
+            machine_profile = load_profile(args.machine_profile)
         except ValueError as error:
             sys.stderr.write(f"{error}\n")
             return 1
@@ -613,21 +1834,98 @@ def main(argv: Sequence[str] | None = None) -> int:
         guidance = "Run the machine homing sequence or omit --require-home.\n"
         sys.stderr.write(guidance)
         return 1
-    translator = PatternTranslator(machine_profile=machine_profile)
+    if args.validate_only and machine_profile is not None:
+        return _validate_only(pattern_text, machine_profile, args.jobs)
+    if args.stream:
+        translator = PatternTranslator(machine_profile=machine_profile)
+        source_lines = _iter_pattern_lines(
+            pattern_path,
+            args.text,
+            args.svg,
+            args.svg_scale,
+            args.svg_offset_x,
+            args.svg_offset_y,
+        )
+        try:
+            if args.format == "planner":
+                _stream_planner_output(
+                    translator.iter_planner_events(source_lines),
+                    args.output,
+                    machine_profile=machine_profile,
+                    require_home=args.require_home,
+                    home_state=args.home_state,
+                    buffer_size=args.buffer_size,
+                    compact=args.compact,
+                    seek_interval=args.seek_interval,
+                )
+            else:
+                _stream_output(
+                    translator.iter_translate(source_lines),
+                    args.output,
+                    args.format,
+                    buffer_size=args.buffer_size,
+                    compact=args.compact,
+                    comments=not args.no_comments,
+                    compact_gcode=args.compact_gcode,
+                    relative_extrusion=args.relative_extrusion,
+                    stitch_macros=args.stitch_macros,
+                )
+        except ValueError as error:
+            sys.stderr.write(f"{error}\n")
+            return 1
+        return 0
+    targets = args.emit or [(args.format, args.output)]
+    cache = _output_cache(args)
+    if cache is not None:
+        from .cache import deliver
+
+        keys = [
+            _output_cache_key(args, pattern_text, fmt, output_path)
+            for fmt, output_path in targets
+        ]
+        entries = [
+            cache.lookup(key, _compression_suffix(output_path))
+            for key, (_, output_path) in zip(keys, targets)
+        ]
+        if all(entry is not None for entry in entries):
+            for entry, (_, output_path) in zip(entries, targets):
+                deliver(entry, output_path)
+            return 0
     try:
-        lines = translator.translate(pattern_text)
+        lines, planner_events = translate(pattern_text, machine_profile, args.jobs)
     except ValueError as error:
         sys.stderr.write(f"{error}\n")
         return 1
-    _write_output(
-        lines,
-        args.output,
-        args.format,
-        planner_events=translator.planner_events,
-        machine_profile=machine_profile,
-        require_home=args.require_home,
-        home_state=args.home_state,
-    )
+
+    def write(fmt: str, output_path: Path | None) -> None:
+        _write_output(
+            lines,
+            output_path,
+            fmt,
+            planner_events=planner_events,
+            machine_profile=machine_profile,
+            require_home=args.require_home,
+            home_state=args.home_state,
+            buffer_size=args.buffer_size,
+            compact=args.compact,
+            planner_version=args.planner_version or DEFAULT_PLANNER_VERSION,
+            chunk_commands=args.chunk_commands,
+            seek_interval=args.seek_interval,
+            comments=not args.no_comments,
+            compact_gcode=args.compact_gcode,
+            relative_extrusion=args.relative_extrusion,
+            stitch_macros=args.stitch_macros,
+        )
+
+    # One translation fans out to every requested writer.
+    for index, (fmt, output_path) in enumerate(targets):
+        if cache is None:
+            write(fmt, output_path)
+            continue
+        suffix = _compression_suffix(output_path)
+        entry = cache.store(keys[index], suffix, lambda path: write(fmt, path))
+        cache.evict(keep=entry)
+        deliver(entry, output_path)
     return 0
 
 
@@ -640,8 +1938,12 @@ __all__ = [
     "DEFAULT_ROW_HEIGHT",
     "DEFAULT_ROW_SPACING",
     "MIN_MOVE_COORD_MM",
+    "STITCH_MACRO",
     "GCodeLine",
+    "EventKind",
     "PlannerEvent",
+    "PlannerEventStore",
+    "PlannerIndex",
     "StitchProfile",
     "STITCH_PROFILES",
     "PatternTranslator",
@@ -652,7 +1954,9 @@ __all__ = [
     "_pattern_from_svg",
     "_planner_payload",
     "_write_output",
+    "_stream_output",
     "_load_pattern",
+    "_iter_pattern_lines",
     "build_parser",
     "parse_args",
     "main",
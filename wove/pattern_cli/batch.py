@@ -0,0 +1,347 @@
+"""Translate many pattern files in one process (``batch`` subcommand).
+
+Spawning the CLI once per file repeats interpreter startup, imports, and
+machine profile parsing for every job. ``batch`` pays for those once, then
+translates each file on a worker pool and writes every requested format from
+a single translation. A failing file is recorded in the summary and the
+batch moves on to the next one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from ..machine_profile import MachineProfile, load_machine_profile
+from . import PatternTranslator, _write_output
+from .encoder import DEFAULT_PLANNER_VERSION
+from .options import _positive_int
+from .seek import KEYFRAME_INTERVAL, PlannerIndex
+
+SUMMARY_NAME = "summary.json"
+DEFAULT_PATTERN_GLOB = "*.txt"
+# Output format -> suffix appended to each pattern's relative path.
+FORMAT_SUFFIXES = {
+    "gcode": ".gcode",
+    "json": ".json",
+    "planner": ".planner.json",
+    "planner-bin": ".planner.bin",
+}
+
+_worker_profile: MachineProfile | None = None
+_worker_options: Dict[str, object] = {}
+
+
+def _format_list(value: str) -> Tuple[str, ...]:
+    formats = tuple(dict.fromkeys(part.strip() for part in value.split(",")))
+    unknown = [fmt for fmt in formats if fmt not in FORMAT_SUFFIXES]
+    if unknown or not formats:
+        choices = ", ".join(FORMAT_SUFFIXES)
+        message = f"expected a comma-separated list of {choices}, got '{value}'"
+        raise argparse.ArgumentTypeError(message)
+    return formats
+
+
+def build_batch_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for ``python -m wove.pattern_cli batch``."""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m wove.pattern_cli batch",
+        description=(
+            "Translate pattern files into --out-dir, one output per file and "
+            f"format, and record the results in {SUMMARY_NAME}."
+        ),
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        type=Path,
+        help="Pattern files, or directories searched recursively with --glob.",
+    )
+    parser.add_argument(
+        "--out-dir",
+        type=Path,
+        required=True,
+        help="Directory to write outputs and the summary into.",
+    )
+    parser.add_argument(
+        "--format",
+        type=_format_list,
+        default=("gcode",),
+        help=(
+            "Comma-separated output formats from "
+            f"{', '.join(FORMAT_SUFFIXES)} (default: gcode)."
+        ),
+    )
+    parser.add_argument(
+        "--glob",
+        default=DEFAULT_PATTERN_GLOB,
+        help=(
+            "File name pattern matched inside input directories "
+            f"(default: {DEFAULT_PATTERN_GLOB})."
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=_positive_int,
+        default=os.cpu_count() or 1,
+        help="Files to translate at once in worker processes (default: CPU count).",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write json and planner output without indentation.",
+    )
+    parser.add_argument(
+        "--no-comments",
+        action="store_true",
+        help="Write G-code without trailing comments (other formats keep them).",
+    )
+    parser.add_argument(
+        "--compact-gcode",
+        action="store_true",
+        help="Leave out G-code words that repeat the current position or feed rate.",
+    )
+    parser.add_argument(
+        "--relative-extrusion",
+        action="store_true",
+        help="Write G-code E values as per-move distances after M83.",
+    )
+    parser.add_argument(
+        "--stitch-macros",
+        action="store_true",
+        help=(
+            "Write each stitch run in G-code as one STITCH macro call; see "
+            "the klipper-macros subcommand."
+        ),
+    )
+    parser.add_argument(
+        "--planner-version",
+        type=int,
+        choices=(1, 2),
+        default=DEFAULT_PLANNER_VERSION,
+        help=f"Planner JSON layout (default: {DEFAULT_PLANNER_VERSION}).",
+    )
+    parser.add_argument(
+        "--seek-interval",
+        type=_positive_int,
+        default=KEYFRAME_INTERVAL,
+        metavar="N",
+        help=f"Planner seek_index keyframe spacing (default: {KEYFRAME_INTERVAL}).",
+    )
+    parser.add_argument(
+        "--machine-profile",
+        type=Path,
+        help="JSON or YAML machine profile, loaded once for the whole batch.",
+    )
+    parser.add_argument(
+        "--home-state",
+        choices=("unknown", "homed"),
+        default="unknown",
+        help="Reported homing state of the motion system (default: unknown).",
+    )
+    parser.add_argument(
+        "--require-home",
+        action="store_true",
+        help="Abort the batch if the reported homing state is not 'homed'.",
+    )
+    return parser
+
+
+def iter_pattern_files(
+    inputs: Sequence[Path], pattern_glob: str = DEFAULT_PATTERN_GLOB
+) -> Iterator[Tuple[Path, Path]]:
+    """Yield ``(source, relative output stem)`` for every pattern in ``inputs``.
+
+    Files inside a directory keep their path relative to it, so libraries with
+    repeated file names in different folders do not overwrite each other.
+    """
+
+    for path in inputs:
+        if not path.is_dir():
+            yield path, Path(path.stem)
+            continue
+        for source in sorted(path.rglob(pattern_glob)):
+            if source.is_file():
+                yield source, source.relative_to(path).with_suffix("")
+
+
+def translate_file(
+    source: Path,
+    stem: Path,
+    formats: Sequence[str],
+    machine_profile: MachineProfile | None = None,
+    **options: object,
+) -> Dict[str, object]:
+    """Translate ``source`` once and write it in every format under ``stem``.
+
+    Returns the file's summary entry; read and translation errors are
+    reported there instead of raised.
+    """
+
+    started = time.perf_counter()
+    entry: Dict[str, object] = {"input": str(source)}
+    try:
+        translator = PatternTranslator(machine_profile=machine_profile)
+        lines = translator.translate(source.read_text(encoding="utf-8"))
+        events = translator.planner_events
+        outputs = []
+        for fmt in formats:
+            output_path = stem.parent / (stem.name + FORMAT_SUFFIXES[fmt])
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_output(
+                lines,
+                output_path,
+                fmt,
+                planner_events=events,
+                machine_profile=machine_profile,
+                **options,
+            )
+            outputs.append(str(output_path))
+    except (OSError, UnicodeDecodeError, ValueError) as error:
+        entry.update(status="error", error=str(error))
+    else:
+        entry.update(
+            status="ok",
+            outputs=outputs,
+            commands=len(events),
+            duration_s=PlannerIndex(events).total_seconds,
+        )
+    entry["elapsed_s"] = time.perf_counter() - started
+    return entry
+
+
+def _init_worker(
+    machine_profile: MachineProfile | None, options: Dict[str, object]
+) -> None:
+    global _worker_profile, _worker_options
+    _worker_profile = machine_profile
+    _worker_options = options
+
+
+def _translate_in_worker(
+    task: Tuple[Path, Path, Sequence[str]],
+) -> Dict[str, object]:
+    source, stem, formats = task
+    return translate_file(source, stem, formats, _worker_profile, **_worker_options)
+
+
+def run_batch(
+    files: Sequence[Tuple[Path, Path]],
+    out_dir: Path,
+    formats: Sequence[str],
+    machine_profile: MachineProfile | None = None,
+    *,
+    jobs: int = 1,
+    **options: object,
+) -> Dict[str, object]:
+    """Translate ``files`` into ``out_dir`` and return the batch summary.
+
+    The machine profile and output options are sent to each worker once, not
+    with every file. Entries keep the order of ``files``.
+    """
+
+    started = time.perf_counter()
+    tasks = [(source, out_dir / stem, tuple(formats)) for source, stem in files]
+    results: List[Dict[str, object]]
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(tasks)),
+            initializer=_init_worker,
+            initargs=(machine_profile, options),
+        ) as executor:
+            results = list(executor.map(_translate_in_worker, tasks))
+    else:
+        results = [
+            translate_file(source, stem, formats, machine_profile, **options)
+            for source, stem, formats in tasks
+        ]
+    failed = sum(result["status"] != "ok" for result in results)
+    return {
+        "formats": list(formats),
+        "files": results,
+        "totals": {
+            "files": len(results),
+            "ok": len(results) - failed,
+            "failed": failed,
+            "commands": sum(int(result.get("commands", 0)) for result in results),
+            "elapsed_s": time.perf_counter() - started,
+        },
+    }
+
+
+def batch_main(argv: Sequence[str] | None = None) -> int:
+    """Run a batch and return 1 if any file failed."""
+
+    args = build_batch_parser().parse_args(argv)
+    if args.require_home and args.home_state != "homed":
+        message = (
+            "Refusing to generate motion: home state is "
+            f"'{args.home_state}' (expected 'homed').\n"
+        )
+        sys.stderr.write(message)
+        return 1
+    machine_profile = None
+    if args.machine_profile is not None:
+        try:
+            machine_profile = load_machine_profile(args.machine_profile)
+        except ValueError as error:
+            sys.stderr.write(f"{error}\n")
+            return 1
+    files = list(iter_pattern_files(args.inputs, args.glob))
+    claimed: Dict[Path, Path] = {}
+    if "json" in args.format:
+        claimed[Path(SUMMARY_NAME).with_suffix("")] = Path(SUMMARY_NAME)
+    for source, stem in files:
+        if stem in claimed:
+            message = f"{claimed[stem]} and {source} would both write to {stem}\n"
+            sys.stderr.write(message)
+            return 1
+        claimed[stem] = source
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    summary = run_batch(
+        files,
+        args.out_dir,
+        args.format,
+        machine_profile,
+        jobs=args.jobs,
+        compact=args.compact,
+        comments=not args.no_comments,
+        compact_gcode=args.compact_gcode,
+        relative_extrusion=args.relative_extrusion,
+        stitch_macros=args.stitch_macros,
+        planner_version=args.planner_version,
+        seek_interval=args.seek_interval,
+        require_home=args.require_home,
+        home_state=args.home_state,
+    )
+    summary_path = args.out_dir / SUMMARY_NAME
+    summary_path.write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+    for entry in summary["files"]:
+        if entry["status"] != "ok":
+            sys.stderr.write(f"{entry['input']}: {entry['error']}\n")
+    totals = summary["totals"]
+    sys.stderr.write(
+        f"Translated {totals['ok']} of {totals['files']} patterns "
+        f"({totals['failed']} failed); summary in {summary_path}\n"
+    )
+    return 1 if totals["failed"] else 0
+
+
+__all__ = [
+    "DEFAULT_PATTERN_GLOB",
+    "FORMAT_SUFFIXES",
+    "SUMMARY_NAME",
+    "batch_main",
+    "build_batch_parser",
+    "iter_pattern_files",
+    "run_batch",
+    "translate_file",
+]
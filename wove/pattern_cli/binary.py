@@ -0,0 +1,219 @@
+"""Binary, memory-mappable planner export (``--format planner-bin``).
+
+Layout (all integers little-endian, every section 8-byte aligned)::
+
+    0   8 bytes   magic  b"WOVEPB1\\0"
+    8   uint32    header length in bytes
+    12  uint32    reserved (0)
+    16  header    UTF-8 JSON, space padded to an 8-byte boundary
+    ... columns   one packed array per entry in ``header["columns"]``
+    ... strings   ``uint32`` offsets (count + 1) followed by the UTF-8 blob
+
+The header carries the same ``version``/``units``/``metadata``/``defaults``/
+``bounds``/``machine_profile`` members as the planner JSON, plus ``count``,
+the ``kind_names`` of the ``kinds`` column, and the byte ``offset`` and
+``dtype`` of each column and the string table, so a
+reader can map every column directly (``memoryview.cast`` in Python, typed
+array views over an ``ArrayBuffer`` in the viewer) without per-record parsing.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from itertools import repeat
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Mapping, Tuple
+
+from .encoder import tension_readings
+from .events import EventKind, PlannerEventStore
+
+MAGIC = b"WOVEPB1\0"
+_PREFIX = struct.Struct("<8sII")
+_ALIGNMENT = 8
+
+# Column name, array typecode, header dtype.
+_COLUMNS: Tuple[Tuple[str, str, str], ...] = (
+    ("x_mm", "d", "float64"),
+    ("y_mm", "d", "float64"),
+    ("z_mm", "d", "float64"),
+    ("extrusion_mm", "d", "float64"),
+    ("tension_sensor_reading", "f", "float32"),
+    ("command_ids", "I", "uint32"),
+    ("comment_ids", "i", "int32"),
+    ("line_numbers", "I", "uint32"),
+    ("row_numbers", "I", "uint32"),
+    ("stitch_ordinals", "I", "uint32"),
+    ("durations_s", "d", "float64"),
+    ("kinds", "B", "uint8"),
+)
+_TYPECODES = {dtype: typecode for _, typecode, dtype in _COLUMNS}
+
+
+def _padding(length: int) -> int:
+    return -length % _ALIGNMENT
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_planner_binary(
+    handle: BinaryIO,
+    head: Mapping[str, object],
+    store: PlannerEventStore,
+    bounds: Mapping[str, object],
+    tail: Mapping[str, object],
+    *,
+    reading: Callable[[EventKind], float],
+) -> None:
+    """Write ``store`` and the planner header members to ``handle``."""
+
+    strings = store.render_comments().strings
+    tensions = array("f", tension_readings(store, reading))
+    encoded = [text.encode("utf-8") for text in strings]
+    offsets = array("I", [0])
+    for blob in encoded:
+        offsets.append(offsets[-1] + len(blob))
+    sections: List[Tuple[str, str, bytes]] = []
+    for name, typecode, dtype in _COLUMNS:
+        values = tensions if name == "tension_sensor_reading" else getattr(store, name)
+        sections.append((name, dtype, _little_endian(array(typecode, values))))
+    sections.append(("string_offsets", "uint32", _little_endian(offsets)))
+    sections.append(("string_data", "utf8", b"".join(encoded)))
+
+    def header_bytes(start: int) -> bytes:
+        layout: List[Dict[str, object]] = []
+        position = start
+        for name, dtype, data in sections:
+            layout.append({"name": name, "dtype": dtype, "offset": position})
+            position += len(data) + _padding(len(data))
+        header: Dict[str, object] = dict(head)
+        header["bounds"] = bounds
+        header.update(tail)
+        header["count"] = len(store)
+        header["string_count"] = len(strings)
+        header["kind_names"] = [kind.label for kind in EventKind]
+        header["columns"] = layout
+        text = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        return text + b" " * _padding(_PREFIX.size + len(text))
+
+    # Column offsets depend on the header length, which depends on the offsets'
+    # digits; iterate until the length settles (at most a couple of passes).
+    header = header_bytes(_PREFIX.size)
+    while True:
+        candidate = header_bytes(_PREFIX.size + len(header))
+        if len(candidate) == len(header):
+            header = candidate
+            break
+        header = candidate
+    handle.write(_PREFIX.pack(MAGIC, len(header), 0))
+    handle.write(header)
+    for _, _, data in sections:
+        handle.write(data)
+        handle.write(b"\0" * _padding(len(data)))
+
+
+class PlannerBinary:
+    """Read a ``planner-bin`` export through a memory map.
+
+    Columns are returned as zero-copy :class:`memoryview` objects over the
+    mapped file, so opening even a very large export costs only the header
+    parse. Use as a context manager (or call :meth:`close`) to release the
+    mapping once the views are no longer needed.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        magic, header_length, _ = _PREFIX.unpack_from(self._view)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a planner-bin export")
+        start = _PREFIX.size
+        end = start + header_length
+        self.header: Dict[str, Any] = json.loads(bytes(self._view[start:end]))
+        self._layout = {entry["name"]: entry for entry in self.header["columns"]}
+        self._strings: List[str] | None = None
+
+    def __enter__(self) -> "PlannerBinary":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return int(self.header["count"])
+
+    def close(self) -> None:
+        """Release the memory map."""
+
+        self._view.release()
+        self._map.close()
+
+    def column(self, name: str) -> memoryview:
+        """Return the named column as a typed view over the mapped file.
+
+        Release returned views before calling :meth:`close`.
+        """
+
+        typecode, raw = self._raw_column(name)
+        if sys.byteorder == "big":  # pragma: no cover - little-endian hosts
+            return memoryview(self._native(typecode, raw))
+        return raw.cast(typecode)
+
+    @property
+    def strings(self) -> List[str]:
+        """Return the decoded command/comment string table."""
+
+        if self._strings is None:
+            count = int(self.header["string_count"])
+            start = self._layout["string_offsets"]["offset"]
+            end = start + 4 * (count + 1)
+            offsets = self._native("I", self._view[start:end])
+            start = self._layout["string_data"]["offset"]
+            end = start + offsets[-1]
+            blob = bytes(self._view[start:end])
+            self._strings = [
+                blob[begin:finish].decode("utf-8")
+                for begin, finish in zip(offsets, offsets[1:])
+            ]
+        return self._strings
+
+    def to_store(self) -> PlannerEventStore:
+        """Copy the events into a :class:`PlannerEventStore`."""
+
+        store = PlannerEventStore()
+        store.strings = list(self.strings)
+        store._string_ids = {text: index for index, text in enumerate(store.strings)}
+        for name, _, _ in _COLUMNS:
+            if name != "tension_sensor_reading":
+                typecode, raw = self._raw_column(name)
+                getattr(store, name).extend(self._native(typecode, raw))
+        store.comment_args.extend(repeat(0, len(store)))
+        return store
+
+    def _raw_column(self, name: str) -> Tuple[str, memoryview]:
+        entry = self._layout[name]
+        typecode = _TYPECODES[entry["dtype"]]
+        start = entry["offset"]
+        end = start + len(self) * array(typecode).itemsize
+        return typecode, self._view[start:end]
+
+    @staticmethod
+    def _native(typecode: str, raw: memoryview) -> array:
+        values = array(typecode)
+        values.frombytes(raw)
+        if sys.byteorder == "big":  # pragma: no cover - little-endian hosts
+            values.byteswap()
+        return values
+
+
+__all__ = ["MAGIC", "PlannerBinary", "write_planner_binary"]
@@ -0,0 +1,139 @@
+"""Content-addressed on-disk cache of CLI output (``--cache-dir``).
+
+Each entry is a finished output file named after a SHA-256 digest of
+everything that determines its bytes: the pattern source, the machine
+profile file, the output options, the translation constants (including
+``STITCH_PROFILES``), and the translator's own source code, which stands in
+for a release version so that any change to the code invalidates old
+entries. Entries are written to a temporary name and renamed into place, so
+concurrent runs never see partial files. Reading an entry refreshes its
+modification time, and after each store the oldest entries are removed
+until the directory fits its size budget.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import sys
+from contextlib import suppress
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable
+
+_KEY_SCHEMA = b"wove-pattern-cache-1"
+_TEMPORARY_PREFIX = "."
+
+
+@lru_cache(maxsize=1)
+def code_fingerprint() -> str:
+    """Return a digest of the pattern CLI and machine profile sources."""
+
+    package = Path(__file__).resolve().parent
+    sources = sorted(package.glob("*.py"))
+    sources.append(package.parent / "machine_profile.py")
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(source.name.encode("utf-8"))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def cache_key(parts: Iterable[bytes | str]) -> str:
+    """Return the entry name for ``parts`` (length-prefixed, then hashed)."""
+
+    digest = hashlib.sha256(_KEY_SCHEMA)
+    for part in parts:
+        data = part.encode("utf-8") if isinstance(part, str) else part
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class OutputCache:
+    """A directory of cached outputs bounded to ``max_bytes`` in total."""
+
+    def __init__(self, directory: Path, *, max_bytes: int) -> None:
+        if max_bytes < 1:
+            raise ValueError("Cache size must be positive")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, key: str, suffix: str = "") -> Path:
+        """Return where the entry ``key`` lives; ``suffix`` selects compression."""
+
+        return self.directory / f"{key}{suffix}"
+
+    def lookup(self, key: str, suffix: str = "") -> Path | None:
+        """Return the entry for ``key`` and mark it recently used, if present."""
+
+        path = self.path_for(key, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def store(self, key: str, suffix: str, write: Callable[[Path], None]) -> Path:
+        """Create the entry for ``key`` by calling ``write`` with a temporary path.
+
+        The file only appears under its final name once ``write`` returns; on
+        failure the temporary file is removed and the error propagates.
+        """
+
+        path = self.path_for(key, suffix)
+        temporary = self.directory / (
+            f"{_TEMPORARY_PREFIX}{key}.{os.getpid()}-{os.urandom(8).hex()}.tmp{suffix}"
+        )
+        try:
+            write(temporary)
+            os.replace(temporary, path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                temporary.unlink()
+            raise
+        return path
+
+    def evict(self, *, keep: Path | None = None) -> None:
+        """Delete least recently used entries until the cache fits its budget."""
+
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(_TEMPORARY_PREFIX) or not entry.is_file():
+                continue
+            with suppress(FileNotFoundError):
+                status = entry.stat()
+                entries.append((status.st_mtime_ns, status.st_size, entry.path))
+                total += status.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and Path(path) == keep:
+                continue
+            with suppress(FileNotFoundError):
+                os.unlink(path)
+            total -= size
+
+
+def deliver(entry: Path, output_path: Path | None) -> None:
+    """Copy a cached entry to ``output_path``, or stream it to stdout."""
+
+    if output_path is not None:
+        shutil.copyfile(entry, output_path)
+        return
+    sys.stdout.flush()
+    with entry.open("rb") as handle:
+        shutil.copyfileobj(handle, sys.stdout.buffer)
+    sys.stdout.buffer.flush()
+
+
+__all__ = [
+    "OutputCache",
+    "cache_key",
+    "code_fingerprint",
+    "deliver",
+]
@@ -0,0 +1,107 @@
+"""Chunked planner export: a manifest plus numbered planner files.
+
+``--chunk-commands N`` splits a planner export into files of at most ``N``
+commands each. Every chunk is a complete planner document (same ``version``,
+``defaults``, and ``machine_profile`` as an unchunked export, with its own
+``bounds``), so it loads on its own. The manifest written to ``--output``
+carries the shared members, the global ``bounds``, the total ``count``, and a
+``chunks`` list giving each file's name, first command index, command count,
+and bounds, letting a consumer render chunk ``k`` while fetching ``k + 1``.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping
+
+from .encoder import iter_planner_columns_json, iter_planner_json, store_bounds
+from .events import EventKind, PlannerEventStore
+from .writers import COMPRESSED_SUFFIXES, DEFAULT_BUFFER_SIZE, open_output
+
+
+def chunk_path(manifest_path: Path, index: int) -> Path:
+    """Return the path of chunk ``index`` written next to ``manifest_path``.
+
+    ``blanket.planner.json`` becomes ``blanket.planner.chunk-00000.json``; a
+    trailing ``.gz``/``.xz`` suffix is kept so chunks are compressed too.
+    """
+
+    name = manifest_path.name
+    compressed = manifest_path.suffix
+    if compressed.lower() not in COMPRESSED_SUFFIXES:
+        compressed = ""
+    base = name[: len(name) - len(compressed)]
+    stem, dot, extension = base.rpartition(".")
+    if not dot or not stem:
+        stem, extension = base, ""
+    label = f"{stem}.chunk-{index:05d}"
+    if extension:
+        label = f"{label}.{extension}"
+    return manifest_path.with_name(label + compressed)
+
+
+def write_planner_chunks(
+    manifest_path: Path,
+    head: Mapping[str, object],
+    store: PlannerEventStore,
+    tail: Mapping[str, object],
+    *,
+    chunk_commands: int,
+    reading: Callable[[EventKind], float],
+    compact: bool = False,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    seek_index: Mapping[str, object] | None = None,
+) -> Dict[str, object]:
+    """Write ``store`` as numbered chunk files plus a manifest.
+
+    Chunks use the planner layout named by ``head["version"]``. A job-wide
+    ``seek_index`` goes into the manifest only. Returns the manifest that was
+    written to ``manifest_path``.
+    """
+
+    if chunk_commands < 1:
+        raise ValueError("Chunks must hold at least one command")
+    if not len(store):
+        raise ValueError("Planner format requires at least one command")
+    entries: List[Dict[str, object]] = []
+    for index, start in enumerate(range(0, len(store), chunk_commands)):
+        chunk = store.section(start, start + chunk_commands)
+        bounds = store_bounds(chunk)
+        if head.get("version") == 2:
+            fragments = iter_planner_columns_json(
+                head, chunk, tail, reading=reading, bounds=bounds, compact=compact
+            )
+        else:
+            fragments = iter_planner_json(
+                head,
+                [chunk],
+                tail,
+                reading=reading,
+                bounds=bounds,
+                compact=compact,
+                first_index=start,
+            )
+        path = chunk_path(manifest_path, index)
+        with open_output(path, buffer_size=buffer_size) as handle:
+            handle.writelines(fragments)
+        entries.append(
+            {"path": path.name, "start": start, "count": len(chunk), "bounds": bounds}
+        )
+
+    manifest: Dict[str, object] = dict(head)
+    manifest["bounds"] = store_bounds(store)
+    manifest["count"] = len(store)
+    manifest["chunks"] = entries
+    if seek_index is not None:
+        manifest["seek_index"] = seek_index
+    manifest.update(tail)
+    with open_output(manifest_path, buffer_size=buffer_size) as handle:
+        if compact:
+            handle.write(json.dumps(manifest, separators=(",", ":")))
+        else:
+            handle.write(json.dumps(manifest, indent=2))
+    return manifest
+
+
+__all__ = ["chunk_path", "write_planner_chunks"]
@@ -0,0 +1,335 @@
+"""Incremental JSON encoding for the ``json`` and ``planner`` output formats.
+
+The encoders yield text fragments instead of building the whole document, so
+callers can write (and flush) as they go. With the default indentation the
+output is byte-for-byte what ``json.dumps(payload, indent=2)`` produces for the
+equivalent payload; ``compact=True`` matches ``separators=(",", ":")``.
+Command entries are rendered from templates rather than through the
+pure-Python pretty-printer, and each distinct command or comment string in a
+:class:`~wove.pattern_cli.events.PlannerEventStore` is escaped only once.
+Version 1 commands are yielded at most :data:`ENTRIES_PER_FRAGMENT` at a time
+and templated stitch comments are rendered as they are written, so memory
+does not grow with the size of the document.
+
+Planner version 2 (:func:`iter_planner_columns_json`) stores the commands as
+parallel columns; indented output keeps each column on a single line so the
+layout stays readable without one line per number.
+"""
+
+from __future__ import annotations
+
+import json
+from itertools import islice
+from json.encoder import encode_basestring_ascii
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Tuple,
+)
+
+from .events import EventKind, PlannerEventStore
+
+if TYPE_CHECKING:
+    from . import GCodeLine
+
+Bounds = Dict[str, Dict[str, float]]
+BOUNDED_COLUMNS = ("x_mm", "y_mm", "z_mm", "extrusion_mm")
+# Planner layout written when a caller does not choose one; ``--stream`` can
+# only write version 1.
+DEFAULT_PLANNER_VERSION = 2
+# Planner command entries joined into each yielded fragment.
+ENTRIES_PER_FRAGMENT = 256
+
+
+def _dump(value: object, compact: bool, depth: int) -> str:
+    if compact:
+        return json.dumps(value, separators=(",", ":"))
+    return json.dumps(value, indent=2).replace("\n", "\n" + "  " * depth)
+
+
+def iter_commands_json(
+    lines: Iterable[GCodeLine], *, compact: bool = False
+) -> Iterator[str]:
+    """Yield the ``json`` format for ``lines``, one fragment per command.
+
+    The opening bracket travels with the first command so every fragment
+    after the first corresponds to exactly one more command.
+    """
+
+    opener = "["
+    for line in lines:
+        command = encode_basestring_ascii(line.command)
+        if line.comment:
+            comment = encode_basestring_ascii(line.comment)
+            if compact:
+                entry = f'{{"command":{command},"comment":{comment}}}'
+            else:
+                entry = (
+                    f'\n  {{\n    "command": {command},\n'
+                    f'    "comment": {comment}\n  }}'
+                )
+        elif compact:
+            entry = f'{{"command":{command}}}'
+        else:
+            entry = f'\n  {{\n    "command": {command}\n  }}'
+        yield opener + entry
+        opener = ","
+    if opener == "[":
+        yield "[]"
+    else:
+        yield "]" if compact else "\n]"
+
+
+def store_bounds(store: PlannerEventStore) -> Bounds:
+    """Return the planner ``bounds`` block for the events in ``store``."""
+
+    return {
+        name: {"min": min(column), "max": max(column)}
+        for name, column in zip(
+            BOUNDED_COLUMNS,
+            (store.x_mm, store.y_mm, store.z_mm, store.extrusion_mm),
+        )
+    }
+
+
+def _merge_bounds(bounds: Bounds | None, chunk: Bounds) -> Bounds:
+    if bounds is None:
+        return chunk
+    return {
+        name: {
+            "min": min(bounds[name]["min"], chunk[name]["min"]),
+            "max": max(bounds[name]["max"], chunk[name]["max"]),
+        }
+        for name in BOUNDED_COLUMNS
+    }
+
+
+def tension_readings(
+    store: PlannerEventStore, reading: Callable[[EventKind], float]
+) -> List[float]:
+    """Return the tension sensor reading for every event in ``store``.
+
+    ``reading`` is evaluated once per :class:`EventKind` rather than per event.
+    """
+
+    per_kind = [reading(kind) for kind in EventKind]
+    return [per_kind[kind] for kind in store.kinds]
+
+
+def _iter_command_entries(
+    store: PlannerEventStore,
+    first_index: int,
+    reading: Callable[[EventKind], float],
+    compact: bool,
+) -> Iterator[str]:
+    # Templated comments are rendered per entry rather than interned, so
+    # encoding a store does not grow its string table by one per stitch.
+    encoded = list(map(encode_basestring_ascii, store.strings))
+    templates = store.comment_templates
+    labels = [json.dumps(kind.label) for kind in EventKind]
+    tensions = [repr(reading(kind)) for kind in EventKind]
+    comment_key = ',"comment":' if compact else ',\n      "comment": '
+    suffixes: Dict[int, str] = {-1: ""}
+    rows = zip(
+        store.command_ids,
+        store.comment_ids,
+        store.comment_args,
+        store.kinds,
+        store.x_mm,
+        store.y_mm,
+        store.z_mm,
+        store.extrusion_mm,
+        store.durations_s,
+    )
+    for index, (
+        command_id,
+        comment_id,
+        argument,
+        kind,
+        x_mm,
+        y_mm,
+        z_mm,
+        e_mm,
+        duration,
+    ) in enumerate(rows, start=first_index):
+        if comment_id < -1:
+            text = templates[-2 - comment_id] % argument
+            suffix = comment_key + encode_basestring_ascii(text)
+        else:
+            suffix = suffixes.get(comment_id)
+            if suffix is None:
+                suffix = comment_key + encoded[comment_id]
+                suffixes[comment_id] = suffix
+        command = encoded[command_id]
+        label = labels[kind]
+        tension = tensions[kind]
+        if compact:
+            yield (
+                f'{{"index":{index},"command":{command},"kind":{label},"state":{{'
+                f'"x_mm":{x_mm!r},"y_mm":{y_mm!r},"z_mm":{z_mm!r},'
+                f'"extrusion_mm":{e_mm!r},"duration_s":{duration!r},'
+                f'"tension_sensor_reading":{tension}'
+                f"}}{suffix}}}"
+            )
+        else:
+            yield (
+                f'\n    {{\n      "index": {index},\n      "command": {command},'
+                f'\n      "kind": {label},'
+                f'\n      "state": {{\n        "x_mm": {x_mm!r},'
+                f'\n        "y_mm": {y_mm!r},\n        "z_mm": {z_mm!r},'
+                f'\n        "extrusion_mm": {e_mm!r},'
+                f'\n        "duration_s": {duration!r},'
+                f'\n        "tension_sensor_reading": {tension}'
+                f"\n      }}{suffix}\n    }}"
+            )
+
+
+def iter_planner_json(
+    head: Mapping[str, object],
+    chunks: Iterable[PlannerEventStore],
+    tail: Mapping[str, object] | Callable[[], Mapping[str, object]],
+    *,
+    reading: Callable[[EventKind], float],
+    bounds: Bounds | None = None,
+    compact: bool = False,
+    first_index: int = 0,
+) -> Iterator[str]:
+    """Yield a planner document whose commands come from ``chunks``.
+
+    ``head`` members are written first, followed by ``bounds``, the
+    ``commands`` array (at most :data:`ENTRIES_PER_FRAGMENT` commands per
+    fragment, so a large chunk is never encoded all at once), ``feed_indices``
+    (the ``index`` values of the yarn-feed commands) and then ``tail``.
+    When ``bounds`` is ``None`` it is accumulated while the commands are
+    written and emitted after them instead, so a single pass over streamed
+    events suffices. ``tail`` may be a callable, invoked once the commands
+    are written, for members computed from the streamed events. ``reading``
+    maps an event kind to its tension reading, and command ``index`` values
+    count up from ``first_index``.
+    """
+
+    newline = "" if compact else "\n  "
+    key_separator = ":" if compact else ": "
+
+    def key_prefix(key: str, first: bool = False) -> str:
+        return f"{newline if first else ',' + newline}{json.dumps(key)}{key_separator}"
+
+    def member(key: str, value: object, first: bool = False) -> str:
+        return key_prefix(key, first) + _dump(value, compact, 1)
+
+    parts: List[str] = []
+    for key, value in head.items():
+        parts.append(member(key, value, not parts))
+    if bounds is not None:
+        parts.append(member("bounds", bounds, not parts))
+    parts.append(key_prefix("commands", not parts) + "[")
+    yield "{" + "".join(parts)
+
+    written = 0
+    accumulated: Bounds | None = None
+    feeds: List[int] = []
+    for chunk in chunks:
+        if not len(chunk):
+            continue
+        if bounds is None:
+            accumulated = _merge_bounds(accumulated, store_bounds(chunk))
+        feeds.extend(
+            first_index + written + index for index in chunk.indices_of(EventKind.FEED)
+        )
+        entries = _iter_command_entries(chunk, first_index + written, reading, compact)
+        while batch := list(islice(entries, ENTRIES_PER_FRAGMENT)):
+            yield ("," if written else "") + ",".join(batch)
+            written += len(batch)
+
+    closing = ["]" if compact or not written else "\n  ]"]
+    closing.append(member("feed_indices", feeds))
+    if bounds is None:
+        if accumulated is None:
+            raise ValueError("Planner format requires at least one command")
+        closing.append(member("bounds", accumulated))
+    if callable(tail):
+        tail = tail()
+    for key, value in tail.items():
+        closing.append(member(key, value))
+    closing.append("}" if compact else "\n}")
+    yield "".join(closing)
+
+
+def _json_array(values: Iterable[object], compact: bool) -> str:
+    separator = "," if compact else ", "
+    return "[" + separator.join(map(repr, values)) + "]"
+
+
+def iter_planner_columns_json(
+    head: Mapping[str, object],
+    store: PlannerEventStore,
+    tail: Mapping[str, object],
+    *,
+    reading: Callable[[EventKind], float],
+    bounds: Bounds,
+    compact: bool = False,
+) -> Iterator[str]:
+    """Yield a version 2 planner document for ``store``.
+
+    ``strings`` holds each distinct command and comment once; the
+    ``commands`` object stores ``command_ids``/``comment_ids`` indexes into
+    it (``-1`` for no comment) alongside one array per state field. ``kinds``
+    holds :class:`EventKind` values, named in order by ``kind_names``.
+    """
+
+    newline = "" if compact else "\n  "
+    key_separator = ":" if compact else ": "
+
+    def member(key: str, value: str, indent: str = newline) -> str:
+        return f"{indent}{json.dumps(key)}{key_separator}{value}"
+
+    parts = [member(key, _dump(value, compact, 1)) for key, value in head.items()]
+    parts.append(member("bounds", _dump(bounds, compact, 1)))
+    separator = "," if compact else ", "
+    store.render_comments()
+    strings = separator.join(map(encode_basestring_ascii, store.strings))
+    parts.append(member("strings", f"[{strings}]"))
+    names = separator.join(json.dumps(kind.label) for kind in EventKind)
+    parts.append(member("kind_names", f"[{names}]"))
+    yield "{" + ",".join(parts) + "," + member("commands", "{")
+
+    inner = "" if compact else "\n    "
+    columns: List[Tuple[str, Iterable[object]]] = [
+        ("command_ids", store.command_ids),
+        ("comment_ids", store.comment_ids),
+        ("kinds", store.kinds),
+        ("x_mm", store.x_mm),
+        ("y_mm", store.y_mm),
+        ("z_mm", store.z_mm),
+        ("extrusion_mm", store.extrusion_mm),
+        ("duration_s", store.durations_s),
+        ("tension_sensor_reading", tension_readings(store, reading)),
+    ]
+    yield member("count", str(len(store)), inner)
+    for name, values in columns:
+        yield "," + member(name, _json_array(values, compact), inner)
+
+    closing = ["}" if compact else "\n  }"]
+    feeds = _json_array(store.indices_of(EventKind.FEED), compact)
+    closing.append("," + member("feed_indices", feeds))
+    for key, value in tail.items():
+        closing.append("," + member(key, _dump(value, compact, 1)))
+    closing.append("}" if compact else "\n}")
+    yield "".join(closing)
+
+
+__all__ = [
+    "BOUNDED_COLUMNS",
+    "DEFAULT_PLANNER_VERSION",
+    "ENTRIES_PER_FRAGMENT",
+    "iter_commands_json",
+    "iter_planner_columns_json",
+    "iter_planner_json",
+    "store_bounds",
+    "tension_readings",
+]
@@ -0,0 +1,467 @@
+"""Planner event storage shared by the pattern translator and its writers."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from enum import IntEnum
+from itertools import islice, repeat
+from typing import Dict, Iterable, Iterator, List, Tuple, overload
+
+# Columns copied verbatim (no string-table remapping) between stores.
+_VALUE_COLUMNS = (
+    "x_mm",
+    "y_mm",
+    "z_mm",
+    "extrusion_mm",
+    "line_numbers",
+    "row_numbers",
+    "stitch_ordinals",
+    "durations_s",
+    "kinds",
+    "comment_args",
+)
+
+
+class EventKind(IntEnum):
+    """What a planner event does, so consumers need not parse its comment."""
+
+    SETUP = 0
+    PLUNGE = 1
+    FEED = 2
+    RAISE = 3
+    ADVANCE = 4
+    REPOSITION = 5
+    TURN = 6
+    PAUSE = 7
+
+    @property
+    def label(self) -> str:
+        """Return the lowercase name used in planner exports."""
+
+        return self.name.lower()
+
+
+# Kinds are numbered from zero, so a value doubles as a position here.
+_KINDS = tuple(EventKind)
+
+
+@dataclass(frozen=True)
+class PlannerEvent:
+    """State snapshot for planner integrations after emitting a command."""
+
+    command: str
+    comment: str | None
+    x_mm: float
+    y_mm: float
+    z_mm: float
+    extrusion_mm: float
+    kind: EventKind = EventKind.SETUP
+
+
+class PlannerEventStore(Sequence):
+    """Columnar store of planner events.
+
+    Positions are kept in ``array('d')`` columns and command/comment strings
+    are interned into a shared table referenced by integer ids, so each event
+    costs a handful of machine words instead of a dataclass instance. Indexing
+    or iterating the store yields :class:`PlannerEvent` row views that are
+    built on demand, keeping existing per-event callers working unchanged.
+    The pattern source line that produced each event is kept alongside in
+    ``line_numbers`` (``0`` for the generated preamble). ``row_numbers``
+    counts the TURNs made so far, ``stitch_ordinals`` the stitches started so
+    far (so the four commands of stitch ``n`` carry ``n``), and
+    ``durations_s`` the estimated seconds each command takes at its feed rate.
+    ``kinds`` holds each event's :class:`EventKind`.
+
+    Comments that differ only by a number, such as the stitch labels, are
+    kept lazily: ``comment_ids`` below ``-1`` name an entry of
+    ``comment_templates`` (id ``-2`` is template ``0``) and ``comment_args``
+    holds the number to substitute for its ``%d``. The text is rendered only
+    when asked for; :meth:`render_comments` interns it so every id points at
+    ``strings``.
+    """
+
+    def __init__(self) -> None:
+        self.x_mm = array("d")
+        self.y_mm = array("d")
+        self.z_mm = array("d")
+        self.extrusion_mm = array("d")
+        self.command_ids = array("I")
+        self.comment_ids = array("i")
+        self.line_numbers = array("I")
+        self.row_numbers = array("I")
+        self.stitch_ordinals = array("I")
+        self.durations_s = array("d")
+        self.kinds = array("B")
+        self.comment_args = array("I")
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self.comment_templates: List[str] = []
+        self._template_ids: Dict[str, int] = {}
+
+    @classmethod
+    def from_events(cls, events: Iterable[PlannerEvent]) -> "PlannerEventStore":
+        """Return a store holding ``events`` (returned as-is if already one)."""
+
+        if isinstance(events, cls):
+            return events
+        store = cls()
+        for event in events:
+            store.append(
+                event.command,
+                event.comment,
+                event.x_mm,
+                event.y_mm,
+                event.z_mm,
+                event.extrusion_mm,
+                kind=event.kind,
+            )
+        return store
+
+    def intern(self, text: str) -> int:
+        """Return the string-table id for ``text``, adding it when new."""
+
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            self._string_ids[text] = string_id
+            self.strings.append(text)
+        return string_id
+
+    def append(
+        self,
+        command: str,
+        comment: str | None,
+        x_mm: float,
+        y_mm: float,
+        z_mm: float,
+        extrusion_mm: float,
+        line_number: int = 0,
+        row_number: int = 0,
+        stitch_ordinal: int = 0,
+        duration_s: float = 0.0,
+        kind: EventKind = EventKind.SETUP,
+    ) -> Tuple[str, str | None]:
+        """Record an event and return its interned command and comment."""
+
+        command_id = self.intern(command)
+        self.command_ids.append(command_id)
+        if comment is None:
+            self.comment_ids.append(-1)
+        else:
+            comment_id = self.intern(comment)
+            self.comment_ids.append(comment_id)
+            comment = self.strings[comment_id]
+        self.x_mm.append(x_mm)
+        self.y_mm.append(y_mm)
+        self.z_mm.append(z_mm)
+        self.extrusion_mm.append(extrusion_mm)
+        self.line_numbers.append(line_number)
+        self.row_numbers.append(row_number)
+        self.stitch_ordinals.append(stitch_ordinal)
+        self.durations_s.append(duration_s)
+        self.kinds.append(kind)
+        self.comment_args.append(0)
+        return self.strings[command_id], comment
+
+    def extend(
+        self,
+        commands: Iterable[str],
+        comments: Iterable[str | None],
+        x_mm: Iterable[float],
+        y_mm: Iterable[float],
+        z_mm: Iterable[float],
+        extrusion_mm: Iterable[float],
+        line_number: int = 0,
+        row_numbers: Iterable[int] | int = 0,
+        stitch_ordinals: Iterable[int] | None = None,
+        durations_s: Iterable[float] | None = None,
+        kinds: Iterable[int] | None = None,
+        comment_args: Iterable[int] | None = None,
+    ) -> None:
+        """Record a batch of events given as parallel column iterables.
+
+        Every event in the batch is attributed to source line ``line_number``.
+        ``row_numbers`` may be a single row shared by the whole batch;
+        ``stitch_ordinals`` and ``durations_s`` default to zeros and ``kinds``
+        to :attr:`EventKind.SETUP`. With ``comment_args``, each comment is a
+        ``%d`` template for its argument and is stored unrendered.
+        """
+
+        string_ids = self._string_ids
+        known = len(string_ids)
+        setdefault = string_ids.setdefault
+        command_ids = [setdefault(command, len(string_ids)) for command in commands]
+        self.command_ids.extend(command_ids)
+        count = len(command_ids)
+        self.line_numbers.extend(repeat(line_number, count))
+        if isinstance(row_numbers, int):
+            self.row_numbers.extend(repeat(row_numbers, count))
+        else:
+            self.row_numbers.extend(row_numbers)
+        self.stitch_ordinals.extend(
+            repeat(0, count) if stitch_ordinals is None else stitch_ordinals
+        )
+        self.durations_s.extend(
+            repeat(0.0, count) if durations_s is None else durations_s
+        )
+        self.kinds.extend(repeat(EventKind.SETUP, count) if kinds is None else kinds)
+        if comment_args is not None:
+            self.comment_ids.extend(map(self._template_id, comments))
+            self.comment_args.extend(comment_args)
+        else:
+            self.comment_ids.extend(
+                [
+                    -1 if comment is None else setdefault(comment, len(string_ids))
+                    for comment in comments
+                ]
+            )
+            self.comment_args.extend(repeat(0, count))
+        added = len(string_ids) - known
+        if added:
+            # Dicts keep insertion order, so the newest keys are the additions.
+            self.strings.extend(reversed(list(islice(reversed(string_ids), added))))
+        self.x_mm.extend(x_mm)
+        self.y_mm.extend(y_mm)
+        self.z_mm.extend(z_mm)
+        self.extrusion_mm.extend(extrusion_mm)
+
+    def _template_id(self, template: str) -> int:
+        template_id = self._template_ids.get(template)
+        if template_id is None:
+            template_id = len(self.comment_templates)
+            self._template_ids[template] = template_id
+            self.comment_templates.append(template)
+        return -2 - template_id
+
+    def render_comments(self) -> "PlannerEventStore":
+        """Intern every templated comment as text and return the store.
+
+        Exporters that write ``comment_ids`` call this first, so the ids they
+        write always index ``strings``.
+        """
+
+        comment_ids = self.comment_ids
+        if not comment_ids or min(comment_ids) >= -1:
+            return self
+        templates = self.comment_templates
+        for index, comment_id in enumerate(comment_ids):
+            if comment_id < -1:
+                text = templates[-2 - comment_id] % self.comment_args[index]
+                comment_ids[index] = self.intern(text)
+        return self
+
+    def tail(self, start: int) -> "PlannerEventStore":
+        """Return a copy of the events from ``start`` onward.
+
+        The copy shares this store's string table, so it can be joined back
+        with :meth:`extend_from` without re-interning.
+        """
+
+        tail = PlannerEventStore()
+        tail.strings = self.strings
+        tail._string_ids = self._string_ids
+        tail.comment_templates = self.comment_templates
+        tail._template_ids = self._template_ids
+        for name, column in self._columns().items():
+            getattr(tail, name).extend(column[start:])
+        return tail
+
+    def copy(self) -> "PlannerEventStore":
+        """Return an independent copy of the store.
+
+        The copy has its own string table, so rendering its comments leaves
+        this store as it was.
+        """
+
+        store = PlannerEventStore()
+        store.strings = list(self.strings)
+        store._string_ids = dict(self._string_ids)
+        store.comment_templates = list(self.comment_templates)
+        store._template_ids = dict(self._template_ids)
+        for name, column in self._columns().items():
+            getattr(store, name).extend(column)
+        return store
+
+    def section(self, start: int, stop: int) -> "PlannerEventStore":
+        """Return a copy of the events in ``[start, stop)``.
+
+        Unlike :meth:`tail`, the copy gets its own string table holding only
+        the commands and comments those events use, with templated comments
+        rendered.
+        """
+
+        section = PlannerEventStore()
+        remap: Dict[int, int] = {-1: -1}
+
+        def lookup(string_id: int) -> int:
+            section_id = remap.get(string_id)
+            if section_id is None:
+                section_id = section.intern(self.strings[string_id])
+                remap[string_id] = section_id
+            return section_id
+
+        section.command_ids.extend(map(lookup, self.command_ids[start:stop]))
+        for comment_id, argument in zip(
+            self.comment_ids[start:stop], self.comment_args[start:stop]
+        ):
+            if comment_id < -1:
+                text = self.comment_templates[-2 - comment_id] % argument
+                section.comment_ids.append(section.intern(text))
+            else:
+                section.comment_ids.append(lookup(comment_id))
+        for name in _VALUE_COLUMNS:
+            getattr(section, name).extend(getattr(self, name)[start:stop])
+        return section
+
+    def truncate(self, length: int) -> None:
+        """Drop every event from index ``length`` onward."""
+
+        for column in self._columns().values():
+            del column[length:]
+
+    def extend_from(self, other: "PlannerEventStore", start: int = 0) -> None:
+        """Append the events of ``other`` from index ``start`` onward."""
+
+        if other.strings is not self.strings:
+            # Map the other tables' ids onto ours once. Negative ids index
+            # from the end: the trailing -1 keeps unset comments unset, and
+            # template ids (-2 downwards) land on the reversed templates.
+            remap = [self.intern(text) for text in other.strings]
+            templates = list(map(self._template_id, other.comment_templates))
+            remap.extend(reversed(templates))
+            remap.append(-1)
+            lookup = remap.__getitem__
+            self.command_ids.extend(map(lookup, other.command_ids[start:]))
+            self.comment_ids.extend(map(lookup, other.comment_ids[start:]))
+            for name in _VALUE_COLUMNS:
+                getattr(self, name).extend(getattr(other, name)[start:])
+            return
+        for name, column in self._columns().items():
+            column.extend(getattr(other, name)[start:])
+
+    def _columns(self) -> Dict[str, array]:
+        return {
+            "command_ids": self.command_ids,
+            "comment_ids": self.comment_ids,
+            "x_mm": self.x_mm,
+            "y_mm": self.y_mm,
+            "z_mm": self.z_mm,
+            "extrusion_mm": self.extrusion_mm,
+            "line_numbers": self.line_numbers,
+            "row_numbers": self.row_numbers,
+            "stitch_ordinals": self.stitch_ordinals,
+            "durations_s": self.durations_s,
+            "kinds": self.kinds,
+            "comment_args": self.comment_args,
+        }
+
+    def command_at(self, index: int) -> str:
+        """Return the command string for the event at ``index``."""
+
+        return self.strings[self.command_ids[index]]
+
+    def comment_at(self, index: int) -> str | None:
+        """Return the comment for the event at ``index`` (``None`` if unset)."""
+
+        comment_id = self.comment_ids[index]
+        if comment_id < -1:
+            template = self.comment_templates[-2 - comment_id]
+            return template % self.comment_args[index]
+        if comment_id < 0:
+            return None
+        return self.strings[comment_id]
+
+    def line_at(self, index: int) -> int:
+        """Return the source line of the event at ``index`` (``0`` if none)."""
+
+        return self.line_numbers[index]
+
+    def kind_at(self, index: int) -> EventKind:
+        """Return the :class:`EventKind` of the event at ``index``."""
+
+        return _KINDS[self.kinds[index]]
+
+    def indices_of(self, kind: EventKind) -> List[int]:
+        """Return the indices of every event of ``kind``, in order."""
+
+        return [index for index, value in enumerate(self.kinds) if value == kind]
+
+    def commands(self) -> Iterator[str]:
+        """Yield command strings in event order."""
+
+        strings = self.strings
+        return (strings[command_id] for command_id in self.command_ids)
+
+    def comments(self) -> Iterator[str | None]:
+        """Yield comments in event order (``None`` where unset)."""
+
+        strings = self.strings
+        templates = self.comment_templates
+        return (
+            (
+                strings[comment_id]
+                if comment_id >= 0
+                else (
+                    templates[-2 - comment_id] % argument if comment_id < -1 else None
+                )
+            )
+            for comment_id, argument in zip(self.comment_ids, self.comment_args)
+        )
+
+    def comment_sources(self) -> Iterator[Tuple[str | None, int | None]]:
+        """Yield each comment unrendered, as ``(text, None)`` or a template.
+
+        Templated comments come back as ``(template, argument)``, so callers
+        can pass them on without formatting every one.
+        """
+
+        strings = self.strings
+        templates = self.comment_templates
+        for comment_id, argument in zip(self.comment_ids, self.comment_args):
+            if comment_id >= 0:
+                yield strings[comment_id], None
+            elif comment_id == -1:
+                yield None, None
+            else:
+                yield templates[-2 - comment_id], argument
+
+    def __len__(self) -> int:
+        return len(self.command_ids)
+
+    @overload
+    def __getitem__(self, index: int) -> PlannerEvent: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[PlannerEvent]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(len(self))[index]]
+        return PlannerEvent(
+            command=self.command_at(index),
+            comment=self.comment_at(index),
+            x_mm=self.x_mm[index],
+            y_mm=self.y_mm[index],
+            z_mm=self.z_mm[index],
+            extrusion_mm=self.extrusion_mm[index],
+            kind=self.kind_at(index),
+        )
+
+    def __iter__(self) -> Iterator[PlannerEvent]:
+        rows = zip(
+            self.commands(),
+            self.comments(),
+            self.x_mm,
+            self.y_mm,
+            self.z_mm,
+            self.extrusion_mm,
+            map(_KINDS.__getitem__, self.kinds),
+        )
+        for row in rows:
+            yield PlannerEvent(*row)
+
+
+__all__ = ["EventKind", "PlannerEvent", "PlannerEventStore"]
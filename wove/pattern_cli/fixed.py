@@ -0,0 +1,75 @@
+"""Fixed-point millimetre values for the translator's coordinate core.
+
+The translator tracks X, Y, Z, and extrusion as whole micrometres. Integer
+sums are exact, so a position or extrusion total after millions of stitches
+is the same as one computed in a single step, and the rendered G-code never
+depends on the order floats were added in. Values are converted to float
+millimetres only where the planner store and machine limits need them.
+
+:func:`format_mm` renders micrometres with two decimals exactly as formatting
+the float millimetre value does, so a coordinate parsed from the source is
+written as it always was. Positions such as the safe height, plunge depths, and the X
+stops of a row recur throughout a job, so formatted values are kept in a
+bounded table and most commands skip the arithmetic altogether.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List
+
+UM_PER_MM = 1000
+FORMAT_CACHE_SIZE = 1 << 14
+
+_formatted: Dict[int, str] = {}
+
+
+def to_um(mm: float) -> int:
+    """Return ``mm`` as the nearest whole number of micrometres."""
+
+    return round(mm * UM_PER_MM)
+
+
+def to_mm(um: int) -> float:
+    """Return ``um`` micrometres in millimetres."""
+
+    return um / UM_PER_MM
+
+
+def format_mm(um: int) -> str:
+    """Return ``um`` micrometres as millimetres with two decimals."""
+
+    text = _formatted.get(um)
+    if text is None:
+        text = _render(um)
+        if len(_formatted) < FORMAT_CACHE_SIZE:
+            _formatted[um] = text
+    return text
+
+
+def format_mm_run(values: Iterable[int], *, recurring: bool = True) -> List[str]:
+    """Format a run of values, as :func:`format_mm` does for each one.
+
+    Pass ``recurring=False`` for values that are unlikely to appear again,
+    such as a growing extrusion total, so they do not crowd the table.
+    """
+
+    if not recurring:
+        return list(map(_render, values))
+    lookup = _formatted.get
+    return [lookup(um) or format_mm(um) for um in values]
+
+
+def _render(um: int) -> str:
+    # ``um / UM_PER_MM`` is the float nearest the decimal value, the same one
+    # parsing the source coordinate gives, so ties round as they did before.
+    return f"{um / UM_PER_MM:.2f}"
+
+
+__all__ = [
+    "FORMAT_CACHE_SIZE",
+    "UM_PER_MM",
+    "format_mm",
+    "format_mm_run",
+    "to_mm",
+    "to_um",
+]
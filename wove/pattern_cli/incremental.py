@@ -0,0 +1,244 @@
+"""Re-translate edited patterns from the nearest state checkpoint."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, replace
+from typing import List, Sequence
+
+from ..machine_profile import MachineProfile
+from . import GCodeLine, PatternTranslator, _TranslatorState
+from .events import PlannerEventStore
+
+
+@dataclass(frozen=True)
+class TranslationDiff:
+    """Describe how the emitted commands changed after an update.
+
+    Replacing ``previous[start:start + removed]`` with ``inserted`` turns the
+    previous command list into the new one.
+    """
+
+    start: int
+    removed: int
+    inserted: List[GCodeLine]
+
+    @property
+    def unchanged(self) -> bool:
+        return self.removed == 0 and not self.inserted
+
+
+class IncrementalTranslator:
+    """Keep a translation up to date as its pattern source is edited.
+
+    The translator state (X, Y, Z, extrusion, defined motifs) and the output
+    length are checkpointed before every top-level source line. An update
+    resumes from the last checkpoint before the first changed line and stops
+    as soon as its state matches the previous run at the same point in the
+    unchanged tail, splicing the old output back in instead of regenerating
+    it. If an update raises, the cached run is discarded and the next update
+    translates from scratch.
+    """
+
+    def __init__(self, machine_profile: MachineProfile | None = None) -> None:
+        self._translator = PatternTranslator(machine_profile=machine_profile)
+        self._source: List[str] | None = None
+        self._checkpoint_lines: List[int] = []
+        self._checkpoint_states: List[_TranslatorState] = []
+        self._checkpoint_outputs: List[int] = []
+
+    @property
+    def lines(self) -> List[GCodeLine]:
+        """Return the commands for the most recent source."""
+
+        return list(self._translator._lines)
+
+    @property
+    def planner_events(self) -> PlannerEventStore:
+        """Return planner events for the most recent source."""
+
+        return self._translator.planner_events
+
+    def update(self, source: str) -> TranslationDiff:
+        """Translate ``source`` and return the change in emitted commands."""
+
+        try:
+            return self._update(source.splitlines())
+        except ValueError:
+            self._source = None
+            raise
+
+    # Internal helpers -------------------------------------------------
+
+    def _update(self, new_source: List[str]) -> TranslationDiff:
+        translator = self._translator
+        old_source = self._source
+        if old_source is None:
+            previous_length = len(translator._lines)
+            translator._reset_state()
+            self._checkpoint_lines = []
+            self._checkpoint_states = []
+            self._checkpoint_outputs = []
+            self._run(new_source, 0, None)
+            self._source = new_source
+            return TranslationDiff(0, previous_length, list(translator._lines))
+        if new_source == old_source:
+            return TranslationDiff(len(translator._lines), 0, [])
+
+        prefix = _common_prefix(old_source, new_source)
+        limit = min(len(old_source), len(new_source)) - prefix
+        suffix = _common_prefix(old_source[::-1], new_source[::-1], limit)
+        position = bisect_right(self._checkpoint_lines, prefix) - 1
+        resume_line = self._checkpoint_lines[position]
+        offset = self._checkpoint_outputs[position]
+        translator._restore(self._checkpoint_states[position])
+
+        old_lines = translator._lines[offset:]
+        old_events = translator._planner_events.tail(offset)
+        old_checkpoints = (
+            self._checkpoint_lines[position:],
+            self._checkpoint_states[position:],
+            [output - offset for output in self._checkpoint_outputs[position:]],
+        )
+        del translator._lines[offset:]
+        translator._planner_events.truncate(offset)
+        del self._checkpoint_lines[position:]
+        del self._checkpoint_states[position:]
+        del self._checkpoint_outputs[position:]
+
+        converge = _Convergence(
+            first_line=len(new_source) - suffix,
+            shift=len(new_source) - len(old_source),
+            lines=old_checkpoints[0],
+            states=old_checkpoints[1],
+            outputs=old_checkpoints[2],
+        )
+        matched = self._run(new_source, resume_line, converge)
+        self._source = new_source
+        if matched is None:
+            removed = len(old_lines)
+            inserted = translator._lines[offset:]
+        else:
+            reused_from = converge.outputs[matched]
+            rejoined = converge.states[matched]
+            row_shift = translator._row_number - rejoined.row_number
+            stitch_shift = translator._stitch_count - rejoined.stitch_count
+            inserted = translator._lines[offset:]
+            removed = reused_from
+            new_output = len(translator._lines)
+            translator._lines.extend(old_lines[reused_from:])
+            events = translator._planner_events
+            events.extend_from(old_events, reused_from)
+            if converge.shift:
+                # The reused tail now sits ``shift`` source lines later.
+                line_numbers = events.line_numbers
+                shifted = [line + converge.shift for line in line_numbers[new_output:]]
+                line_numbers[new_output:] = array("I", shifted)
+            for name, delta in (
+                ("row_numbers", row_shift),
+                ("stitch_ordinals", stitch_shift),
+            ):
+                if delta:
+                    # Rows and stitches in the reused tail follow the new counts.
+                    column = getattr(events, name)
+                    column[new_output:] = array(
+                        "I", [value + delta for value in column[new_output:]]
+                    )
+            for line, state, output in zip(
+                converge.lines[matched:],
+                converge.states[matched:],
+                converge.outputs[matched:],
+            ):
+                self._checkpoint_lines.append(line + converge.shift)
+                self._checkpoint_states.append(
+                    replace(
+                        state,
+                        row_number=state.row_number + row_shift,
+                        stitch_count=state.stitch_count + stitch_shift,
+                    )
+                )
+                self._checkpoint_outputs.append(output - reused_from + new_output)
+        return _trimmed_diff(offset, old_lines[:removed], inserted)
+
+    def _run(
+        self,
+        source: Sequence[str],
+        start_line: int,
+        converge: _Convergence | None,
+    ) -> int | None:
+        """Translate ``source`` from ``start_line``.
+
+        Returns the index into ``converge`` where the state matched the
+        previous run, or ``None`` when the whole remainder was translated.
+        """
+
+        translator = self._translator
+        for index in range(start_line, len(source)):
+            if not translator._open_blocks:
+                state = translator._snapshot()
+                if converge is not None:
+                    matched = converge.match(index, state)
+                    if matched is not None:
+                        return matched
+                self._checkpoint(index, state)
+            translator._run_line(source[index], index + 1)
+        translator._finish_source()
+        state = translator._snapshot()
+        if converge is not None:
+            matched = converge.match(len(source), state)
+            if matched is not None:
+                return matched
+        self._checkpoint(len(source), state)
+        return None
+
+    def _checkpoint(self, line: int, state: _TranslatorState) -> None:
+        self._checkpoint_lines.append(line)
+        self._checkpoint_states.append(state)
+        self._checkpoint_outputs.append(len(self._translator._lines))
+
+
+@dataclass(frozen=True)
+class _Convergence:
+    """Checkpoints from the previous run that the new run may rejoin."""
+
+    first_line: int
+    shift: int
+    lines: List[int]
+    states: List[_TranslatorState]
+    outputs: List[int]
+
+    def match(self, line: int, state: _TranslatorState) -> int | None:
+        if line < self.first_line:
+            return None
+        old_line = line - self.shift
+        position = bisect_right(self.lines, old_line) - 1
+        if position < 0 or self.lines[position] != old_line:
+            return None
+        if self.states[position] != state:
+            return None
+        return position
+
+
+def _common_prefix(
+    first: Sequence[object], second: Sequence[object], limit: int | None = None
+) -> int:
+    if limit is None:
+        limit = min(len(first), len(second))
+    count = 0
+    while count < limit and first[count] == second[count]:
+        count += 1
+    return count
+
+
+def _trimmed_diff(
+    start: int, removed: List[GCodeLine], inserted: List[GCodeLine]
+) -> TranslationDiff:
+    head = _common_prefix(removed, inserted)
+    limit = min(len(removed), len(inserted)) - head
+    tail = _common_prefix(removed[::-1], inserted[::-1], limit)
+    end = len(inserted) - tail
+    return TranslationDiff(start + head, len(removed) - head - tail, inserted[head:end])
+
+
+__all__ = ["IncrementalTranslator", "TranslationDiff"]
@@ -0,0 +1,66 @@
+"""Check recorded planner events against machine travel limits in one pass."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+from ..machine_profile import MachineProfile
+from .events import PlannerEvent, PlannerEventStore
+
+CHECKED_AXES = ("X", "Y", "Z")
+
+
+@dataclass(frozen=True)
+class LimitViolation:
+    """The first out-of-range position an axis reaches on one source line."""
+
+    line_number: int
+    axis: str
+    position_mm: float
+    command_index: int
+    message: str
+
+
+def find_limit_violations(
+    events: Iterable[PlannerEvent], machine_profile: MachineProfile
+) -> List[LimitViolation]:
+    """Return every travel-limit violation in ``events``, in command order.
+
+    Each axis column is swept once; columns whose minimum and maximum already
+    fit the profile are skipped without visiting individual events. A source
+    line that leaves the travel range is reported once per axis, at its first
+    offending command. The generated preamble (line ``0``) is not checked,
+    matching the translator.
+    """
+
+    store = PlannerEventStore.from_events(events)
+    limits = machine_profile.travel_limits()
+    line_numbers = store.line_numbers
+    first_offence: Dict[Tuple[int, str], int] = {}
+    for axis, column in zip(CHECKED_AXES, (store.x_mm, store.y_mm, store.z_mm)):
+        if not column:
+            continue
+        if axis not in limits:
+            message = f"Machine profile is missing axis '{axis}'"
+            raise ValueError(message)
+        low, high = limits[axis]
+        if low <= min(column) and max(column) <= high:
+            continue
+        for index, position in enumerate(column):
+            if low <= position <= high or not line_numbers[index]:
+                continue
+            first_offence.setdefault((line_numbers[index], axis), index)
+
+    violations = []
+    for (line_number, axis), index in sorted(
+        first_offence.items(), key=lambda item: (item[1], item[0][1])
+    ):
+        position = getattr(store, f"{axis.lower()}_mm")[index]
+        axis_profile = machine_profile.axes[axis]
+        message = axis_profile.violation_message(position, line_number=line_number)
+        violations.append(LimitViolation(line_number, axis, position, index, message))
+    return violations
+
+
+__all__ = ["CHECKED_AXES", "LimitViolation", "find_limit_violations"]
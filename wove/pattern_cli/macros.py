@@ -0,0 +1,114 @@
+"""Firmware macros for whole stitch runs (``klipper-macros`` subcommand).
+
+With ``--stitch-macros`` the G-code writer replaces the four commands of
+every stitch in a run with a single call such as::
+
+    STITCH TYPE=CHAIN COUNT=40 SPACING=5.00 DEPTH=1.50 FEED=0.50
+
+:func:`klipper_config` renders the matching Klipper ``gcode_macro`` from
+:data:`STITCH_PROFILES` and the translator's heights and feed rates. The
+macro starts from the commanded X and E position, so it follows absolute or
+relative extrusion (``M83``) the same way the expanded commands do, and
+``TYPE`` alone is enough to repeat a profile's stitch. Planner exports are
+unaffected and still list every command.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Mapping, Sequence
+
+from . import (
+    FABRIC_PLANE_Z_MM,
+    PLUNGE_FEED_RATE,
+    SAFE_Z_MM,
+    STITCH_MACRO,
+    STITCH_PROFILES,
+    TRAVEL_FEED_RATE,
+    YARN_FEED_RATE,
+    StitchProfile,
+)
+from .writers import open_output
+
+_KLIPPER_TEMPLATE = """\
+# Generated by `python -m wove.pattern_cli klipper-macros`; regenerate it
+# whenever the stitch profiles change.
+[gcode_macro {macro}]
+description: Plunge, feed, raise, and advance COUNT stitches of TYPE
+variable_safe_z: {safe_z}
+variable_fabric_plane_z: {fabric_plane_z}
+variable_plunge_feed_rate: {plunge_feed_rate}
+variable_yarn_feed_rate: {yarn_feed_rate}
+variable_travel_feed_rate: {travel_feed_rate}
+# TYPE -> [spacing, plunge depth, yarn feed] in millimetres.
+variable_profiles: {profiles}
+gcode:
+  {{% set profile = profiles[params.TYPE|upper] %}}
+  {{% set count = params.COUNT|default(1)|int %}}
+  {{% set spacing = params.SPACING|default(profile[0])|float %}}
+  {{% set depth = params.DEPTH|default(profile[1])|float %}}
+  {{% set feed = params.FEED|default(profile[2])|float %}}
+  {{% set start = printer.gcode_move.gcode_position %}}
+  {{% set absolute_e = printer.gcode_move.absolute_extrude %}}
+  {{% for stitch in range(1, count + 1) %}}
+    G1 Z{{"%.3f" % (fabric_plane_z - depth)}} F{{plunge_feed_rate}}
+    {{% if absolute_e %}}
+      G1 E{{"%.3f" % (start.e + stitch * feed)}} F{{yarn_feed_rate}}
+    {{% else %}}
+      G1 E{{"%.3f" % feed}} F{{yarn_feed_rate}}
+    {{% endif %}}
+    G1 Z{{"%.3f" % safe_z}} F{{plunge_feed_rate}}
+    G0 X{{"%.3f" % (start.x + stitch * spacing)}} F{{travel_feed_rate}}
+  {{% endfor %}}
+"""
+
+
+def klipper_config(
+    profiles: Mapping[str, StitchProfile] = STITCH_PROFILES,
+) -> str:
+    """Return a Klipper config section defining the :data:`STITCH_MACRO`."""
+
+    table = {
+        name: [profile.spacing_mm, profile.plunge_depth_mm, profile.yarn_feed_mm]
+        for name, profile in profiles.items()
+    }
+    return _KLIPPER_TEMPLATE.format(
+        macro=STITCH_MACRO,
+        safe_z=SAFE_Z_MM,
+        fabric_plane_z=FABRIC_PLANE_Z_MM,
+        plunge_feed_rate=PLUNGE_FEED_RATE,
+        yarn_feed_rate=YARN_FEED_RATE,
+        travel_feed_rate=TRAVEL_FEED_RATE,
+        profiles=json.dumps(table),
+    )
+
+
+def build_macros_parser() -> argparse.ArgumentParser:
+    """Return the parser for ``python -m wove.pattern_cli klipper-macros``."""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m wove.pattern_cli klipper-macros",
+        description=(
+            f"Write the Klipper {STITCH_MACRO} macro that --stitch-macros "
+            "output calls."
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        help="Config file to write (defaults to stdout).",
+    )
+    return parser
+
+
+def macros_main(argv: Sequence[str] | None = None) -> int:
+    args = build_macros_parser().parse_args(argv)
+    with open_output(args.output) as handle:
+        handle.write(klipper_config())
+    return 0
+
+
+__all__ = ["build_macros_parser", "klipper_config", "macros_main"]
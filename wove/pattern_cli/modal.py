@@ -0,0 +1,124 @@
+"""Modal compaction of translated G-code for bandwidth-limited hosts.
+
+The translator writes every move in full: each stitch advance repeats the
+row's ``Y`` and every command restates its feed rate. Firmware keeps axis
+positions and the feed rate between commands (they are *modal*), so
+:class:`ModalCompactor` drops any word that would not change them. A move
+left with nothing to do is dropped entirely. The ``G0``/``G1`` word itself is
+always kept, since common firmware does not accept moves without one.
+
+With relative extrusion the compactor adds ``M83`` after ``G90`` and rewrites
+each absolute ``E`` total as the distance fed by that command, so values stay
+a few characters long however much yarn a job uses. Deltas are taken between
+the printed totals in whole micrometres, so they add back up to exactly the
+totals the uncompacted output names.
+
+``STITCH`` macro calls (see :mod:`wove.pattern_cli.macros`) move X and Z, set
+the feed rate, and feed ``COUNT`` times ``FEED`` of yarn; the compactor
+accounts for that feed and writes X, Z, and F again on the next move.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List
+
+from . import STITCH_MACRO
+from .fixed import format_mm, to_um
+
+if TYPE_CHECKING:
+    from . import GCodeLine
+
+RELATIVE_EXTRUSION_COMMAND = "M83"
+_MOVES = frozenset({"G0", "G1"})
+# Commands that leave positions and the feed rate alone; anything else not
+# understood here makes the compactor forget what the firmware holds.
+_STATELESS = frozenset({"G4", "G21", "G90", RELATIVE_EXTRUSION_COMMAND})
+
+
+class ModalCompactor:
+    """Rewrite commands so each one only names the words that change.
+
+    Pass ``modal=False`` to keep every word and only apply
+    ``relative_extrusion``.
+    """
+
+    def __init__(self, *, modal: bool = True, relative_extrusion: bool = False):
+        self.modal = modal
+        self.relative_extrusion = relative_extrusion
+        # The last word sent for each axis letter and ``F``, e.g. ``"Y0.00"``.
+        self._words: Dict[str, str] = {}
+        self._extrusion_um = 0
+
+    def compact(self, command: str) -> str | None:
+        """Return the rewritten ``command``, or ``None`` when it does nothing."""
+
+        code, _, arguments = command.partition(" ")
+        if code in _MOVES:
+            return self._move(code, arguments.split())
+        if code == "G92":
+            for word in arguments.split():
+                self._words[word[0]] = word
+                if word[0] == "E":
+                    self._extrusion_um = to_um(float(word[1:]))
+        elif code == STITCH_MACRO:
+            parameters = dict(word.split("=", 1) for word in arguments.split())
+            feed_um = to_um(float(parameters["FEED"]))
+            self._extrusion_um += int(parameters["COUNT"]) * feed_um
+            for letter in "XZF":
+                self._words.pop(letter, None)
+        elif code not in _STATELESS:
+            self._words.clear()
+        return command
+
+    def _move(self, code: str, words: List[str]) -> str | None:
+        sent = self._words
+        modal = self.modal
+        kept = [code]
+        feed = None
+        for word in words:
+            letter = word[0]
+            if letter == "E" and self.relative_extrusion:
+                total_um = to_um(float(word[1:]))
+                delta_um = total_um - self._extrusion_um
+                self._extrusion_um = total_um
+                if delta_um:
+                    kept.append("E" + format_mm(delta_um))
+            elif not modal or sent.get(letter) != word:
+                if letter == "F":
+                    feed = word
+                else:
+                    sent[letter] = word
+                    kept.append(word)
+        if len(kept) == 1 and modal:
+            # Nothing moves, so the feed rate is left for the next move to set.
+            return None
+        if feed is not None:
+            sent["F"] = feed
+            kept.append(feed)
+        return " ".join(kept)
+
+
+def iter_modal_gcode(
+    lines: Iterable[GCodeLine],
+    *,
+    modal: bool = True,
+    relative_extrusion: bool = False,
+    comments: bool = True,
+) -> Iterator[str]:
+    """Yield the ``gcode`` format for ``lines``, compacted line by line."""
+
+    compactor = ModalCompactor(modal=modal, relative_extrusion=relative_extrusion)
+    for line in lines:
+        command = compactor.compact(line.command)
+        if command is None:
+            continue
+        comment = line.comment if comments else None
+        yield f"{command} ; {comment}\n" if comment else f"{command}\n"
+        if relative_extrusion and command == "G90":
+            if comments:
+                yield f"{RELATIVE_EXTRUSION_COMMAND} ; relative extrusion\n"
+            else:
+                yield f"{RELATIVE_EXTRUSION_COMMAND}\n"
+
+
+__all__ = ["ModalCompactor", "RELATIVE_EXTRUSION_COMMAND", "iter_modal_gcode"]
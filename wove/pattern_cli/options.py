@@ -4,9 +4,42 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
-from typing import Sequence
+from typing import Sequence, Tuple
 
-_DESCRIPTION = "Translate a crochet pattern into G-code-like instructions."
+from .encoder import DEFAULT_PLANNER_VERSION
+from .seek import KEYFRAME_INTERVAL
+from .writers import DEFAULT_BUFFER_SIZE
+
+_DESCRIPTION = (
+    "Translate a crochet pattern into G-code-like instructions. Run "
+    "'serve' as the first argument to start the translation daemon instead, "
+    "'batch' to translate many pattern files in one process, or "
+    "'klipper-macros' to write the firmware macro used by --stitch-macros."
+)
+DAEMON_SOCKET_ENV = "WOVE_PATTERN_SOCKET"
+CACHE_DIR_ENV = "WOVE_CACHE_DIR"
+DEFAULT_CACHE_MAX_MB = 256
+OUTPUT_FORMATS = ("gcode", "json", "planner", "planner-bin")
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError as error:
+        message = f"expected an integer, got '{value}'"
+        raise argparse.ArgumentTypeError(message) from error
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {number}")
+    return number
+
+
+def _emit_target(value: str) -> Tuple[str, Path | None]:
+    fmt, separator, path = value.partition("=")
+    if not separator or fmt not in OUTPUT_FORMATS or not path:
+        choices = ", ".join(OUTPUT_FORMATS)
+        message = f"expected FORMAT=PATH with FORMAT one of {choices}, got '{value}'"
+        raise argparse.ArgumentTypeError(message)
+    return fmt, None if path == "-" else Path(path)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -54,14 +87,146 @@ def build_parser() -> argparse.ArgumentParser:
         "--output",
         "-o",
         type=Path,
-        help="Optional file to write output. Defaults to stdout.",
+        help=(
+            "Optional file to write output. Defaults to stdout. Paths ending "
+            "in .gz or .xz (e.g. job.gcode.gz) are compressed."
+        ),
+    )
+    parser.add_argument(
+        "--buffer-size",
+        type=_positive_int,
+        default=DEFAULT_BUFFER_SIZE,
+        help=(
+            "Characters of output to collect before each write "
+            f"(default: {DEFAULT_BUFFER_SIZE})."
+        ),
     )
     parser.add_argument(
         "--format",
-        choices=("gcode", "json", "planner"),
+        choices=OUTPUT_FORMATS,
         default="gcode",
         help="Output format (default: gcode).",
     )
+    parser.add_argument(
+        "--emit",
+        action="append",
+        type=_emit_target,
+        metavar="FORMAT=PATH",
+        help=(
+            "Write FORMAT to PATH ('-' for stdout). Repeat to write several "
+            "formats from one translation; replaces --format and --output."
+        ),
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write json and planner output without indentation.",
+    )
+    parser.add_argument(
+        "--no-comments",
+        action="store_true",
+        help="Write G-code without trailing comments (other formats keep them).",
+    )
+    parser.add_argument(
+        "--compact-gcode",
+        action="store_true",
+        help="Leave out G-code words that repeat the current position or feed rate.",
+    )
+    parser.add_argument(
+        "--relative-extrusion",
+        action="store_true",
+        help="Write G-code E values as per-move distances after M83.",
+    )
+    parser.add_argument(
+        "--stitch-macros",
+        action="store_true",
+        help=(
+            "Write each stitch run in G-code as one STITCH macro call; see "
+            "the klipper-macros subcommand."
+        ),
+    )
+    parser.add_argument(
+        "--planner-version",
+        type=int,
+        choices=(1, 2),
+        help=(
+            "Planner JSON layout: 2 stores commands as columns indexing a "
+            "string table, 1 lists one object per command (default: "
+            f"{DEFAULT_PLANNER_VERSION}, or 1 with --stream)."
+        ),
+    )
+    parser.add_argument(
+        "--chunk-commands",
+        type=_positive_int,
+        metavar="N",
+        help=(
+            "Split planner output into numbered files of at most N commands "
+            "next to --output, which receives a manifest listing the chunks."
+        ),
+    )
+    parser.add_argument(
+        "--seek-interval",
+        type=_positive_int,
+        default=KEYFRAME_INTERVAL,
+        metavar="N",
+        help=(
+            "Add a seek_index to planner output with a keyframe every N "
+            f"commands (default: {KEYFRAME_INTERVAL})."
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Translate and write commands line by line instead of buffering "
+            "the whole job. Planner output moves its bounds after the commands."
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=_positive_int,
+        default=1,
+        help=(
+            "Translate long patterns in segments across this many worker "
+            "processes (default: 1). Output is identical to a serial run."
+        ),
+    )
+    parser.add_argument(
+        "--daemon",
+        nargs="?",
+        const="",
+        metavar="SOCKET",
+        help=(
+            "Send the job to a running 'serve' daemon on SOCKET (its default "
+            f"socket when omitted; also set by ${DAEMON_SOCKET_ENV}). Falls "
+            "back to translating in-process when no daemon answers."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help=(
+            "Reuse output from earlier runs with the same pattern, machine "
+            "profile, and options, stored in this directory (also set by "
+            f"${CACHE_DIR_ENV})."
+        ),
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=_positive_int,
+        default=DEFAULT_CACHE_MAX_MB,
+        metavar="N",
+        help=(
+            "Delete the least recently used cache entries beyond N megabytes "
+            f"(default: {DEFAULT_CACHE_MAX_MB})."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Ignore --cache-dir and ${CACHE_DIR_ENV} for this run.",
+    )
     parser.add_argument(
         "--machine-profile",
         type=Path,
@@ -70,6 +235,14 @@ def build_parser() -> argparse.ArgumentParser:
             "Generated moves are checked against those limits."
         ),
     )
+    parser.add_argument(
+        "--validate-only",
+        action="store_true",
+        help=(
+            "Translate without writing output and check every command against "
+            "the --machine-profile travel limits, reporting all violations."
+        ),
+    )
     parser.add_argument(
         "--home-state",
         choices=("unknown", "homed"),
@@ -97,4 +270,10 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     return parser.parse_args(argv)
 
 
-__all__ = ["build_parser", "parse_args"]
+__all__ = [
+    "CACHE_DIR_ENV",
+    "DAEMON_SOCKET_ENV",
+    "OUTPUT_FORMATS",
+    "build_parser",
+    "parse_args",
+]
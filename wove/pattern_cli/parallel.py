@@ -0,0 +1,235 @@
+"""Translate long patterns in independent segments across worker processes."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List, Sequence, Tuple
+
+from ..machine_profile import MachineProfile
+from . import (
+    SAFE_Z_MM,
+    GCodeLine,
+    PatternTranslator,
+    StitchProfile,
+    _lines_from_events,
+    _Motif,
+    _StitchRun,
+    _TranslatorState,
+)
+from .events import EventKind, PlannerEventStore
+from .fixed import UM_PER_MM, to_um
+from .timing import MotionTimer
+
+SEGMENTS_PER_WORKER = 4
+_SPLIT_COMMANDS = frozenset({"MOVE", "TURN"})
+
+
+@dataclass(frozen=True)
+class _Segment:
+    """A run of top-level source lines and the state it starts from."""
+
+    first_line: int
+    lines: Tuple[str, ...]
+    state: _TranslatorState | None
+
+
+class _StatePlanner(PatternTranslator):
+    """Track translator state without rendering any commands.
+
+    Stitch runs and motif placements only update X/Y/Z/E. Positions are whole
+    micrometres, so a run of stitches is a single multiplication and the
+    states it reports at segment boundaries are exactly what a serial
+    translation would carry across them.
+    """
+
+    def _emit(self, *row: object) -> None:
+        return None
+
+    def _emit_batch(self, *columns: object) -> None:
+        return None
+
+    def _emit_stitches(
+        self, profile: StitchProfile, count: int, line_number: int
+    ) -> None:
+        self._x_um += to_um(profile.spacing_mm) * count
+        self._extrusion_um += to_um(profile.yarn_feed_mm) * count
+        self._z_um = to_um(SAFE_Z_MM)
+        self._stitch_count += count
+
+    def _place(
+        self,
+        motif: _Motif,
+        x_offset: float,
+        y_offset: float,
+        line_number: int,
+    ) -> None:
+        self._x_um = motif.x_um[-1] + to_um(x_offset)
+        self._y_um = motif.y_um[-1] + to_um(y_offset)
+        self._z_um = motif.z_um[-1]
+        self._extrusion_um += motif.extrusion_um[-1]
+        self._row_number += motif.row_numbers[-1]
+        self._stitch_count += motif.stitch_ordinals[-1]
+
+
+class _SegmentTranslator(PatternTranslator):
+    """Record planner events only; the parent rebuilds lines after merging.
+
+    Stitch runs are noted by the index of their first event so the rebuilt
+    lines can still be collapsed into macro calls.
+    """
+
+    def __init__(self, machine_profile: MachineProfile | None = None) -> None:
+        super().__init__(machine_profile)
+        self.stitch_runs: List[Tuple[int, _StitchRun]] = []
+
+    def _emit(
+        self,
+        kind: EventKind,
+        command: str,
+        comment: str | None = None,
+        duration_s: float = 0.0,
+    ) -> None:
+        self._planner_events.append(
+            command,
+            comment,
+            self._x_um / UM_PER_MM,
+            self._y_um / UM_PER_MM,
+            self._z_um / UM_PER_MM,
+            self._extrusion_um / UM_PER_MM,
+            self._line_number,
+            self._row_number,
+            self._stitch_count,
+            duration_s,
+            kind,
+        )
+
+    def _emit_batch(
+        self,
+        commands: Sequence[str],
+        comments: Sequence[str | None],
+        x_values: Iterable[float],
+        y_values: Iterable[float],
+        z_values: Iterable[float],
+        extrusion_values: Iterable[float],
+        durations: Iterable[float],
+        stitch_ordinals: Iterable[int],
+        kinds: Iterable[int],
+        row_numbers: Iterable[int] | None = None,
+        comment_args: Sequence[int] | None = None,
+        stitch_run: _StitchRun | None = None,
+    ) -> None:
+        if stitch_run is not None:
+            self.stitch_runs.append((len(self._planner_events), stitch_run))
+        self._planner_events.extend(
+            commands,
+            comments,
+            x_values,
+            y_values,
+            z_values,
+            extrusion_values,
+            self._line_number,
+            self._row_number if row_numbers is None else row_numbers,
+            stitch_ordinals,
+            durations,
+            kinds,
+            comment_args,
+        )
+
+
+def _is_split_point(raw_line: str) -> bool:
+    tokens = raw_line.split(None, 1)
+    return bool(tokens) and tokens[0].upper() in _SPLIT_COMMANDS
+
+
+def _plan_segments(
+    source: Sequence[str],
+    segment_count: int,
+    machine_profile: MachineProfile | None = None,
+) -> List[_Segment]:
+    """Split ``source`` before top-level MOVE/TURN lines.
+
+    MOVE and TURN set X absolutely, so a segment starting there depends only
+    on the carried Y, Z, extrusion and motif definitions, which the state
+    planner computes without rendering output.
+    """
+
+    # Like the motif recorder, the planner leaves limit checks to the workers
+    # but times recorded motifs against the profile's limits.
+    planner = _StatePlanner()
+    planner._timer = MotionTimer(machine_profile)
+    planner._reset_state()
+    target = max(1, len(source) // segment_count)
+    boundaries: List[Tuple[int, _TranslatorState | None]] = [(0, None)]
+    for index, raw_line in enumerate(source):
+        if (
+            index - boundaries[-1][0] >= target
+            and not planner._open_blocks
+            and _is_split_point(raw_line)
+        ):
+            boundaries.append((index, planner._snapshot()))
+        planner._run_line(raw_line, index + 1)
+    planner._finish_source()
+    segments = []
+    ends = [start for start, _ in boundaries[1:]] + [len(source)]
+    for (start, state), end in zip(boundaries, ends):
+        segments.append(_Segment(start + 1, tuple(source[start:end]), state))
+    return segments
+
+
+def _translate_segment(
+    task: Tuple[_Segment, MachineProfile | None],
+) -> Tuple[PlannerEventStore, List[Tuple[int, _StitchRun]]]:
+    segment, machine_profile = task
+    translator = _SegmentTranslator(machine_profile=machine_profile)
+    if segment.state is None:
+        translator._reset_state()
+    else:
+        translator._restore(segment.state)
+    for offset, raw_line in enumerate(segment.lines):
+        translator._run_line(raw_line, segment.first_line + offset)
+    translator._finish_source()
+    return translator._planner_events, translator.stitch_runs
+
+
+def translate_parallel(
+    source: str,
+    machine_profile: MachineProfile | None = None,
+    *,
+    workers: int | None = None,
+) -> Tuple[List[GCodeLine], PlannerEventStore]:
+    """Translate ``source`` across a process pool.
+
+    Returns the same commands and planner events as
+    :meth:`PatternTranslator.translate`. Patterns that are too short to
+    split, or that the planner cannot parse, are translated serially, so
+    parse errors match the serial translator exactly. A ``ValueError`` raised
+    in a worker, such as a travel limit error, propagates to the caller;
+    segment results are collected in order, so it is the first error a
+    serial translation would report.
+    """
+
+    lines = source.splitlines()
+    segments: List[_Segment] = []
+    if workers is None or workers > 1:
+        count = (workers or 1) * SEGMENTS_PER_WORKER
+        try:
+            segments = _plan_segments(lines, count, machine_profile)
+        except ValueError:
+            segments = []
+    if len(segments) < 2:
+        translator = PatternTranslator(machine_profile=machine_profile)
+        return translator.translate(source), translator.planner_events
+
+    tasks = [(segment, machine_profile) for segment in segments]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_translate_segment, tasks))
+    events, stitch_runs = results[0]
+    for store, runs in results[1:]:
+        offset = len(events)
+        stitch_runs.extend((offset + start, run) for start, run in runs)
+        events.extend_from(store)
+    return _lines_from_events(events, stitch_runs), events
+
+
+__all__ = ["translate_parallel", "SEGMENTS_PER_WORKER"]
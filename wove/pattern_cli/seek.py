@@ -0,0 +1,149 @@
+"""Seek planner events by elapsed time, row, or stitch."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, List
+
+from .events import PlannerEventStore
+
+KEYFRAME_INTERVAL = 256
+
+# Store column -> seek_index key.
+_SAMPLED_COLUMNS = {
+    "row_numbers": "row",
+    "stitch_ordinals": "stitch",
+    "line_numbers": "line",
+    "x_mm": "x_mm",
+    "y_mm": "y_mm",
+    "z_mm": "z_mm",
+    "extrusion_mm": "extrusion_mm",
+}
+
+
+class PlannerIndex:
+    """Map elapsed time, rows, and stitches to command ranges.
+
+    Elapsed time, row numbers, and stitch ordinals never decrease along a
+    job, so after one pass to sum the command durations every query is a
+    bisection over a sorted column. ``elapsed_s[i]`` is the time at which
+    command ``i`` finishes, so command ``i`` runs during
+    ``(elapsed_s[i - 1], elapsed_s[i]]``.
+    """
+
+    def __init__(self, events: PlannerEventStore) -> None:
+        self.events = events
+        self.elapsed_s = array("d", accumulate(events.durations_s))
+
+    def __len__(self) -> int:
+        return len(self.elapsed_s)
+
+    @property
+    def total_seconds(self) -> float:
+        """Return the estimated duration of the whole job."""
+
+        return self.elapsed_s[-1] if self.elapsed_s else 0.0
+
+    def command_at(self, seconds: float) -> int:
+        """Return the index of the command running ``seconds`` into the job.
+
+        Times before the start or after the end clamp to the first or last
+        command.
+        """
+
+        if not self.elapsed_s:
+            raise ValueError("Cannot seek in an empty planner index")
+        return min(bisect_right(self.elapsed_s, seconds), len(self) - 1)
+
+    def time_range(self, start_s: float, end_s: float) -> range:
+        """Return the commands that run at any point in ``[start_s, end_s)``."""
+
+        if end_s <= start_s:
+            return range(0)
+        first = bisect_right(self.elapsed_s, start_s)
+        stop = min(bisect_left(self.elapsed_s, end_s) + 1, len(self))
+        return range(first, max(first, stop))
+
+    def row_range(self, row: int) -> range:
+        """Return the commands of row ``row`` (``0`` is the first row).
+
+        A row starts with the TURN travel into it; the range is empty when the
+        job has no such row.
+        """
+
+        return _equal_range(self.events.row_numbers, row)
+
+    def stitch_range(self, ordinal: int) -> range:
+        """Return the commands from stitch ``ordinal`` up to the next stitch.
+
+        Ordinals count from ``1``; the range for ``0`` covers everything before
+        the first stitch. Moves or turns that follow a stitch belong to it.
+        """
+
+        return _equal_range(self.events.stitch_ordinals, ordinal)
+
+    def keyframes(self, interval: int = KEYFRAME_INTERVAL) -> Dict[str, object]:
+        """Return the planner ``seek_index`` block (see :class:`KeyframeBuilder`)."""
+
+        builder = KeyframeBuilder(interval)
+        builder.add(self.events)
+        return builder.keyframes()
+
+
+class KeyframeBuilder:
+    """Collect the planner ``seek_index`` block from batches of events.
+
+    A keyframe snapshots the state after every ``interval``-th command, so a
+    consumer can bisect the small keyframe arrays and then replay at most
+    ``interval`` commands to reach any time, row, or stitch. Batches may be
+    added as they are produced, which lets streamed output carry the same
+    index as a buffered export.
+    """
+
+    def __init__(self, interval: int = KEYFRAME_INTERVAL) -> None:
+        if interval < 1:
+            raise ValueError("Keyframe interval must be a positive number")
+        self.interval = interval
+        self._count = 0
+        self._elapsed_s = 0.0
+        self._columns: Dict[str, List[object]] = {
+            name: [] for name in ("index", "elapsed_s", *_SAMPLED_COLUMNS.values())
+        }
+
+    def add(self, events: PlannerEventStore) -> None:
+        """Account for the next batch of events."""
+
+        if not len(events):
+            return
+        elapsed = array("d", accumulate(events.durations_s, initial=self._elapsed_s))
+        first = -self._count % self.interval
+        picks = slice(first, None, self.interval)
+        columns = self._columns
+        columns["index"].extend(
+            offset + self._count for offset in range(len(events))[picks]
+        )
+        # ``elapsed`` starts with the carried total, so it is shifted by one.
+        columns["elapsed_s"].extend(elapsed[1:][picks].tolist())
+        for name, key in _SAMPLED_COLUMNS.items():
+            columns[key].extend(getattr(events, name)[picks].tolist())
+        self._count += len(events)
+        self._elapsed_s = elapsed[-1]
+
+    def keyframes(self) -> Dict[str, object]:
+        """Return the ``seek_index`` block for every event added so far."""
+
+        block: Dict[str, object] = {
+            "interval": self.interval,
+            "total_elapsed_s": self._elapsed_s,
+        }
+        block.update(self._columns)
+        return block
+
+
+def _equal_range(column: array, value: int) -> range:
+    return range(bisect_left(column, value), bisect_right(column, value))
+
+
+__all__ = ["KEYFRAME_INTERVAL", "KeyframeBuilder", "PlannerIndex"]
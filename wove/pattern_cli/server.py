@@ -0,0 +1,407 @@
+"""Translation daemon (``python -m wove.pattern_cli serve``) and its client.
+
+The daemon listens on a Unix socket and answers newline-delimited JSON-RPC
+2.0 requests. It keeps machine profiles parsed and recent translations in a
+least-recently-used cache, so repeated jobs skip interpreter startup, profile
+parsing, and translation. Each request runs the normal CLI code path with
+stdout and stderr captured, so replies match an in-process run exactly;
+requests are therefore served one at a time.
+
+Methods:
+
+``translate``
+    ``argv`` (CLI arguments), ``cwd`` (the client's working directory, used to
+    resolve relative paths) and optional ``stdin`` (pattern text when no input
+    is named). Returns ``exit_code``, ``stdout`` (base64) and ``stderr``.
+``stats``
+    Returns the cache size, ``hits``, and ``misses``.
+``shutdown``
+    Stops the daemon after replying.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import contextlib
+import hashlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+
+from ..machine_profile import MachineProfile, load_machine_profile
+from . import GCodeLine, _run, _translate_job, parse_args
+from .events import PlannerEventStore
+from .options import _positive_int
+
+DEFAULT_CACHE_ENTRIES = 64
+CONNECT_TIMEOUT_S = 1.0
+_PATH_ARGUMENTS = ("pattern", "svg", "output", "machine_profile", "cache_dir")
+
+# JSON-RPC 2.0 error codes.
+_PARSE_ERROR = -32700
+_INVALID_REQUEST = -32600
+_METHOD_NOT_FOUND = -32601
+_INVALID_PARAMS = -32602
+_INTERNAL_ERROR = -32603
+
+Translation = Tuple[List[GCodeLine], PlannerEventStore]
+
+
+def default_socket_path() -> Path:
+    """Return the per-user socket used when no path is given."""
+
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(base) / f"wove-pattern-{os.getuid()}.sock"
+
+
+class TranslationCache:
+    """Least-recently-used cache of translations.
+
+    Entries are keyed by a SHA-256 digest of the pattern text and the machine
+    profile. Output options only shape how a translation is written, so one
+    entry serves every format; ``--jobs`` is left out because parallel and
+    serial translations are identical.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES) -> None:
+        if max_entries < 1:
+            raise ValueError("Translation cache must hold at least one entry")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Translation] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(pattern_text: str, machine_profile: MachineProfile | None) -> str:
+        """Return the cache key for a pattern translated under a profile."""
+
+        digest = hashlib.sha256(pattern_text.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(repr(machine_profile).encode("utf-8"))
+        return digest.hexdigest()
+
+    def translate(
+        self, pattern_text: str, machine_profile: MachineProfile | None, jobs: int
+    ) -> Translation:
+        """Return a copy of the cached translation, translating on a miss.
+
+        Exporters render comments into the planner store in place, so each
+        caller gets its own store and the cached one is never changed.
+        Failed translations raise as usual and are not cached.
+        """
+
+        key = self.key(pattern_text, machine_profile)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            cached = _translate_job(pattern_text, machine_profile, jobs)
+            self._entries[key] = cached
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        lines, events = cached
+        return lines, events.copy()
+
+
+class ProfileCache:
+    """Parsed machine profiles, reloaded when a file's size or mtime changes."""
+
+    def __init__(self) -> None:
+        self._profiles: Dict[Path, Tuple[Tuple[int, int], MachineProfile]] = {}
+
+    def load(self, path: Path) -> MachineProfile:
+        """Return the profile at ``path``, parsing it only when it changed."""
+
+        resolved = Path(path).resolve()
+        try:
+            status = resolved.stat()
+        except OSError:
+            return load_machine_profile(path)
+        stamp = (status.st_mtime_ns, status.st_size)
+        cached = self._profiles.get(resolved)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        profile = load_machine_profile(resolved)
+        self._profiles[resolved] = (stamp, profile)
+        return profile
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "TranslationServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.respond(line)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class TranslationServer(socketserver.UnixStreamServer):
+    """Serve ``translate`` requests from one socket with shared caches."""
+
+    def __init__(
+        self,
+        socket_path: str | Path,
+        *,
+        cache_entries: int = DEFAULT_CACHE_ENTRIES,
+    ) -> None:
+        self.socket_path = Path(socket_path)
+        self.translations = TranslationCache(cache_entries)
+        self.profiles = ProfileCache()
+        _claim_socket(self.socket_path)
+        # Create the socket owner-only; jobs may name any file the user can read.
+        previous = os.umask(0o177)
+        try:
+            super().__init__(str(self.socket_path), _RequestHandler)
+        finally:
+            os.umask(previous)
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+
+    def respond(self, line: bytes) -> Dict[str, Any]:
+        """Return the JSON-RPC response for one request line."""
+
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return _error(None, _PARSE_ERROR, "Parse error")
+        if not isinstance(request, dict):
+            return _error(None, _INVALID_REQUEST, "Request must be an object")
+        request_id = request.get("id")
+        method = request.get("method")
+        params = request.get("params", {})
+        handlers: Dict[str, Callable[[Mapping[str, Any]], Dict[str, Any]]] = {
+            "translate": self._translate,
+            "stats": self._stats,
+            "shutdown": self._shutdown,
+        }
+        handler = handlers.get(method) if isinstance(method, str) else None
+        if handler is None:
+            return _error(request_id, _METHOD_NOT_FOUND, f"Unknown method {method!r}")
+        if not isinstance(params, dict):
+            return _error(request_id, _INVALID_PARAMS, "params must be an object")
+        try:
+            result = handler(params)
+        except _InvalidParams as error:
+            return _error(request_id, _INVALID_PARAMS, str(error))
+        except Exception as error:  # keep serving after an unexpected failure
+            return _error(
+                request_id, _INTERNAL_ERROR, f"{type(error).__name__}: {error}"
+            )
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def _translate(self, params: Mapping[str, Any]) -> Dict[str, Any]:
+        argv = params.get("argv")
+        cwd = params.get("cwd")
+        stdin = params.get("stdin")
+        if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+            raise _InvalidParams("argv must be a list of strings")
+        if not isinstance(cwd, str) or not os.path.isabs(cwd):
+            raise _InvalidParams("cwd must be an absolute path")
+        if stdin is not None and not isinstance(stdin, str):
+            raise _InvalidParams("stdin must be a string")
+        stdout = io.BytesIO()
+        text = io.TextIOWrapper(stdout, encoding="utf-8", write_through=True)
+        stderr = io.StringIO()
+        with contextlib.redirect_stdout(text), contextlib.redirect_stderr(stderr):
+            try:
+                args = parse_args(argv)
+                _resolve_paths(args, Path(cwd))
+                if args.pattern is None and args.text is None and args.svg is None:
+                    # Never block on the daemon's own stdin.
+                    args.text = stdin or ""
+                exit_code = _run(
+                    args,
+                    load_profile=self.profiles.load,
+                    translate=self.translations.translate,
+                )
+            except SystemExit as exit_request:
+                exit_code = _exit_status(exit_request.code)
+        text.flush()
+        return {
+            "exit_code": exit_code,
+            "stdout": base64.b64encode(stdout.getvalue()).decode("ascii"),
+            "stderr": stderr.getvalue(),
+        }
+
+    def _stats(self, params: Mapping[str, Any]) -> Dict[str, Any]:
+        cache = self.translations
+        return {
+            "entries": len(cache),
+            "max_entries": cache.max_entries,
+            "hits": cache.hits,
+            "misses": cache.misses,
+        }
+
+    def _shutdown(self, params: Mapping[str, Any]) -> Dict[str, Any]:
+        # shutdown() waits for serve_forever(), which is busy with this request.
+        threading.Thread(target=self.shutdown, daemon=True).start()
+        return {"stopping": True}
+
+
+class _InvalidParams(ValueError):
+    pass
+
+
+def _error(request_id: object, code: int, message: str) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+def _exit_status(code: object) -> int:
+    if code is None:
+        return 0
+    return code if isinstance(code, int) else 1
+
+
+def _resolve_paths(args: argparse.Namespace, cwd: Path) -> None:
+    for name in _PATH_ARGUMENTS:
+        value = getattr(args, name)
+        if value is not None and not Path(value).is_absolute():
+            resolved = cwd / value
+            setattr(args, name, str(resolved) if isinstance(value, str) else resolved)
+    if args.emit:
+        args.emit = [
+            (fmt, None if path is None else cwd / path) for fmt, path in args.emit
+        ]
+
+
+def _claim_socket(path: Path) -> None:
+    """Remove a stale socket file, refusing if a daemon still answers on it."""
+
+    if not path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()
+            return
+    raise ValueError(f"A pattern daemon is already listening on {path}")
+
+
+def call(
+    socket_path: str | Path,
+    method: str,
+    params: Mapping[str, Any] | None = None,
+) -> Dict[str, Any]:
+    """Send one JSON-RPC request to the daemon and return its response."""
+
+    request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(CONNECT_TIMEOUT_S)
+        client.connect(str(socket_path))
+        client.settimeout(None)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("Pattern daemon closed the connection without replying")
+    return json.loads(line)
+
+
+def run_remote(
+    socket_path: str | Path, argv: Sequence[str], *, stdin: str | None = None
+) -> int | None:
+    """Run the CLI arguments ``argv`` on a daemon and relay its output.
+
+    An empty ``socket_path`` means :func:`default_socket_path`. Returns the
+    exit code, or ``None`` when no daemon answered (or it reported an error)
+    so the caller can translate in-process instead.
+    """
+
+    params = {"argv": list(argv), "cwd": os.getcwd(), "stdin": stdin}
+    try:
+        response = call(socket_path or default_socket_path(), "translate", params)
+    except (OSError, ValueError):
+        return None
+    result = response.get("result")
+    if not isinstance(result, dict):
+        return None
+    sys.stdout.flush()
+    sys.stdout.buffer.write(base64.b64decode(result["stdout"]))
+    sys.stdout.buffer.flush()
+    sys.stderr.write(result["stderr"])
+    return int(result["exit_code"])
+
+
+def build_serve_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for ``python -m wove.pattern_cli serve``."""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m wove.pattern_cli serve",
+        description="Serve pattern translations over a Unix socket.",
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=default_socket_path(),
+        help="Socket path to listen on (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--cache-entries",
+        type=_positive_int,
+        default=DEFAULT_CACHE_ENTRIES,
+        metavar="N",
+        help=(
+            "Translations to keep in the LRU cache "
+            f"(default: {DEFAULT_CACHE_ENTRIES})."
+        ),
+    )
+    return parser
+
+
+def serve_main(argv: Sequence[str] | None = None) -> int:
+    """Run the daemon until interrupted or asked to shut down."""
+
+    args = build_serve_parser().parse_args(argv)
+    if not hasattr(socket, "AF_UNIX"):
+        sys.stderr.write("serve requires Unix domain sockets\n")
+        return 1
+    try:
+        server = TranslationServer(args.socket, cache_entries=args.cache_entries)
+    except (OSError, ValueError) as error:
+        sys.stderr.write(f"{error}\n")
+        return 1
+    sys.stderr.write(f"Serving pattern translations on {args.socket}\n")
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+__all__ = [
+    "DEFAULT_CACHE_ENTRIES",
+    "ProfileCache",
+    "TranslationCache",
+    "TranslationServer",
+    "build_serve_parser",
+    "call",
+    "default_socket_path",
+    "run_remote",
+    "serve_main",
+]
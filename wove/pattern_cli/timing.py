@@ -0,0 +1,104 @@
+"""Estimate how long translated moves take on a given machine.
+
+Each move follows a trapezoidal velocity profile: it accelerates from rest to
+its cruise velocity, cruises, and decelerates back to rest, or peaks early in
+a triangle when it is too short to reach cruise. Moves start and end at rest
+because consecutive translator moves change axis (plunge along Z, feed E,
+raise, advance along X), so firmware look-ahead has little to blend.
+
+The cruise velocity is the commanded feed rate, lowered wherever an axis
+would exceed its ``max_velocity_mm_s``; acceleration is likewise the largest
+the moving axes allow. Axes without limits in the
+:class:`~wove.machine_profile.MachineProfile` (or no profile at all) leave
+the move at its constant feed rate.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Iterable, Mapping, Tuple
+
+if TYPE_CHECKING:
+    from ..machine_profile import AxisProfile, MachineProfile
+
+# The axes a move can name, in the order :meth:`MotionTimer.move_seconds`
+# takes their distances.
+_AXES = ("X", "Y", "Z", "E")
+
+
+def trapezoid_seconds(
+    distance_mm: float, velocity_mm_s: float, acceleration_mm_s2: float
+) -> float:
+    """Return the seconds a move from rest to rest takes.
+
+    ``acceleration_mm_s2`` may be ``math.inf`` for a move at constant speed.
+    """
+
+    if not distance_mm:
+        return 0.0
+    if distance_mm * acceleration_mm_s2 < velocity_mm_s * velocity_mm_s:
+        # Too short to reach cruise: accelerate halfway, then brake.
+        return 2.0 * math.sqrt(distance_mm / acceleration_mm_s2)
+    return distance_mm / velocity_mm_s + velocity_mm_s / acceleration_mm_s2
+
+
+def total_seconds(durations_s: Iterable[float], start_s: float = 0.0) -> float:
+    """Return ``start_s`` plus ``durations_s`` summed in order.
+
+    Summing batch by batch this way gives exactly the total of summing the
+    whole job at once, so streamed and buffered exports agree.
+    """
+
+    for duration in durations_s:
+        start_s += duration
+    return start_s
+
+
+class MotionTimer:
+    """Time moves against a machine profile's velocity and acceleration limits."""
+
+    def __init__(self, machine_profile: MachineProfile | None = None) -> None:
+        axes = {} if machine_profile is None else machine_profile.axes
+        self._velocity = _limits(axes, "max_velocity_mm_s")
+        self._acceleration = _limits(axes, "max_acceleration_mm_s2")
+
+    def move_seconds(
+        self,
+        feed_rate_mm_min: float,
+        x_mm: float = 0.0,
+        y_mm: float = 0.0,
+        z_mm: float = 0.0,
+        e_mm: float = 0.0,
+    ) -> float:
+        """Return the seconds a move by the given axis distances takes.
+
+        As in firmware, the feed rate applies along the XYZ path, or along E
+        for a move that only feeds yarn.
+        """
+
+        distance = math.hypot(x_mm, y_mm, z_mm) or abs(e_mm)
+        if not distance:
+            return 0.0
+        velocity = feed_rate_mm_min / 60.0
+        acceleration = math.inf
+        deltas = (x_mm, y_mm, z_mm, e_mm)
+        for delta, max_velocity, max_acceleration in zip(
+            deltas, self._velocity, self._acceleration
+        ):
+            if delta:
+                # The axis covers ``|delta| / distance`` of the path speed.
+                share = distance / abs(delta)
+                velocity = min(velocity, max_velocity * share)
+                acceleration = min(acceleration, max_acceleration * share)
+        return trapezoid_seconds(distance, velocity, acceleration)
+
+
+def _limits(axes: Mapping[str, AxisProfile], attribute: str) -> Tuple[float, ...]:
+    values = []
+    for name in _AXES:
+        value = getattr(axes.get(name), attribute, None)
+        values.append(math.inf if value is None else value)
+    return tuple(values)
+
+
+__all__ = ["MotionTimer", "total_seconds", "trapezoid_seconds"]
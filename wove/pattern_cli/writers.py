@@ -0,0 +1,136 @@
+"""Buffered, optionally compressed text output for the pattern CLI."""
+
+from __future__ import annotations
+
+import io
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, TextIO
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+GZIP_COMPRESS_LEVEL = 6
+
+
+def _open_gzip(path: Path) -> BinaryIO:
+    import gzip
+
+    # A fixed mtime keeps repeated exports byte-for-byte reproducible.
+    return gzip.GzipFile(path, "wb", compresslevel=GZIP_COMPRESS_LEVEL, mtime=0)
+
+
+def _open_xz(path: Path) -> BinaryIO:
+    import lzma
+
+    return lzma.open(path, "wb")
+
+
+COMPRESSED_SUFFIXES: Dict[str, Callable[[Path], BinaryIO]] = {
+    ".gz": _open_gzip,
+    ".xz": _open_xz,
+}
+
+
+class BufferedTextWriter:
+    """Collect small writes and pass them on in chunks.
+
+    Text is held until at least ``buffer_size`` characters are pending and
+    then written to ``handle`` in a single call. :meth:`flush` pushes any
+    pending text through; the underlying handle is flushed as well only when
+    ``sync`` is set, so compressed streams are not forced to end a block on
+    every periodic flush.
+    """
+
+    def __init__(
+        self,
+        handle: TextIO,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        *,
+        sync: bool = True,
+    ) -> None:
+        if buffer_size < 1:
+            raise ValueError("Buffer size must be a positive number of characters")
+        self._handle = handle
+        self._buffer_size = buffer_size
+        self._sync = sync
+        self._pending: List[str] = []
+        self._pending_size = 0
+
+    def write(self, text: str) -> int:
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size >= self._buffer_size:
+            self._drain()
+        return len(text)
+
+    def writelines(self, texts: Iterable[str]) -> None:
+        for text in texts:
+            self.write(text)
+
+    def flush(self) -> None:
+        self._drain()
+        if self._sync:
+            self._handle.flush()
+
+    def _drain(self) -> None:
+        if self._pending:
+            self._handle.write("".join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+
+
+@contextmanager
+def open_output(
+    path: Path | None, *, buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> Iterator[BufferedTextWriter]:
+    """Open ``path`` (stdout when ``None``) for buffered text output.
+
+    Paths ending in ``.gz`` or ``.xz`` (for example ``job.gcode.gz``) are
+    compressed with gzip or xz respectively.
+    """
+
+    if path is None:
+        writer = BufferedTextWriter(sys.stdout, buffer_size)
+        try:
+            yield writer
+        finally:
+            writer.flush()
+        return
+    opener = COMPRESSED_SUFFIXES.get(path.suffix.lower())
+    if opener is None:
+        handle: TextIO = path.open("w", encoding="utf-8")
+    else:
+        handle = io.TextIOWrapper(opener(path), encoding="utf-8")
+    with handle:
+        writer = BufferedTextWriter(handle, buffer_size, sync=opener is None)
+        try:
+            yield writer
+        finally:
+            writer.flush()
+
+
+@contextmanager
+def open_binary_output(path: Path | None) -> Iterator[BinaryIO]:
+    """Open ``path`` (stdout when ``None``) for binary output.
+
+    The same ``.gz``/``.xz`` suffixes as :func:`open_output` select
+    compression.
+    """
+
+    if path is None:
+        sys.stdout.flush()
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+        return
+    opener = COMPRESSED_SUFFIXES.get(path.suffix.lower())
+    with path.open("wb") if opener is None else opener(path) as handle:
+        yield handle
+
+
+__all__ = [
+    "BufferedTextWriter",
+    "COMPRESSED_SUFFIXES",
+    "DEFAULT_BUFFER_SIZE",
+    "open_binary_output",
+    "open_output",
+]